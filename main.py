@@ -13,10 +13,16 @@ if __name__ == "__main__":
 
     # illustrate.main()
 
-    from ot3 import register
-    from ot3 import render
-    from ot3 import concatenate_score_parts
+    import sys
 
-    # register.main()
-    # render.main()
-    concatenate_score_parts.main()
+    import ot3
+
+    # constants get loaded lazily, but the stochastic parts depend on the
+    # order in which the constants are initialised
+    ot3.import_all()
+
+    from ot3 import build
+
+    # only rebuild stages whose inputs changed since the last build;
+    # specific stages can be passed as arguments (e.g. "bells drone")
+    build.main(targets=sys.argv[1:] or build.DEFAULT_TARGETS)
@@ -1,14 +1,42 @@
-# order matters!
+import importlib
+
 from . import utilities
-from . import parameters
-from . import events
-from . import constants
-from . import analysis
-from . import converters
-from . import scripts
-from . import stochastic_constants
-from . import stochastic
-from . import illustrate
-from . import render
-from . import register
-from . import concatenate_score_parts
+
+# all other modules are only imported when they are accessed for the first
+# time (importing them computes the constants of the piece, which is slow);
+# the order of the names is the order in which they were imported eagerly
+_LAZY_SUBMODULES = (
+    "parameters",
+    "events",
+    "constants",
+    "analysis",
+    "converters",
+    "scripts",
+    "stochastic_constants",
+    "stochastic",
+    "illustrate",
+    "render",
+    "register",
+    "concatenate_score_parts",
+    "build",
+)
+
+__getattr__ = utilities.lazy.lazy_submodules(__name__, _LAZY_SUBMODULES)
+
+
+def import_all():
+    """Import all modules in the order in which they were imported eagerly.
+
+    Several constants (Tendency, DynamicChoice, ...) reseed the global random
+    generator when they get initialised, therefore the results of the
+    stochastic processes depend on the order in which the modules are
+    imported. Call this function before computing anything which shall be
+    the same as before the modules were loaded lazily.
+    """
+
+    for package_name in ("parameters", "events", "constants"):
+        package = importlib.import_module(f"{__name__}.{package_name}")
+        for submodule_name in package._EAGER_IMPORT_ORDER:
+            importlib.import_module(f"{package.__name__}.{submodule_name}")
+    for module_name in _LAZY_SUBMODULES:
+        importlib.import_module(f"{__name__}.{module_name}")
@@ -0,0 +1,291 @@
+"""Incremental build of all sound files and notations of the piece.
+
+Instead of commenting stages of "register.main" and "render.main" in and out
+and flipping the flags in "constants/compute.py" by hand, every stage declares
+its inputs, outputs and dependencies. Only stages whose inputs changed (or
+whose outputs are missing) get rebuild. Expensive intermediate results
+(stochastic parts, saturation tones, bells) are kept in the content addressed
+cache of "ot3.utilities.cache".
+
+Public interaction via "main" method (call "ot3.import_all" before importing
+this module to get the same results as with eagerly imported constants).
+"""
+
+import functools
+import typing
+
+from ot3 import concatenate_score_parts
+from ot3 import constants as ot3_constants
+from ot3 import register
+from ot3 import render
+from ot3.utilities import build_graph
+
+_FAMILIES_PITCH_INPUTS = (
+    "ot3/constants/families_pitch.py",
+    "ot3/constants/harmony/**/*.py",
+    "ot3/constants/concert_pitch.py",
+    "ot3/constants/definitions.py",
+    "ot3/constants/duration.py",
+    "ot3/constants/instruments.py",
+    "ot3/constants/tendencies.py",
+    "ot3/parameters/**/*.py",
+    "ot3/events/**/*.py",
+    "ot3/utilities/tools.py",
+    "ot3/utilities/equal_range_distributions.py",
+    "ot3/converters/symmetrical/families.py",
+)
+
+_REGISTER_INPUTS = _FAMILIES_PITCH_INPUTS + ("ot3/register.py",)
+
+_RENDER_INPUTS = _FAMILIES_PITCH_INPUTS + (
+    "ot3/render.py",
+    "ot3/converters/frontends/midi.py",
+)
+
+_SCORE_INPUTS = _RENDER_INPUTS + (
+    "ot3/converters/frontends/abjad*.py",
+    "ot3/converters/symmetrical/playing_indicators.py",
+    "builds/notations/fancy-glissando.ly",
+)
+
+_SOUNDFILE_INPUTS = _RENDER_INPUTS + (
+    "ot3/converters/frontends/csound*.py",
+    "ot3/converters/frontends/*.orc",
+    "ot3/converters/symmetrical/playing_indicators.py",
+)
+
+# last stage of the registration; all stages which read the
+# global TimeBracketContainer have to depend on it
+_REGISTERED_TIME_BRACKETS = "prune_time_brackets"
+
+
+def _run_with_compute_flags(function: typing.Callable[[], None], **flag_to_value):
+    previous_flag_to_value = {
+        flag: getattr(ot3_constants.compute, flag) for flag in flag_to_value
+    }
+    for flag, value in flag_to_value.items():
+        setattr(ot3_constants.compute, flag, value)
+    try:
+        function()
+    finally:
+        for flag, value in previous_flag_to_value.items():
+            setattr(ot3_constants.compute, flag, value)
+
+
+def _render(function: typing.Callable[[], None], *flags: str):
+    return functools.partial(
+        _run_with_compute_flags, function, **{flag: True for flag in flags}
+    )
+
+
+def _midi_file(name: str) -> str:
+    return f"builds/soundfiles/{name}.mid"
+
+
+def _make_register_stages() -> typing.Tuple[build_graph.Stage, ...]:
+    # the order of registration matters (earlier registered time brackets
+    # win in case of overlaps), therefore each stage depends on its
+    # predecessor
+    return (
+        build_graph.Stage(
+            "register_serenades",
+            register._register_serenades,
+            inputs=_REGISTER_INPUTS
+            + ("ot3/constants/serenades/*.py", "ot3/constants/serenades/serenade*"),
+        ),
+        build_graph.Stage(
+            "register_modes",
+            register._register_modes,
+            inputs=_REGISTER_INPUTS
+            + ("ot3/constants/modes.py", "ot3/converters/symmetrical/modes.py"),
+            dependencies=("register_serenades",),
+        ),
+        build_graph.Stage(
+            "register_saturations",
+            register._register_saturations,
+            inputs=_REGISTER_INPUTS
+            + (
+                "ot3/constants/saturations.py",
+                "ot3/converters/symmetrical/saturations.py",
+                "ot3/converters/symmetrical/time_brackets.py",
+            ),
+            dependencies=("register_modes",),
+        ),
+        build_graph.Stage(
+            "register_westminster",
+            register._register_westminster,
+            inputs=_REGISTER_INPUTS
+            + (
+                "ot3/constants/westminster.py",
+                "ot3/converters/symmetrical/westminster.py",
+            ),
+            dependencies=("register_saturations",),
+        ),
+        build_graph.Stage(
+            "register_stochastic_brackets",
+            register._register_stochastic_brackets,
+            inputs=_REGISTER_INPUTS
+            + (
+                "ot3/stochastic.py",
+                "ot3/stochastic_constants.py",
+                "ot3/converters/symmetrical/time_brackets.py",
+            ),
+            dependencies=("register_westminster",),
+        ),
+        build_graph.Stage(
+            _REGISTERED_TIME_BRACKETS,
+            register._remove_superfluous_time_brackets,
+            inputs=_REGISTER_INPUTS,
+            dependencies=("register_stochastic_brackets",),
+        ),
+    )
+
+
+def _make_render_stages() -> typing.Tuple[build_graph.Stage, ...]:
+    instruments = ot3_constants.instruments
+    shadow_names = tuple(
+        f"shadows_{instrument_id}{suffix}"
+        for instrument_id in (instruments.ID_VIOLIN, instruments.ID_SAXOPHONE)
+        for suffix in ("", "_fifth")
+    )
+    sine_ids = tuple(
+        instrument_id
+        for instrument_ids in instruments.ID_INSTR_TO_ID_SINES.values()
+        for instrument_id in instrument_ids
+    )
+    # shadows have to be rendered before the saxophone (which adjusts the
+    # pitches of the saxophone time brackets) and the saxophone has to be
+    # rendered after the violin: both are declared as dependencies of the
+    # saxophone, so that the order of the stages can't break the render
+    return (
+        build_graph.Stage(
+            "shadows",
+            _render(render._render_shadows, "RENDER_MIDIFILES"),
+            inputs=_RENDER_INPUTS + ("ot3/converters/symmetrical/shadows.py",),
+            outputs=tuple(_midi_file(name) for name in shadow_names),
+            dependencies=(_REGISTERED_TIME_BRACKETS,),
+        ),
+        build_graph.Stage(
+            "violin",
+            _render(
+                render._render_violin,
+                "RENDER_MIDIFILES",
+                "RENDER_NOTATION",
+                "RENDER_VIDEOS",
+            ),
+            inputs=_SCORE_INPUTS,
+            outputs=(
+                _midi_file(instruments.ID_VIOLIN),
+                f"builds/notations/oT3_{instruments.ID_VIOLIN}.pdf",
+            ),
+            dependencies=(_REGISTERED_TIME_BRACKETS,),
+        ),
+        build_graph.Stage(
+            "saxophone",
+            _render(
+                render._render_saxophone,
+                "RENDER_MIDIFILES",
+                "RENDER_NOTATION",
+                "RENDER_VIDEOS",
+            ),
+            inputs=_SCORE_INPUTS,
+            outputs=(
+                _midi_file(instruments.ID_SAXOPHONE),
+                f"builds/notations/oT3_{instruments.ID_SAXOPHONE}.pdf",
+            ),
+            dependencies=(_REGISTERED_TIME_BRACKETS, "shadows", "violin"),
+        ),
+        build_graph.Stage(
+            "saturation_sines",
+            _render(render._render_saturation_sines, "RENDER_SOUNDFILES"),
+            inputs=_SOUNDFILE_INPUTS,
+            outputs=tuple(
+                f"builds/soundfiles/{instrument_id}.wav"
+                for instrument_id in instruments.SINE_VOICE_AND_CHANNEL_TO_ID.values()
+            ),
+            dependencies=(_REGISTERED_TIME_BRACKETS,),
+        ),
+        build_graph.Stage(
+            "bells",
+            _render(render._render_bells, "RENDER_MIDIFILES"),
+            inputs=_RENDER_INPUTS
+            + ("ot3/constants/clouds.py", "ot3/converters/symmetrical/bells.py"),
+            outputs=tuple(
+                _midi_file(f"bell{nth_bell}")
+                for nth_bell in range(ot3_constants.clouds.N_BELLS)
+            ),
+        ),
+        build_graph.Stage(
+            "modes",
+            _render(render._render_modes, "RENDER_MIDIFILES"),
+            inputs=_SOUNDFILE_INPUTS,
+            outputs=tuple(_midi_file(mode_id) for mode_id in instruments.MODE_IDS),
+            dependencies=(_REGISTERED_TIME_BRACKETS,),
+        ),
+        build_graph.Stage(
+            "sines",
+            _render(render._render_sines, "RENDER_SOUNDFILES"),
+            inputs=_SOUNDFILE_INPUTS,
+            outputs=tuple(
+                f"builds/soundfiles/{instrument_id}.wav" for instrument_id in sine_ids
+            ),
+            dependencies=(_REGISTERED_TIME_BRACKETS,),
+        ),
+        build_graph.Stage(
+            "drone",
+            _render(render._render_drone, "RENDER_MIDIFILES"),
+            inputs=_RENDER_INPUTS
+            + (
+                "ot3/constants/drone.py",
+                "ot3/constants/loudspeakers.py",
+                "ot3/converters/symmetrical/drones.py",
+            ),
+            outputs=tuple(
+                _midi_file(f"drone_{loudspeaker}_{nth_voice}")
+                for loudspeaker in ot3_constants.loudspeakers.LOUDSPEAKERS
+                for nth_voice in range(2)
+            ),
+        ),
+        build_graph.Stage(
+            "score",
+            concatenate_score_parts.main,
+            inputs=concatenate_score_parts.PARTS,
+            outputs=(concatenate_score_parts.SCORE_PATH,),
+            dependencies=("violin", "saxophone"),
+        ),
+    )
+
+
+def make_build_graph(
+    state_path: str = build_graph.DEFAULT_STATE_PATH,
+) -> build_graph.BuildGraph:
+    return build_graph.BuildGraph(
+        _make_register_stages() + _make_render_stages(),
+        state_path=state_path,
+    )
+
+
+# "saturation_sines" are not part of the piece anymore
+DEFAULT_TARGETS = (
+    "shadows",
+    "violin",
+    "saxophone",
+    "bells",
+    "modes",
+    "sines",
+    "drone",
+    "score",
+)
+
+
+def main(
+    targets: typing.Optional[typing.Sequence[str]] = DEFAULT_TARGETS,
+    force: bool = False,
+    adopt_existing_outputs: bool = False,
+    adopt_legacy_families_pitch: bool = False,
+) -> typing.Tuple[str, ...]:
+    if adopt_legacy_families_pitch:
+        ot3_constants.families_pitch.adopt_legacy_families_pitch()
+    return make_build_graph().build(
+        targets, force=force, adopt_existing_outputs=adopt_existing_outputs
+    )
@@ -1,16 +1,18 @@
 from PyPDF2 import PdfFileMerger
 
+PARTS = (
+    "ot3/constants/score/covers/cover.pdf",
+    "ot3/constants/score/introductions/introduction.pdf",
+    "builds/notations/oT3_violin.pdf",
+    "builds/notations/oT3_saxophone.pdf",
+)
+
+SCORE_PATH = "builds/notations/ohneTitel3.pdf"
 
-def main():
-    parts = (
-        "ot3/constants/score/covers/cover.pdf",
-        "ot3/constants/score/introductions/introduction.pdf",
-        "builds/notations/oT3_violin.pdf",
-        "builds/notations/oT3_saxophone.pdf",
-    )
 
+def main():
     merger = PdfFileMerger()
-    for pdf in parts:
+    for pdf in PARTS:
         merger.append(pdf)
-    merger.write("builds/notations/ohneTitel3.pdf")
+    merger.write(SCORE_PATH)
     merger.close()
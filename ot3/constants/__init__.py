@@ -1,16 +1,28 @@
-from . import definitions
-from . import tendencies
-from . import loudspeakers
-from . import concert_pitch
-from . import westminster
-from . import compute
-from . import duration
-from . import harmony
-from . import families_pitch
-from . import clouds
-from . import instruments
-from . import drone
-from . import sines
-from . import modes
-from . import saturations
-from . import serenades
+from ot3.utilities import lazy
+
+# order in which the constants were imported before they were loaded lazily
+# (see ot3.import_all)
+_EAGER_IMPORT_ORDER = (
+    "definitions",
+    "tendencies",
+    "loudspeakers",
+    "concert_pitch",
+    "westminster",
+    "compute",
+    "duration",
+    "harmony",
+    "families_pitch",
+    "clouds",
+    "instruments",
+    "drone",
+    "sines",
+    "modes",
+    "saturations",
+    "serenades",
+)
+
+# constants are only computed when they are accessed for the first time
+__getattr__ = lazy.lazy_submodules(
+    __name__,
+    _EAGER_IMPORT_ORDER + ("common_harmonics", "time_brackets_container"),
+)
@@ -1,3 +1,5 @@
+import os
+
 COMPUTE_FAMILIES_PITCH = False
 COMPUTE_STOCHASTIC_PARTS = False
 COMPUTE_BELLS = False
@@ -7,3 +9,7 @@ RENDER_SOUNDFILES = False
 RENDER_MIDIFILES = False
 RENDER_NOTATION = False
 RENDER_VIDEOS = True
+
+# how many processes are used for independent computations
+# (results are the same for any number of processes)
+N_PROCESSES = os.cpu_count() or 1
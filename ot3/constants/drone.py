@@ -65,8 +65,10 @@ ABSOLUTE_WEIGHT_TENDENCY = generators.koenig.Tendency(
 )
 
 
+# each loudspeaker owns its own random generator (see
+# 'FamiliesPitchToDronesConverter')
 LOUDSPEAKER_TO_REGISTERS_TO_CHOOSE_FROM_DYNAMIC_CHOICES = {
-    ot3_constants.loudspeakers.ID_RADIO_VIOLIN: generators.generic.DynamicChoice(
+    ot3_constants.loudspeakers.ID_RADIO_VIOLIN: ot3_utilities.tools.DynamicChoice(
         ((2,), (2, 1), (2, 1), (1, 2), (0, 1),),
         (
             expenvelope.Envelope.from_points(
@@ -85,8 +87,9 @@ LOUDSPEAKER_TO_REGISTERS_TO_CHOOSE_FROM_DYNAMIC_CHOICES = {
                 (0, 0), (0.3, 0.2), (0.4, 0.5), (0.6, 1), (0.8, 0.5), (1, 0.4),
             ),
         ),
+        random_seed=100,
     ),
-    ot3_constants.loudspeakers.ID_RADIO_SAXOPHONE: generators.generic.DynamicChoice(
+    ot3_constants.loudspeakers.ID_RADIO_SAXOPHONE: ot3_utilities.tools.DynamicChoice(
         ((2,), (2, 1), (2, 1, 0), (1, 0), (0, -1),),
         (
             expenvelope.Envelope.from_points(
@@ -105,8 +108,9 @@ LOUDSPEAKER_TO_REGISTERS_TO_CHOOSE_FROM_DYNAMIC_CHOICES = {
                 (0, 0), (0.3, 0.2), (0.4, 0.5), (0.6, 1), (0.8, 0.6), (1, 0.5),
             ),
         ),
+        random_seed=101,
     ),
-    ot3_constants.loudspeakers.ID_RADIO_BOAT0: generators.generic.DynamicChoice(
+    ot3_constants.loudspeakers.ID_RADIO_BOAT0: ot3_utilities.tools.DynamicChoice(
         ((2,), (2, 1), (1, 0), (1, 0, -1),),
         (
             expenvelope.Envelope.from_points(
@@ -122,8 +126,9 @@ LOUDSPEAKER_TO_REGISTERS_TO_CHOOSE_FROM_DYNAMIC_CHOICES = {
                 (0, 0), (0.3, 0.3), (0.4, 0.5), (0.6, 1), (0.8, 0.6), (1, 0.5),
             ),
         ),
+        random_seed=102,
     ),
-    ot3_constants.loudspeakers.ID_RADIO_BOAT1: generators.generic.DynamicChoice(
+    ot3_constants.loudspeakers.ID_RADIO_BOAT1: ot3_utilities.tools.DynamicChoice(
         ((2,), (2, 1), (1, 0), (1, 0, -1),),
         (
             expenvelope.Envelope.from_points(
@@ -139,8 +144,9 @@ LOUDSPEAKER_TO_REGISTERS_TO_CHOOSE_FROM_DYNAMIC_CHOICES = {
                 (0, 0), (0.3, 0.2), (0.4, 0.3), (0.6, 1), (0.8, 0.6), (1, 0.5),
             ),
         ),
+        random_seed=103,
     ),
-    ot3_constants.loudspeakers.ID_RADIO_BOAT2: generators.generic.DynamicChoice(
+    ot3_constants.loudspeakers.ID_RADIO_BOAT2: ot3_utilities.tools.DynamicChoice(
         ((2,), (2, 1), (1, 0), (1, 0, -1),),
         (
             expenvelope.Envelope.from_points(
@@ -156,5 +162,6 @@ LOUDSPEAKER_TO_REGISTERS_TO_CHOOSE_FROM_DYNAMIC_CHOICES = {
                 (0, 0), (0.3, 0.1), (0.4, 0.4), (0.6, 1), (0.8, 0.6), (1, 0.5),
             ),
         ),
+        random_seed=104,
     ),
 }
@@ -1,14 +1,21 @@
 """Definition of global 'FamilyOfPitchCurves'.
 """
 
+import random
 import typing
 
+import numpy as np
+
 from mutwo.converters.frontends import ekmelily_constants
 from mutwo.events import basic
 from mutwo.events import families
-from mutwo import utilities
+from mutwo import parameters
+from mutwo.parameters import pitches
 
 from ot3 import constants as ot3_constants
+from ot3.utilities import cache
+from ot3.utilities import lazy
+from ot3.utilities import tools
 
 
 def _concatenate_families(
@@ -50,38 +57,114 @@ def _filter_curves_with_unnotateable_pitches(
     return family_of_pitch_curves.filter(condition, mutate=False)
 
 
-@utilities.decorators.compute_lazy(
-    "ot3/constants/FAMILIES_PITCH.pickle",
+GENERATIONS = 600
+# GENERATIONS = 100
+POPULATION_SIZE = 120
+# POPULATION_SIZE = 80
+
+ROOT_REGISTER_TO_WEIGHT = {
+    -3: 0.1,
+    -2: 0.2,
+    -1: 0.75,
+    0: 1,
+    1: 0.75,
+    2: 0.2,
+    3: 0.1,
+}
+
+REST_DURATION_BEFORE_FIRST_FAMILY_ARRIVES = 30
+
+# written by the former "compute_lazy" decorator (see adopt_legacy_families_pitch)
+LEGACY_FAMILIES_PITCH_PATH = "ot3/constants/FAMILIES_PITCH.pickle"
+
+
+def _get_seed_for_family(
+    root_pitches: typing.Tuple[pitches.JustIntonationPitch, ...],
+    connection_pitches: typing.Tuple[pitches.JustIntonationPitch, ...],
+    duration: parameters.abc.DurationType,
+) -> int:
+    # the seed only depends on the data of the family itself, so that
+    # the result of one family neither depends on the order of evolution
+    # nor on the data of any other family
+    return int(
+        cache.make_digest((root_pitches, connection_pitches, duration))[:8], 16
+    )
+
+
+# each family is cached on its own, so that changing the data of one family
+# only recomputes this family and an interrupted computation of all families
+# only has to evolve the families which haven't been finished yet (therefore
+# COMPUTE_FAMILIES_PITCH isn't applied here)
+@cache.compute_cached(
+    families,
+    GENERATIONS,
+    POPULATION_SIZE,
+    ROOT_REGISTER_TO_WEIGHT,
+    lambda: _evolve_family,
+)
+def _make_family(
+    root_pitches: typing.Tuple[pitches.JustIntonationPitch, ...],
+    connection_pitches: typing.Tuple[pitches.JustIntonationPitch, ...],
+    duration: parameters.abc.DurationType,
+    seed: int,
+) -> families.RootAndConnectionBasedFamilyOfPitchCurves:
+    # use the global generators (as the evolution does) with a seed per
+    # family, but don't change their state for anything computed afterwards
+    random_state, numpy_random_state = random.getstate(), np.random.get_state()
+    random.seed(seed)
+    np.random.seed(seed)
+    try:
+        return _evolve_family(root_pitches, connection_pitches, duration)
+    finally:
+        random.setstate(random_state)
+        np.random.set_state(numpy_random_state)
+
+
+def _evolve_family(
+    root_pitches: typing.Tuple[pitches.JustIntonationPitch, ...],
+    connection_pitches: typing.Tuple[pitches.JustIntonationPitch, ...],
+    duration: parameters.abc.DurationType,
+) -> families.RootAndConnectionBasedFamilyOfPitchCurves:
+    return families.RootAndConnectionBasedFamilyOfPitchCurves(
+        duration,
+        root_pitches,
+        connection_pitches,
+        allowed_primes=(2, 3, 5, 7),
+        generations=GENERATIONS,
+        population_size=POPULATION_SIZE,
+        root_register_to_weight=ROOT_REGISTER_TO_WEIGHT,
+    )
+
+
+@cache.compute_cached(
+    families,
+    lambda: ot3_constants.harmony.FAMILY_DATA_PER_FAMILY,
+    lambda: ot3_constants.harmony.DURATION_PER_REST,
+    GENERATIONS,
+    POPULATION_SIZE,
+    ROOT_REGISTER_TO_WEIGHT,
+    REST_DURATION_BEFORE_FIRST_FAMILY_ARRIVES,
+    lambda: _make_family,
+    lambda: _evolve_family,
     force_to_compute=ot3_constants.compute.COMPUTE_FAMILIES_PITCH,
 )
 def _make_families() -> basic.SequentialEvent[
     typing.Union[basic.SimpleEvent, families.FamilyOfPitchCurves]
 ]:
+    # the families are independent from each other and can therefore
+    # be evolved in parallel
+    evolved_families = tools.map_in_processes(
+        _make_family,
+        _get_family_arguments_per_family(),
+        n_processes=ot3_constants.compute.N_PROCESSES,
+    )
+
     families_pitch = basic.SequentialEvent(
         [basic.SimpleEvent(REST_DURATION_BEFORE_FIRST_FAMILY_ARRIVES)]
     )
-    for family_data, duration_per_rest in zip(
-        ot3_constants.harmony.FAMILY_DATA_PER_FAMILY,
-        ot3_constants.harmony.DURATION_PER_REST + (None,),
+    for family, duration_per_rest in zip(
+        evolved_families, ot3_constants.harmony.DURATION_PER_REST + (None,),
     ):
-        root_pitches, connection_pitches, duration = family_data
-        family = families.RootAndConnectionBasedFamilyOfPitchCurves(
-            duration,
-            root_pitches,
-            connection_pitches,
-            allowed_primes=(2, 3, 5, 7),
-            generations=GENERATIONS,
-            population_size=POPULATION_SIZE,
-            root_register_to_weight={
-                -3: 0.1,
-                -2: 0.2,
-                -1: 0.75,
-                0: 1,
-                1: 0.75,
-                2: 0.2,
-                3: 0.1,
-            },
-        )
         families_pitch.append(family)
         if duration_per_rest:
             rest = basic.SimpleEvent(duration_per_rest)
@@ -90,28 +173,96 @@ def _make_families() -> basic.SequentialEvent[
     return families_pitch
 
 
-GENERATIONS = 600
-# GENERATIONS = 100
-POPULATION_SIZE = 120
-# POPULATION_SIZE = 80
+def _get_family_arguments_per_family() -> typing.Tuple[
+    typing.Tuple[
+        typing.Tuple[pitches.JustIntonationPitch, ...],
+        typing.Tuple[pitches.JustIntonationPitch, ...],
+        parameters.abc.DurationType,
+        int,
+    ],
+    ...,
+]:
+    return tuple(
+        (
+            root_pitches,
+            connection_pitches,
+            duration,
+            _get_seed_for_family(root_pitches, connection_pitches, duration),
+        )
+        for root_pitches, connection_pitches, duration in ot3_constants.harmony.FAMILY_DATA_PER_FAMILY
+    )
 
-REST_DURATION_BEFORE_FIRST_FAMILY_ARRIVES = 30
-FAMILIES_PITCH = _make_families()
 
-# omit family 15 for making serenade at this position
-FAMILIES_PITCH[15] = basic.SimpleEvent(FAMILIES_PITCH[15].duration)
+def adopt_legacy_families_pitch(path: str = LEGACY_FAMILIES_PITCH_PATH):
+    """Use the families of a pickle written by the former 'compute_lazy'.
 
-FAMILY_PITCH = _concatenate_families(FAMILIES_PITCH)
-FAMILY_PITCH_ONLY_WITH_NOTATEABLE_PITCHES = _filter_curves_with_unnotateable_pitches(
-    FAMILY_PITCH
-)
-# FAMILY_PITCH.show_plot()  # insane plot showing function
+    Explicit one-off migration step: only call it if the families of the
+    pickle match the current family data, GENERATIONS and POPULATION_SIZE.
+    Each family is stored as the cached result of '_make_family' (so that
+    changing the data of one family only evolves this family again) and the
+    whole sequence as the cached result of '_make_families'.
+    """
+
+    legacy_families_pitch = cache.load_compute_lazy_result(path)
+    legacy_families = tuple(
+        family for family in legacy_families_pitch if type(family) != basic.SimpleEvent
+    )
+    family_arguments_per_family = _get_family_arguments_per_family()
+    if len(legacy_families) != len(family_arguments_per_family):
+        raise ValueError(
+            f"Pickle '{path}' contains {len(legacy_families)} families, but"
+            f" {len(family_arguments_per_family)} families are defined."
+        )
 
+    for family, family_arguments in zip(legacy_families, family_arguments_per_family):
+        _make_family.adopt(family, *family_arguments)
+    _make_families.adopt(legacy_families_pitch)
 
-NOTATEABLE_PITCH_TO_PITCH_COUNTER = {}
-for curve in FAMILY_PITCH_ONLY_WITH_NOTATEABLE_PITCHES:
-    pitch_as_exponents = curve.pitch.exponents
-    if pitch_as_exponents in NOTATEABLE_PITCH_TO_PITCH_COUNTER:
-        NOTATEABLE_PITCH_TO_PITCH_COUNTER[pitch_as_exponents] += 1
-    else:
-        NOTATEABLE_PITCH_TO_PITCH_COUNTER.update({pitch_as_exponents: 1})
+
+def _make_families_pitch() -> basic.SequentialEvent[
+    typing.Union[basic.SimpleEvent, families.FamilyOfPitchCurves]
+]:
+    families_pitch = _make_families()
+    # omit family 15 for making serenade at this position
+    families_pitch[15] = basic.SimpleEvent(families_pitch[15].duration)
+    return families_pitch
+
+
+def _make_families_pitch_key() -> str:
+    # make sure FAMILIES_PITCH has been loaded
+    ot3_constants.families_pitch.FAMILIES_PITCH
+    return _make_families.last_key
+
+
+def _make_notateable_pitch_to_pitch_counter() -> typing.Dict[
+    typing.Tuple[int, ...], int
+]:
+    notateable_pitch_to_pitch_counter = {}
+    for curve in ot3_constants.families_pitch.FAMILY_PITCH_ONLY_WITH_NOTATEABLE_PITCHES:
+        pitch_as_exponents = curve.pitch.exponents
+        if pitch_as_exponents in notateable_pitch_to_pitch_counter:
+            notateable_pitch_to_pitch_counter[pitch_as_exponents] += 1
+        else:
+            notateable_pitch_to_pitch_counter.update({pitch_as_exponents: 1})
+    return notateable_pitch_to_pitch_counter
+
+
+# FAMILY_PITCH.show_plot()  # insane plot showing function
+
+# the families are only loaded (or computed) when they are accessed
+# for the first time
+__getattr__ = lazy.lazy_attributes(
+    __name__,
+    {
+        "FAMILIES_PITCH": _make_families_pitch,
+        # other caches which depend on FAMILIES_PITCH use this key
+        "FAMILIES_PITCH_KEY": _make_families_pitch_key,
+        "FAMILY_PITCH": lambda: _concatenate_families(
+            ot3_constants.families_pitch.FAMILIES_PITCH
+        ),
+        "FAMILY_PITCH_ONLY_WITH_NOTATEABLE_PITCHES": lambda: _filter_curves_with_unnotateable_pitches(
+            ot3_constants.families_pitch.FAMILY_PITCH
+        ),
+        "NOTATEABLE_PITCH_TO_PITCH_COUNTER": _make_notateable_pitch_to_pitch_counter,
+    },
+)
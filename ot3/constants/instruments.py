@@ -1,16 +1,18 @@
 import functools
+import itertools
 import operator
 import typing
 import warnings
 
 from mutwo.parameters import pitches
 
+from ot3 import constants as ot3_constants
 from ot3.constants import concert_pitch
-from ot3.constants import families_pitch
 from ot3.constants import westminster
 from ot3.parameters import ambitus
 from ot3.parameters import playing_indicators
 from ot3.parameters import spectrals
+from ot3.utilities import lazy
 
 
 def _convert_western_pitch_to_ji_pitch(
@@ -98,44 +100,46 @@ _AMBITUS_SAXOPHONE_JUST_INTONATION_PITCHES = ambitus.Ambitus(
 # how often a pitch should appear in the complete composition
 # to get added to the saxophone ambitus
 _minimal_appearence_of_pitch_to_get_added_to_saxophone_ambitus = 7
-_saxophone_ambitus_pitch_set = []
-for (
-    pitch_as_exponent,
-    how_often_pitch_appears,
-) in families_pitch.NOTATEABLE_PITCH_TO_PITCH_COUNTER.items():
-    pitch_as_pitch = pitches.JustIntonationPitch(pitch_as_exponent)
-    shall_be_added_tests = (
-        how_often_pitch_appears
-        > _minimal_appearence_of_pitch_to_get_added_to_saxophone_ambitus,
-        len(pitch_as_exponent) <= 2,
-    )
-    if any(shall_be_added_tests) and pitch_as_pitch not in (
-        pitches.JustIntonationPitch("5/7"),
-        pitches.JustIntonationPitch("7/10"),
-        pitches.JustIntonationPitch("7/5"),
-        pitches.JustIntonationPitch("10/7"),
-    ):
-        pitch_variants = (
-            _AMBITUS_SAXOPHONE_JUST_INTONATION_PITCHES.find_all_pitch_variants(
-                pitch_as_pitch
-            )
+
+
+def _make_ambitus_saxophone_just_intonation_pitches() -> ambitus.SetBasedAmbitus:
+    saxophone_ambitus_pitch_set = []
+    for (
+        pitch_as_exponent,
+        how_often_pitch_appears,
+    ) in ot3_constants.families_pitch.NOTATEABLE_PITCH_TO_PITCH_COUNTER.items():
+        pitch_as_pitch = pitches.JustIntonationPitch(pitch_as_exponent)
+        shall_be_added_tests = (
+            how_often_pitch_appears
+            > _minimal_appearence_of_pitch_to_get_added_to_saxophone_ambitus,
+            len(pitch_as_exponent) <= 2,
         )
-        _saxophone_ambitus_pitch_set.extend(pitch_variants)
+        if any(shall_be_added_tests) and pitch_as_pitch not in (
+            pitches.JustIntonationPitch("5/7"),
+            pitches.JustIntonationPitch("7/10"),
+            pitches.JustIntonationPitch("7/5"),
+            pitches.JustIntonationPitch("10/7"),
+        ):
+            pitch_variants = (
+                _AMBITUS_SAXOPHONE_JUST_INTONATION_PITCHES.find_all_pitch_variants(
+                    pitch_as_pitch
+                )
+            )
+            saxophone_ambitus_pitch_set.extend(pitch_variants)
 
-_saxophone_ambitus_pitch_set.extend(westminster.INTONATIONS0)
-_saxophone_ambitus_pitch_set.extend(westminster.INTONATIONS1)
+    saxophone_ambitus_pitch_set.extend(westminster.INTONATIONS0)
+    saxophone_ambitus_pitch_set.extend(westminster.INTONATIONS1)
 
-_saxophone_ambitus_pitch_set.append(pitches.JustIntonationPitch("6/7"))
-_saxophone_ambitus_pitch_set.append(pitches.JustIntonationPitch("5/8"))
-_saxophone_ambitus_pitch_set.append(pitches.JustIntonationPitch("35/32"))
-_saxophone_ambitus_pitch_set.append(pitches.JustIntonationPitch("5/4"))
-_saxophone_ambitus_pitch_set.append(pitches.JustIntonationPitch("9/16"))
-_saxophone_ambitus_pitch_set.append(pitches.JustIntonationPitch("64/81"))
-_saxophone_ambitus_pitch_set.append(pitches.JustIntonationPitch("1/2"))
+    saxophone_ambitus_pitch_set.append(pitches.JustIntonationPitch("6/7"))
+    saxophone_ambitus_pitch_set.append(pitches.JustIntonationPitch("5/8"))
+    saxophone_ambitus_pitch_set.append(pitches.JustIntonationPitch("35/32"))
+    saxophone_ambitus_pitch_set.append(pitches.JustIntonationPitch("5/4"))
+    saxophone_ambitus_pitch_set.append(pitches.JustIntonationPitch("9/16"))
+    saxophone_ambitus_pitch_set.append(pitches.JustIntonationPitch("64/81"))
+    saxophone_ambitus_pitch_set.append(pitches.JustIntonationPitch("1/2"))
+
+    return ambitus.SetBasedAmbitus(saxophone_ambitus_pitch_set)
 
-AMBITUS_SAXOPHONE_JUST_INTONATION_PITCHES = ambitus.SetBasedAmbitus(
-    _saxophone_ambitus_pitch_set
-)
 
 N_HARMONICS_PER_FINGERING = (6, 3, 3)
 
@@ -152,26 +156,27 @@ SCORDATURA_SAXOPHONE_TUNING = (
     pitches.JustIntonationPitch("3/4"),
 )
 
-SAXOPHONE = spectrals.StringInstrument(
-    tuple(
-        spectrals.String(
-            nth_string,
-            original_tuning_of_string,
-            scordatura_tuning_of_string,
-            scordatura_tuning_of_string,
-            n_harmonics,
-        )
-        for nth_string, original_tuning_of_string, scordatura_tuning_of_string, n_harmonics in zip(
-            range(4),
-            ORIGINAL_SAXOPHONE_TUNING_WESTERN_PITCHES,
-            SCORDATURA_SAXOPHONE_TUNING,
-            N_HARMONICS_PER_FINGERING,
-        )
+_SAXOPHONE_STRINGS = tuple(
+    spectrals.String(
+        nth_string,
+        original_tuning_of_string,
+        scordatura_tuning_of_string,
+        scordatura_tuning_of_string,
+        n_harmonics,
+    )
+    for nth_string, original_tuning_of_string, scordatura_tuning_of_string, n_harmonics in zip(
+        range(4),
+        ORIGINAL_SAXOPHONE_TUNING_WESTERN_PITCHES,
+        SCORDATURA_SAXOPHONE_TUNING,
+        N_HARMONICS_PER_FINGERING,
     )
 )
 
-# remove 1/1 and 2/1 (force to use 4/1)
-SAXOPHONE.strings[0]._harmonics = SAXOPHONE.strings[0]._harmonics[2:]
+# remove 1/1 and 2/1 (force to use 4/1); this has to happen before the
+# StringInstrument gets initialised, because it indexes the harmonics
+_SAXOPHONE_STRINGS[0].harmonics = _SAXOPHONE_STRINGS[0].harmonics[2:]
+
+SAXOPHONE = spectrals.StringInstrument(_SAXOPHONE_STRINGS)
 
 AMBITUS_SAXOPHONE_HARMONICS = ambitus.SetBasedAmbitus(
     functools.reduce(
@@ -181,23 +186,26 @@ AMBITUS_SAXOPHONE_HARMONICS = ambitus.SetBasedAmbitus(
 )
 
 Exponents = typing.Tuple[int, ...]
-SOUNDING_SAXOPHONE_PITCH_TO_WRITTEN_SAXOPHONE_PITCH_AND_CENT_DEVIATION: typing.Dict[
-    Exponents, typing.Tuple[pitches.WesternPitch, typing.Optional[float]]
-] = {}
 
 _saxophone_root = pitches.WesternPitch("cs", 4)
 
-for pitch in AMBITUS_SAXOPHONE_JUST_INTONATION_PITCHES.pitches:
-    stepsize = round((pitch + pitches.JustIntonationPitch("2/1")).cents / 100)
-    as_western_pitch = _saxophone_root.add(stepsize, mutate=False)
-    if len(pitch.exponents) > 2:
-        cent_deviation = pitch.cent_deviation_from_closest_western_pitch_class
-    else:
-        cent_deviation = None
 
-    SOUNDING_SAXOPHONE_PITCH_TO_WRITTEN_SAXOPHONE_PITCH_AND_CENT_DEVIATION.update(
-        {pitch.exponents: (as_western_pitch, cent_deviation)}
-    )
+def _make_sounding_saxophone_pitch_to_written_saxophone_pitch_and_cent_deviation() -> typing.Dict[
+    Exponents, typing.Tuple[pitches.WesternPitch, typing.Optional[float]]
+]:
+    sounding_saxophone_pitch_to_written_saxophone_pitch_and_cent_deviation = {}
+    for pitch in ot3_constants.instruments.AMBITUS_SAXOPHONE_JUST_INTONATION_PITCHES.pitches:
+        stepsize = round((pitch + pitches.JustIntonationPitch("2/1")).cents / 100)
+        as_western_pitch = _saxophone_root.add(stepsize, mutate=False)
+        if len(pitch.exponents) > 2:
+            cent_deviation = pitch.cent_deviation_from_closest_western_pitch_class
+        else:
+            cent_deviation = None
+
+        sounding_saxophone_pitch_to_written_saxophone_pitch_and_cent_deviation.update(
+            {pitch.exponents: (as_western_pitch, cent_deviation)}
+        )
+    return sounding_saxophone_pitch_to_written_saxophone_pitch_and_cent_deviation
 
 
 SAXOPHONE_MULTIPHONIC_PITCHES_TO_MULTIPHONICS_DATA: typing.Dict[
@@ -612,7 +620,7 @@ def apply_saxophone_pitch(simple_event):
                         (
                             western_pitch,
                             cent_deviation,
-                        ) = SOUNDING_SAXOPHONE_PITCH_TO_WRITTEN_SAXOPHONE_PITCH_AND_CENT_DEVIATION[
+                        ) = ot3_constants.instruments.SOUNDING_SAXOPHONE_PITCH_TO_WRITTEN_SAXOPHONE_PITCH_AND_CENT_DEVIATION[
                             pitch_or_pitches[0].exponents
                         ]
                         simple_event.pitch_or_pitches = [western_pitch]
@@ -697,3 +705,74 @@ VIOLIN_HARMONIC_TO_VIOLIN_STRINGS = {
     harmonic.exponents: VIOLIN.get_strings_with_pitch_in_harmonics(harmonic)
     for harmonic in AMBITUS_VIOLIN_HARMONICS.pitches
 }
+
+# nodes of a double flageolett have to be closer than this interval
+MAXIMUM_DISTANCE_BETWEEN_DOUBLE_FLAGEOLETT_NODES = pitches.JustIntonationPitch("6/5")
+
+
+def _get_violin_harmonic_nodes(
+    string: spectrals.String, harmonic_pitch: pitches.JustIntonationPitch
+) -> typing.Tuple[spectrals.Node, ...]:
+    return string.get_harmonic(harmonic_pitch).nodes
+
+
+def _make_violin_harmonic_pair_to_double_flageoletts() -> typing.Dict[
+    typing.Tuple[Exponents, Exponents],
+    typing.Tuple[
+        typing.Tuple[
+            typing.Tuple[spectrals.String, spectrals.String],
+            typing.Tuple[spectrals.Node, spectrals.Node],
+        ],
+        ...,
+    ],
+]:
+    # each harmonic only once (but a harmonic can be combined with itself,
+    # if it's available on two strings)
+    harmonics = tuple(
+        {
+            harmonic.exponents: harmonic
+            for harmonic in AMBITUS_VIOLIN_HARMONICS.pitches
+        }.values()
+    )
+    violin_harmonic_pair_to_double_flageoletts = {}
+    for harmonic0, harmonic1 in itertools.product(harmonics, repeat=2):
+        double_flageoletts = []
+        for string0, string1 in itertools.product(
+            VIOLIN_HARMONIC_TO_VIOLIN_STRINGS[harmonic0.exponents],
+            VIOLIN_HARMONIC_TO_VIOLIN_STRINGS[harmonic1.exponents],
+        ):
+            # only neighbouring strings can be played at the same time
+            if abs(string0.nth_string - string1.nth_string) == 1:
+                for node0, node1 in itertools.product(
+                    _get_violin_harmonic_nodes(string0, harmonic0),
+                    _get_violin_harmonic_nodes(string1, harmonic1),
+                ):
+                    distance_between_distances = abs(
+                        node0.distance_as_just_intonation_pitch
+                        - node1.distance_as_just_intonation_pitch
+                    )
+                    if (
+                        distance_between_distances
+                        < MAXIMUM_DISTANCE_BETWEEN_DOUBLE_FLAGEOLETT_NODES
+                    ):
+                        double_flageoletts.append(((string0, string1), (node0, node1)))
+                        break
+        if double_flageoletts:
+            violin_harmonic_pair_to_double_flageoletts[
+                (harmonic0.exponents, harmonic1.exponents)
+            ] = tuple(double_flageoletts)
+    return violin_harmonic_pair_to_double_flageoletts
+
+
+# these constants are only computed when they are accessed for the first
+# time (the saxophone pitches depend on FAMILIES_PITCH)
+__getattr__ = lazy.lazy_attributes(
+    __name__,
+    {
+        "AMBITUS_SAXOPHONE_JUST_INTONATION_PITCHES": _make_ambitus_saxophone_just_intonation_pitches,
+        "SOUNDING_SAXOPHONE_PITCH_TO_WRITTEN_SAXOPHONE_PITCH_AND_CENT_DEVIATION": _make_sounding_saxophone_pitch_to_written_saxophone_pitch_and_cent_deviation,
+        # double flageoletts which are playable on the violin: for each pair
+        # of harmonics (as exponents) all pairs of strings and nodes
+        "VIOLIN_HARMONIC_PAIR_TO_DOUBLE_FLAGEOLETTS": _make_violin_harmonic_pair_to_double_flageoletts,
+    },
+)
@@ -1,8 +1,12 @@
+import typing
+
 from mutwo import converters
 from mutwo import events
 
+from ot3 import constants as ot3_constants
+from ot3.utilities import lazy
+
 from . import definitions
-from . import postprocess
 
 
 class TempoBasedTimeBracketWithTimeSignatures(
@@ -81,15 +85,27 @@ def _convert_to_time_bracket(
     return time_bracket
 
 
-SERENADES_AS_EVENTS = {
-    name: _convert_from_mmml(content)
-    for name, content in definitions.DEFINITIONS.items()
-}
-postprocess.main(SERENADES_AS_EVENTS, definitions)
+def _make_serenades_as_events() -> typing.Dict[str, events.basic.SimultaneousEvent]:
+    from . import postprocess
+
+    serenades_as_events = {
+        name: _convert_from_mmml(content)
+        for name, content in definitions.DEFINITIONS.items()
+    }
+    postprocess.main(serenades_as_events, definitions)
+    return serenades_as_events
+
+
+def _make_serenades() -> typing.Dict[str, TempoBasedTimeBracketWithTimeSignatures]:
+    return {
+        name: _convert_to_time_bracket(name, serenade)
+        for name, serenade in ot3_constants.serenades.SERENADES_AS_EVENTS.items()
+    }
 
-SERENADES = {
-    name: _convert_to_time_bracket(name, serenade)
-    for name, serenade in SERENADES_AS_EVENTS.items()
-}
 
-del postprocess
+# parsing the serenades is slow, therefore it only happens when
+# they are accessed for the first time
+__getattr__ = lazy.lazy_attributes(
+    __name__,
+    {"SERENADES_AS_EVENTS": _make_serenades_as_events, "SERENADES": _make_serenades},
+)
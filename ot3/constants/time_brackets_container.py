@@ -1,3 +1,3 @@
-from mutwo.events import time_brackets
+from ot3.events import time_brackets
 
-TIME_BRACKETS = time_brackets.TimeBracketContainer([])
+TIME_BRACKETS = time_brackets.IndexedTimeBracketContainer([])
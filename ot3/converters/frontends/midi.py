@@ -1,20 +1,79 @@
-import functools
-import operator
+import collections
+import dataclasses
+import heapq
+import itertools
+import struct
+import time
 import typing
 
 import expenvelope
 import mido
+from mido.midifiles import midifiles as mido_midifiles
 
 from mutwo.converters.frontends import midi
 from mutwo.converters import symmetrical
 from mutwo.events import abc
+from mutwo.events import basic
 from mutwo import parameters
 from mutwo import utilities
 
+from ot3 import utilities as ot3_utilities
+
+# (absolute tick, nth stream, nth message, message): sorting by the first three
+# items gives the same order as the stable sort of mutwos MidiFileConverter
+KeyedMidiMessage = typing.Tuple[int, int, int, mido.Message]
+
+
+def _get_simple_events(event: abc.Event) -> typing.Iterator[basic.SimpleEvent]:
+    if isinstance(event, basic.SimpleEvent):
+        yield event
+    else:
+        for sub_event in event:
+            yield from _get_simple_events(sub_event)
+
+
+class ScalingTempoConverter(symmetrical.tempos.TempoConverter):
+    """Apply a tempo curve, but simply scale durations if the tempo is constant.
+
+    If the tempo never changes, all durations are multiplied by the beat
+    length instead of integrating the tempo curve for each simple event.
+    """
+
+    def __init__(self, tempo_envelope: expenvelope.Envelope):
+        super().__init__(tempo_envelope)
+        beat_lengths_in_seconds = set(self._envelope.levels)
+        if len(beat_lengths_in_seconds) == 1:
+            self._constant_beat_length_in_seconds = beat_lengths_in_seconds.pop()
+        else:
+            self._constant_beat_length_in_seconds = None
+
+    def _scale_durations(self, event_to_scale: abc.Event):
+        for simple_event in _get_simple_events(event_to_scale):
+            simple_event.duration = (
+                simple_event.duration * self._constant_beat_length_in_seconds
+            )
+
+    def convert(self, event_to_convert: abc.Event) -> abc.Event:
+        if self._constant_beat_length_in_seconds is None:
+            return super().convert(event_to_convert)
+
+        converted_event = event_to_convert.destructive_copy()
+        self._scale_durations(converted_event)
+        return converted_event
+
+
+# only set while 'export_midi_files' is running: maps the ids of the events
+# which are exported by more than one job to their tempo converted versions
+# (by the id of the used tempo converter), so that their tempo is only
+# converted once per process
+_SHARED_EVENT_ID_TO_TEMPO_CONVERTED_EVENTS: typing.Dict[
+    int, typing.Dict[int, abc.Event]
+] = {}
+
 
 class OT3InstrumentEventToMidiFileConverter(midi.MidiFileConverter):
     _shall_apply_tempo_coverter = True
-    _tempo_converter = symmetrical.tempos.TempoConverter(
+    _tempo_converter = ScalingTempoConverter(
         # expenvelope.Envelope.from_levels_and_durations(levels=[7.5, 7.5], durations=[1])
         expenvelope.Envelope.from_levels_and_durations(levels=[30, 30], durations=[1])
     )
@@ -35,24 +94,188 @@ class OT3InstrumentEventToMidiFileConverter(midi.MidiFileConverter):
         )
 
     def _apply_tempo_coverter(self, event_to_convert: abc.Event) -> abc.Event:
-        if self._shall_apply_tempo_coverter:
+        if not self._shall_apply_tempo_coverter:
+            return event_to_convert
+
+        try:
+            tempo_converted_events = _SHARED_EVENT_ID_TO_TEMPO_CONVERTED_EVENTS[
+                id(event_to_convert)
+            ]
+        except KeyError:
             return self._tempo_converter.convert(event_to_convert)
+
+        key = id(self._tempo_converter)
+        if key not in tempo_converted_events:
+            tempo_converted_events[key] = self._tempo_converter.convert(
+                event_to_convert
+            )
+        return tempo_converted_events[key]
+
+    def _set_velocity_extrema_of_event(self, event_to_convert: abc.Event):
+        velocities = (
+            volume.midi_velocity
+            for volume in (
+                getattr(simple_event, "volume", None)
+                for simple_event in _get_simple_events(event_to_convert)
+            )
+            if volume
+        )
+        try:
+            min_velocity = max_velocity = next(velocities)
+        except StopIteration:
+            raise ValueError(f"Event '{event_to_convert}' doesn't contain any volume.")
+        for velocity in velocities:
+            if velocity < min_velocity:
+                min_velocity = velocity
+            elif velocity > max_velocity:
+                max_velocity = velocity
+
+        if min_velocity == max_velocity:
+            max_velocity += 1
+        self._min_velocity_of_event = min_velocity
+        self._max_velocity_of_event = max_velocity
+
+    def _sequential_event_to_keyed_midi_messages(
+        self,
+        sequential_event: basic.SequentialEvent[basic.SimpleEvent],
+        available_midi_channels: typing.Tuple[int, ...],
+        nth_stream: int,
+    ) -> typing.Iterator[KeyedMidiMessage]:
+        available_midi_channels_cycle = itertools.cycle(available_midi_channels)
+        # note off messages wait here until no later event can precede them
+        pending_midi_messages: typing.List[KeyedMidiMessage] = []
+        nth_message = 0
+        for absolute_time, simple_event in zip(
+            sequential_event.absolute_times, sequential_event
+        ):
+            midi_messages = self._simple_event_to_midi_messages(
+                simple_event, absolute_time, available_midi_channels_cycle
+            )
+            if midi_messages:
+                # no later message can precede this key: mutwo adds pitch
+                # bending messages one tick before the note starts
+                key_of_earliest_message = (
+                    self._beats_to_ticks(absolute_time) - 1,
+                    nth_stream,
+                    nth_message,
+                )
+                while pending_midi_messages and (
+                    pending_midi_messages[0][:3] < key_of_earliest_message
+                ):
+                    yield heapq.heappop(pending_midi_messages)
+                for midi_message in midi_messages:
+                    heapq.heappush(
+                        pending_midi_messages,
+                        (midi_message.time, nth_stream, nth_message, midi_message),
+                    )
+                    nth_message += 1
+
+        while pending_midi_messages:
+            yield heapq.heappop(pending_midi_messages)
+
+    def _keyed_midi_messages_to_midi_track(
+        self,
+        keyed_midi_messages_per_stream: typing.Tuple[
+            typing.Iterator[KeyedMidiMessage], ...
+        ],
+        duration: parameters.abc.DurationType,
+        is_first_track: bool = False,
+    ) -> typing.Iterator[mido.Message]:
+        yield mido.MetaMessage("instrument_name", name=self._instrument_name)
+
+        if is_first_track:
+            yield mido.MetaMessage("time_signature", numerator=4, denominator=4)
+            # tempo messages are added after the notes (see mutwo)
+            nth_stream = len(keyed_midi_messages_per_stream)
+            keyed_midi_messages_per_stream += (
+                sorted(
+                    (tempo_message.time, nth_stream, nth_message, tempo_message)
+                    for nth_message, tempo_message in enumerate(
+                        self._tempo_envelope_to_midi_messages(self._tempo_envelope)
+                    )
+                ),
+            )
+
+        previous_absolute_tick = 0
+        for absolute_tick, _, _, midi_message in heapq.merge(
+            *keyed_midi_messages_per_stream
+        ):
+            midi_message.time = absolute_tick - previous_absolute_tick
+            previous_absolute_tick = absolute_tick
+            yield midi_message
+
+        yield mido.MetaMessage(
+            "end_of_track",
+            time=self._beats_to_ticks(duration) - previous_absolute_tick,
+        )
+
+    def _write_midi_file(self, event_to_convert: abc.Event):
+        """Write the event track by track to the converters path.
+
+        Unlike 'MidiFileConverter._event_to_midi_file' this never keeps more than
+        the pending note offs of a track as mido messages in memory: they are
+        created while walking the event and encoded as soon as they are sorted.
+        """
+
+        if isinstance(event_to_convert, basic.SimultaneousEvent):
+            simultaneous_event = event_to_convert
+        elif isinstance(event_to_convert, basic.SequentialEvent):
+            simultaneous_event = basic.SimultaneousEvent([event_to_convert])
+        elif isinstance(event_to_convert, basic.SimpleEvent):
+            simultaneous_event = basic.SimultaneousEvent(
+                [basic.SequentialEvent([event_to_convert])]
+            )
         else:
-            return event_to_convert
+            raise TypeError(
+                f"Can't convert object '{event_to_convert}' of type "
+                f"'{type(event_to_convert)}' to a MidiFile."
+            )
 
-    def convert(self, event_to_convert: abc.Event) -> abc.Event:
-        volumes = event_to_convert.get_parameter("volume")
-        while hasattr(volumes[0], "__iter__"):
-            volumes = functools.reduce(operator.add, volumes)
-        velocities = tuple(
-            volume.midi_velocity for volume in volumes if volume
+        keyed_midi_messages_per_stream = tuple(
+            self._sequential_event_to_keyed_midi_messages(
+                sequential_event, available_midi_channels, nth_stream
+            )
+            for nth_stream, (sequential_event, available_midi_channels) in enumerate(
+                zip(
+                    simultaneous_event,
+                    self._find_available_midi_channels_per_sequential_event(
+                        simultaneous_event
+                    ),
+                )
+            )
         )
-        self._min_velocity_of_event = min(velocities)
-        self._max_velocity_of_event = max(velocities)
+        duration = simultaneous_event.duration
+        if self._midi_file_type == 0:
+            midi_tracks = (
+                self._keyed_midi_messages_to_midi_track(
+                    keyed_midi_messages_per_stream, duration, is_first_track=True
+                ),
+            )
+        else:
+            midi_tracks = tuple(
+                self._keyed_midi_messages_to_midi_track(
+                    (keyed_midi_messages,), duration, is_first_track=nth_track == 0
+                )
+                for nth_track, keyed_midi_messages in enumerate(
+                    keyed_midi_messages_per_stream
+                )
+            )
 
-        if self._min_velocity_of_event == self._max_velocity_of_event:
-            self._max_velocity_of_event += 1
-        return super().convert(self._apply_tempo_coverter(event_to_convert))
+        with open(self.path, "wb") as midi_file:
+            mido_midifiles.write_chunk(
+                midi_file,
+                b"MThd",
+                struct.pack(
+                    ">hhh", self._midi_file_type, len(midi_tracks), self._ticks_per_beat
+                ),
+            )
+            for midi_track in midi_tracks:
+                mido_midifiles.write_track(midi_file, midi_track)
+
+    def convert(self, event_to_convert: abc.Event) -> None:
+        self._n_notes = 0
+        self._set_velocity_extrema_of_event(event_to_convert)
+        self._write_midi_file(self._apply_tempo_coverter(event_to_convert))
 
     def _note_information_to_midi_messages(
         self,
@@ -71,6 +294,7 @@ class OT3InstrumentEventToMidiFileConverter(midi.MidiFileConverter):
                 velocity, min_vel_ev, max_vel_ev, self._min_velocity, self._max_velocity
             )
         )
+        self._n_notes += 1
         return super()._note_information_to_midi_messages(
             absolute_tick_start,
             absolute_tick_end,
@@ -100,3 +324,85 @@ class CommonHarmonicEventToMidiFileConverter(OT3InstrumentEventToMidiFileConvert
             path=f"builds/common_harmonics_{name}.mid",
             midi_file_type=1,  # polyphon instruments
         )
+
+
+@dataclasses.dataclass(frozen=True)
+class MidiFileJob(object):
+    name: str
+    event: abc.Event
+    converter_settings: typing.Dict[str, typing.Any] = dataclasses.field(
+        default_factory=dict
+    )
+    converter_class: typing.Type[
+        OT3InstrumentEventToMidiFileConverter
+    ] = OT3InstrumentEventToMidiFileConverter
+
+    def make_converter(self) -> OT3InstrumentEventToMidiFileConverter:
+        return self.converter_class(self.name, **self.converter_settings)
+
+
+@dataclasses.dataclass(frozen=True)
+class MidiFileReport(object):
+    name: str
+    n_notes: int
+    duration_in_seconds: float
+
+
+# the jobs of the running 'export_midi_files' call; forked workers inherit them,
+# so that the events don't have to be pickled
+_MIDI_FILE_JOBS: typing.Tuple[MidiFileJob, ...] = tuple([])
+
+
+def _export_midi_file(nth_job: int) -> MidiFileReport:
+    job = _MIDI_FILE_JOBS[nth_job]
+    start_time = time.time()
+    converter = job.make_converter()
+    converter.convert(job.event)
+    return MidiFileReport(job.name, converter._n_notes, time.time() - start_time)
+
+
+def export_midi_files(
+    jobs: typing.Iterable[
+        typing.Union[
+            MidiFileJob, typing.Tuple[str, abc.Event, typing.Dict[str, typing.Any]]
+        ]
+    ],
+    n_processes: int = 1,
+) -> typing.Tuple[MidiFileReport, ...]:
+    """Export midi files of OT3 instruments, in parallel if possible.
+
+    :param jobs: Either :class:`MidiFileJob` objects or (name, event,
+        converter settings) tuples.
+    :param n_processes: How many processes export the files.
+    :return: One report (with the number of written notes and the time
+        it took to export the file) for each job, in the order of the jobs.
+    """
+
+    global _MIDI_FILE_JOBS, _SHARED_EVENT_ID_TO_TEMPO_CONVERTED_EVENTS
+
+    _MIDI_FILE_JOBS = tuple(
+        job if isinstance(job, MidiFileJob) else MidiFileJob(*job) for job in jobs
+    )
+    # the jobs keep the events alive until the cache is dropped again, so
+    # their ids can't be reused in the meantime
+    event_id_counter = collections.Counter(id(job.event) for job in _MIDI_FILE_JOBS)
+    _SHARED_EVENT_ID_TO_TEMPO_CONVERTED_EVENTS = {
+        event_id: {} for event_id, n_jobs in event_id_counter.items() if n_jobs > 1
+    }
+    reports = []
+    try:
+        for report in ot3_utilities.tools.imap_in_processes(
+            _export_midi_file,
+            ((nth_job,) for nth_job in range(len(_MIDI_FILE_JOBS))),
+            n_processes=n_processes,
+        ):
+            print(
+                f"MIDI: exported '{report.name}' ({report.n_notes} notes) in"
+                f" {round(report.duration_in_seconds, 2)}s."
+            )
+            reports.append(report)
+    finally:
+        _MIDI_FILE_JOBS = tuple([])
+        _SHARED_EVENT_ID_TO_TEMPO_CONVERTED_EVENTS = {}
+
+    return tuple(reports)
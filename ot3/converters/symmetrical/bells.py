@@ -48,7 +48,7 @@ class StochasticCloudToSequentialEventConverter(CloudToSequentialEventConverter)
         super().__init__(family_of_pitch_curves)
         self._seed = seed
         self._random = np.random.default_rng(seed=seed)
-        self._assigner = converters.symmetrical.families.AssignCurveAndWeightPairsOnEventsConverter(
+        self._assigner = ot3_converters.symmetrical.families.CachedAssignCurveAndWeightPairsOnEventsConverter(
             family_of_pitch_curves,
         )
         self._picker = ot3_converters.symmetrical.families.PickBellPitchesFromCurveAndWeightPairsConverter(
@@ -57,60 +57,46 @@ class StochasticCloudToSequentialEventConverter(CloudToSequentialEventConverter)
 
     def _add_accelerando_and_rilatando_to_rhythm(
         self,
-        rhythm_to_process: typing.Tuple[float, ...],
+        rhythm_to_process: typing.Sequence[float],
         absolute_entry_delay: parameters.abc.DurationType,
-    ) -> typing.Tuple[float, ...]:
+    ) -> np.ndarray:
+        processed_rhythm = np.array(rhythm_to_process, dtype=float)
         factor = self._get_accelerando_and_rilatando_factor(absolute_entry_delay)
         if factor > 0:
-            areas = generators.toussaint.euclidean(len(rhythm_to_process), 4)
+            areas = generators.toussaint.euclidean(len(processed_rhythm), 4)
             indices_per_area = tuple(
-                tuple(map(lambda index: index + position, range(n_items)))
+                np.arange(position, position + n_items)
                 for n_items, position in zip(
                     areas, utilities.tools.accumulate_from_zero(areas)
                 )
             )
 
-            processed_rhythm = list(rhythm_to_process)
-
+            # the first area steals from the second area (accelerando) and the
+            # last area steals from the third area (rilatando); the closer
+            # two notes are to the border between their areas, the less
+            # duration is exchanged
             for indices_to_spend_to, indices_to_steal_from in (
-                indices_per_area[:2],
-                tuple(
-                    tuple(reversed(indices))
-                    for indices in (indices_per_area[3], indices_per_area[2])
-                ),
+                (indices_per_area[0][::-1], indices_per_area[1]),
+                (indices_per_area[3], indices_per_area[2][::-1]),
             ):
-                n_indices_to_spend_to = len(indices_to_spend_to)
-                n_indices_to_steal_from = len(indices_to_steal_from)
-                max_length = min((n_indices_to_spend_to, n_indices_to_steal_from))
+                max_length = min((len(indices_to_spend_to), len(indices_to_steal_from)))
                 factor_per_index = np.linspace(0, factor, max_length + 1, dtype=float)[
                     1:
                 ]
-                for exchange_factor, index_to_spend_to, index_to_steal_from in zip(
-                    factor_per_index,
-                    reversed(indices_to_spend_to),
-                    indices_to_steal_from,
-                ):
-                    steal_duration = (
-                        processed_rhythm[index_to_steal_from] * exchange_factor
-                    )
-                    processed_rhythm[index_to_spend_to] += steal_duration
-                    processed_rhythm[index_to_steal_from] -= steal_duration
-
-                # all_used_indices = indices_to_spend_to + indices_to_steal_from
-                # processed_rhythm[min(all_used_indices) : max(all_used_indices)] = sorted(
-                #     processed_rhythm[min(all_used_indices) : max(all_used_indices)],
-                #     reverse=reverse,
-                # )
-
-            return processed_rhythm
-
-        else:
-            return tuple(rhythm_to_process)
+                indices_to_spend_to = indices_to_spend_to[:max_length]
+                indices_to_steal_from = indices_to_steal_from[:max_length]
+                # both index arrays are disjoint, so each note is only
+                # changed once
+                steal_durations = (
+                    processed_rhythm[indices_to_steal_from] * factor_per_index
+                )
+                processed_rhythm[indices_to_spend_to] += steal_durations
+                processed_rhythm[indices_to_steal_from] -= steal_durations
+
+        return processed_rhythm
 
     @abc.abstractmethod
-    def _make_rhythm(
-        self, cloud_to_convert: Cloud
-    ) -> typing.Sequence[parameters.abc.DurationType]:
+    def _make_rhythm(self, cloud_to_convert: Cloud) -> typing.Sequence[float]:
         raise NotImplementedError
 
     @abc.abstractmethod
@@ -127,7 +113,7 @@ class StochasticCloudToSequentialEventConverter(CloudToSequentialEventConverter)
             rhythm, cloud_to_convert.start_time
         )
         sequential_event = events.basic.SequentialEvent([])
-        for duration in rhythm:
+        for duration in rhythm.tolist():
             note_like = events.music.NoteLike(
                 pitch_or_pitches=[],
                 duration=duration,
@@ -204,44 +190,33 @@ class PeriodicStochasticCloudToSequentialEventConverter(
             absolute_position
         )
 
-    def _make_rhythm(
-        self, cloud_to_convert: Cloud
-    ) -> typing.Sequence[parameters.abc.DurationType]:
+    def _make_rhythm(self, cloud_to_convert: Cloud) -> np.ndarray:
         duration = cloud_to_convert.duration
         expected_average_note_duration = cloud_to_convert.average_note_duration
         n_times = int(duration / expected_average_note_duration)
         real_average_note_duration = duration / n_times
-        return [real_average_note_duration for _ in range(n_times)]
+        return np.full(n_times, real_average_note_duration, dtype=float)
 
 
 class GaussianStochasicCloudToSequentialEventConverter(
     PeriodicStochasticCloudToSequentialEventConverter
 ):
-    def _make_rhythm(
-        self, cloud_to_convert: Cloud
-    ) -> typing.Sequence[parameters.abc.DurationType]:
-        duration = cloud_to_convert.duration
-        expected_average_note_duration = cloud_to_convert.average_note_duration
-        n_times = int(duration / expected_average_note_duration)
-        real_average_note_duration = duration / n_times
-        rhythm = [real_average_note_duration for _ in range(n_times)]
-        factor_per_note = [self._random.normal(1, scale=0.2) for _ in rhythm]
-        rhythm = [
-            note_duration * factor
-            for note_duration, factor in zip(rhythm, factor_per_note)
-        ]
-        rhythm = [
-            0.01 if note_duration <= 0 else note_duration for note_duration in rhythm
-        ]
-        difference_to_expected_duration = duration - sum(rhythm)
+    def _make_rhythm(self, cloud_to_convert: Cloud) -> np.ndarray:
+        rhythm = super()._make_rhythm(cloud_to_convert)
+        n_times = len(rhythm)
+        # one draw for all notes gives the same numbers as one draw per note
+        factor_per_note = self._random.normal(1, scale=0.2, size=n_times)
+        rhythm = rhythm * factor_per_note
+        rhythm[rhythm <= 0] = 0.01
+        # python sum (and not np.sum which sums pairwise) to keep the
+        # same rounding as the sum of a list of floats
+        difference_to_expected_duration = cloud_to_convert.duration - sum(
+            rhythm.tolist()
+        )
         difference_to_expected_duration_per_note = (
             difference_to_expected_duration / n_times
         )
-        rhythm = [
-            note_duration + difference_to_expected_duration_per_note
-            for note_duration in rhythm
-        ]
-        return rhythm
+        return rhythm + difference_to_expected_duration_per_note
 
 
 class ArpeggiBasedGaussianStochasicCloudToSequentialEventConverter(
@@ -282,9 +257,7 @@ class BrownianStochasticCloudToSequentialEventConverter(
     ) -> float:
         return 0.5
 
-    def _make_rhythm(
-        self, cloud_to_convert: Cloud
-    ) -> typing.Sequence[parameters.abc.DurationType]:
+    def _make_rhythm(self, cloud_to_convert: Cloud) -> typing.Sequence[float]:
         return ot3_utilities.tools.make_brownian_rhythm(
             cloud_to_convert.duration,
             cloud_to_convert.average_note_duration,
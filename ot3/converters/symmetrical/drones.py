@@ -1,10 +1,14 @@
+import bisect
+import copy
 import itertools
+import random
 import typing
 
 import expenvelope
 
 from mutwo import converters
 from mutwo import events
+from mutwo import generators
 from mutwo import parameters
 from mutwo import utilities
 
@@ -12,6 +16,122 @@ from ot3 import constants as ot3_constants
 from ot3 import utilities as ot3_utilities
 
 
+class _WeightIntegralsOfCurves(object):
+    """Prefix sums of the weight curves of all curves of a family.
+
+    The integral of each weight curve from its start until the start of each
+    of its segments is calculated once, so that the average weight of a curve
+    within any time range only needs a binary search and the integral of two
+    partial segments (instead of cutting out a copy of the family).
+    """
+
+    def __init__(self, family_of_pitch_curves: events.families.FamilyOfPitchCurves):
+        self.pitches, self.durations = [], []
+        self._weight_curves, self._segment_start_times, self._integrals = [], [], []
+        for pitch_curve in family_of_pitch_curves:
+            weight_curve = pitch_curve.weight_curve
+            segment_start_times, integrals = [], []
+            integral = 0
+            for segment in weight_curve.segments:
+                segment_start_times.append(segment.start_time)
+                integrals.append(integral)
+                integral += segment.integrate_segment(
+                    segment.start_time, segment.end_time
+                )
+            self.pitches.append(pitch_curve.pitch)
+            self.durations.append(pitch_curve.duration)
+            self._weight_curves.append(weight_curve)
+            self._segment_start_times.append(segment_start_times)
+            self._integrals.append(integrals + [integral])
+
+    def __len__(self) -> int:
+        return len(self.pitches)
+
+    def _integrate_until(self, nth_curve: int, time: float) -> float:
+        weight_curve = self._weight_curves[nth_curve]
+        start_time, end_time = weight_curve.start_time(), weight_curve.end_time()
+        integrals = self._integrals[nth_curve]
+        # the levels before the start and after the end of the weight curve
+        # are constant (same as in 'expenvelope.Envelope.integrate_interval')
+        if time <= start_time:
+            return (time - start_time) * weight_curve.start_level()
+        elif time >= end_time:
+            return integrals[-1] + ((time - end_time) * weight_curve.end_level())
+        nth_segment = (
+            bisect.bisect_right(self._segment_start_times[nth_curve], time) - 1
+        )
+        segment = weight_curve.segments[nth_segment]
+        return integrals[nth_segment] + segment.integrate_segment(
+            segment.start_time, time
+        )
+
+    def get_average_weight(self, nth_curve: int, start: float, end: float) -> float:
+        # the curve is cut at its end (as 'cut_out' does)
+        end = min((end, self.durations[nth_curve]))
+        return (
+            self._integrate_until(nth_curve, end)
+            - self._integrate_until(nth_curve, start)
+        ) / (end - start)
+
+
+class _ActiveCurvesSweep(object):
+    """Active curves of a family for events which are sorted by their start.
+
+    Curves which end before the start of an event are removed once and are
+    never visited again by later events.
+    """
+
+    def __init__(self, weight_integrals_of_curves: _WeightIntegralsOfCurves):
+        self._weight_integrals_of_curves = weight_integrals_of_curves
+        durations = weight_integrals_of_curves.durations
+        self._curve_indices_sorted_by_duration = sorted(
+            range(len(durations)), key=lambda nth_curve: durations[nth_curve]
+        )
+        self._n_removed_curves = 0
+        # keep the original order of the curves, because the order
+        # influences the random choice of the pitch
+        self._active_curve_indices = list(range(len(durations)))
+        self._time = float("-inf")
+
+    def _advance_to(self, time: float):
+        assert time >= self._time, "Events have to be sorted by their start time."
+        self._time = time
+        durations = self._weight_integrals_of_curves.durations
+        n_curves = len(durations)
+        removed_curve_indices = set([])
+        while self._n_removed_curves < n_curves:
+            nth_curve = self._curve_indices_sorted_by_duration[self._n_removed_curves]
+            if durations[nth_curve] > time:
+                break
+            removed_curve_indices.add(nth_curve)
+            self._n_removed_curves += 1
+        if removed_curve_indices:
+            self._active_curve_indices = [
+                nth_curve
+                for nth_curve in self._active_curve_indices
+                if nth_curve not in removed_curve_indices
+            ]
+
+    def get_pitch_and_weight_pairs(
+        self, start: float, end: float
+    ) -> typing.Tuple[typing.Tuple[parameters.pitches.JustIntonationPitch, float], ...]:
+        """Return pitch and average weight of each curve which is active."""
+
+        self._advance_to(start)
+        weight_integrals_of_curves = self._weight_integrals_of_curves
+        pitch_and_weight_pairs = []
+        for nth_curve in self._active_curve_indices:
+            average_weight = weight_integrals_of_curves.get_average_weight(
+                nth_curve, start, end
+            )
+            # curves without any weight within the range are inactive
+            if average_weight > 0:
+                pitch_and_weight_pairs.append(
+                    (weight_integrals_of_curves.pitches[nth_curve], average_weight)
+                )
+        return tuple(pitch_and_weight_pairs)
+
+
 class FamiliesPitchToDronesConverter(converters.abc.Converter):
     loudspeaker_to_random_seed_for_brownian_rhythm = {
         ot3_constants.loudspeakers.ID_RADIO_VIOLIN: 10,
@@ -21,20 +141,78 @@ class FamiliesPitchToDronesConverter(converters.abc.Converter):
         ot3_constants.loudspeakers.ID_RADIO_BOAT2: 100000,
     }
 
-    start_with_nth_voice = itertools.cycle((0, 1))
-    loudspeaker_weights_cycle = itertools.cycle(tuple(itertools.permutations(range(5))))
+    loudspeaker_to_random_seed = {
+        ot3_constants.loudspeakers.ID_RADIO_VIOLIN: 412412,
+        ot3_constants.loudspeakers.ID_RADIO_SAXOPHONE: 412413,
+        ot3_constants.loudspeakers.ID_RADIO_BOAT0: 412414,
+        ot3_constants.loudspeakers.ID_RADIO_BOAT1: 412415,
+        ot3_constants.loudspeakers.ID_RADIO_BOAT2: 412416,
+    }
+
+    def __init__(
+        self,
+        loudspeaker_ids: typing.Sequence[
+            str
+        ] = ot3_constants.loudspeakers.LOUDSPEAKERS,
+    ):
+        """
+        :param loudspeaker_ids: Which loudspeakers shall be converted. Each
+            loudspeaker owns its own state, so the drones of one loudspeaker
+            are the same, no matter which other loudspeakers are converted
+            (and therefore loudspeakers can be converted in parallel).
+        """
 
-    def __init__(self):
-        import random as drone_random
+        self._loudspeaker_ids = tuple(loudspeaker_ids)
+        self._loudspeaker_to_random = {
+            loudspeaker_id: random.Random(
+                self.loudspeaker_to_random_seed[loudspeaker_id]
+            )
+            for loudspeaker_id in self._loudspeaker_ids
+        }
+        # copy, so that each converter starts with the same state
+        self._loudspeaker_to_registers_to_choose_from_dynamic_choice = {
+            loudspeaker_id: copy.deepcopy(
+                ot3_constants.drone.LOUDSPEAKER_TO_REGISTERS_TO_CHOOSE_FROM_DYNAMIC_CHOICES[
+                    loudspeaker_id
+                ]
+            )
+            for loudspeaker_id in self._loudspeaker_ids
+        }
+        # loudspeakers alternately start with the first and the second voice
+        # (in the order of all loudspeakers, from one family to the next)
+        n_loudspeakers = len(ot3_constants.loudspeakers.LOUDSPEAKERS)
+        self._loudspeaker_to_start_with_nth_voice_cycle = {
+            loudspeaker_id: itertools.islice(
+                itertools.cycle((0, 1)),
+                ot3_constants.loudspeakers.LOUDSPEAKERS.index(loudspeaker_id),
+                None,
+                n_loudspeakers,
+            )
+            for loudspeaker_id in self._loudspeaker_ids
+        }
+        # state which is shared by all loudspeakers; it only depends on
+        # the families, so each converter calculates the same values
+        self._random = random.Random(412412)
+        self._loudspeaker_weights_cycle = itertools.cycle(
+            tuple(itertools.permutations(range(n_loudspeakers)))
+        )
 
-        drone_random.seed(412412)
-        self._random = drone_random
+    @staticmethod
+    def _draw_from_tendency(
+        tendency: generators.koenig.Tendency,
+        absolute_position: float,
+        random_generator: random.Random,
+    ) -> float:
+        # same as 'Tendency.value_at', but with the given random generator
+        # instead of the global one
+        return random_generator.uniform(*tendency.range_at(absolute_position))
 
     def _make_blueprints_for_both_voices(
         self,
         average_duration_for_one_unit: float,
         family_of_pitch_curves: events.families.FamilyOfPitchCurves,
         random_seed_for_brownian_rhythm: int,
+        start_with_nth_voice: int,
     ) -> events.basic.SequentialEvent[events.basic.SimultaneousEvent]:
         rhythmical_grid = ot3_utilities.tools.make_brownian_rhythm(
             family_of_pitch_curves.duration,
@@ -66,7 +244,6 @@ class FamiliesPitchToDronesConverter(converters.abc.Converter):
                 blueprint[nth_voice].append(event)
                 position += n_beats
 
-        start_with_nth_voice = next(self.start_with_nth_voice)
         if start_with_nth_voice == 1:
             blueprint.reverse()
 
@@ -76,19 +253,14 @@ class FamiliesPitchToDronesConverter(converters.abc.Converter):
         self,
         absolute_time: parameters.abc.DurationType,
         event: events.music.NoteLike,
-        family_of_pitch_curves: events.families.FamilyOfPitchCurves,
+        active_curves_sweep: _ActiveCurvesSweep,
+        random_generator: random.Random,
     ) -> typing.Tuple[parameters.pitches.JustIntonationPitch, float]:
-        filtered_family = family_of_pitch_curves.filter(
-            lambda event: event.duration > absolute_time, mutate=False
-        )
-        filtered_family.cut_out(absolute_time, absolute_time + event.duration)
-        filtered_family.filter_inactive_curves()
-        pitch_and_weight_pairs = tuple(
-            (pitch_curve.pitch, pitch_curve.weight_curve.average_level())
-            for pitch_curve in filtered_family
+        pitch_and_weight_pairs = active_curves_sweep.get_pitch_and_weight_pairs(
+            absolute_time, absolute_time + event.duration
         )
         pitches, weights = zip(*pitch_and_weight_pairs)
-        choosen_pitch = self._random.choices(pitches, weights, k=1)[0]
+        choosen_pitch = random_generator.choices(pitches, weights, k=1)[0]
         choosen_pitch_weight = weights[pitches.index(choosen_pitch)]
         return choosen_pitch, choosen_pitch_weight
 
@@ -96,8 +268,9 @@ class FamiliesPitchToDronesConverter(converters.abc.Converter):
         self,
         pitch_to_register: parameters.pitches.JustIntonationPitch,
         registers_to_choose_from: typing.Tuple[int, ...],
+        random_generator: random.Random,
     ):
-        choosen_register = self._random.choice(registers_to_choose_from)
+        choosen_register = random_generator.choice(registers_to_choose_from)
         return pitch_to_register.register(choosen_register, mutate=False)
 
     def _find_volume_for_event(
@@ -133,12 +306,15 @@ class FamiliesPitchToDronesConverter(converters.abc.Converter):
         weight_curve: expenvelope.Envelope,
         attack_release_envelope: expenvelope.Envelope,
         family_of_pitch_curves: events.families.FamilyOfPitchCurves,
+        weight_integrals_of_curves: _WeightIntegralsOfCurves,
         populate_weight: float,
         global_absolute_position: float,
     ):
+        random_generator = self._loudspeaker_to_random[loudspeaker_id]
+        active_curves_sweep = _ActiveCurvesSweep(weight_integrals_of_curves)
         for absolute_time, event in zip(voice.absolute_times, voice):
             if isinstance(event, events.music.NoteLike):
-                registers_to_choose_from = ot3_constants.drone.LOUDSPEAKER_TO_REGISTERS_TO_CHOOSE_FROM_DYNAMIC_CHOICES[
+                registers_to_choose_from = self._loudspeaker_to_registers_to_choose_from_dynamic_choice[
                     loudspeaker_id
                 ].gamble_at(
                     global_absolute_position
@@ -148,12 +324,12 @@ class FamiliesPitchToDronesConverter(converters.abc.Converter):
                     absolute_position
                 )
                 resulting_weight = populate_weight * attack_release_weight
-                if self._random.random() < resulting_weight:
+                if random_generator.random() < resulting_weight:
                     choosen_pitch, pitch_weight = self._find_pitch_for_event(
-                        absolute_time, event, family_of_pitch_curves,
+                        absolute_time, event, active_curves_sweep, random_generator,
                     )
                     event.pitch_or_pitches = self._register_pitch(
-                        choosen_pitch, registers_to_choose_from
+                        choosen_pitch, registers_to_choose_from, random_generator
                     )
                     event.volume = self._find_volume_for_event(
                         absolute_time,
@@ -170,12 +346,14 @@ class FamiliesPitchToDronesConverter(converters.abc.Converter):
         loudspeaker_id: str,
         average_duration_for_one_unit: float,
         family_of_pitch_curves: events.families.FamilyOfPitchCurves,
+        weight_integrals_of_curves: _WeightIntegralsOfCurves,
         simultaneous_event: events.basic.SimultaneousEvent[
             events.basic.SequentialEvent
         ],
         weight_curve: expenvelope.Envelope,
         attack_release_envelope: expenvelope.Envelope,
         random_seed_for_brownian_rhythm: int,
+        start_with_nth_voice: int,
         populate_weight: float,
         global_absolute_position: float,
     ):
@@ -183,6 +361,7 @@ class FamiliesPitchToDronesConverter(converters.abc.Converter):
             average_duration_for_one_unit,
             family_of_pitch_curves,
             random_seed_for_brownian_rhythm,
+            start_with_nth_voice,
         )
 
         for nth_voice, voice in enumerate(blueprint):
@@ -192,6 +371,7 @@ class FamiliesPitchToDronesConverter(converters.abc.Converter):
                 weight_curve,
                 attack_release_envelope,
                 family_of_pitch_curves,
+                weight_integrals_of_curves,
                 populate_weight,
                 global_absolute_position,
             )
@@ -206,7 +386,7 @@ class FamiliesPitchToDronesConverter(converters.abc.Converter):
             family_of_pitch_curves.duration, average_duration_for_one_unit * 3, 13
         )
         weights_per_point = tuple(
-            next(self.loudspeaker_weights_cycle) for _ in rhythmical_grid
+            next(self._loudspeaker_weights_cycle) for _ in rhythmical_grid
         )
         weights_per_loudspeaker = zip(*weights_per_point)
         weight_curve_per_loudspeaker = {}
@@ -229,18 +409,16 @@ class FamiliesPitchToDronesConverter(converters.abc.Converter):
         self,
         family_of_pitch_curves: events.families.FamilyOfPitchCurves,
         absolute_position: float,
+        random_generator: random.Random,
     ) -> expenvelope.Envelope:
-        attack_duration = ot3_constants.drone.ATTACK_DURATION_TENDENCY.value_at(
-            absolute_position
-        )
-        release_duration = ot3_constants.drone.RELEASE_DURATION_TENDENCY.value_at(
-            absolute_position
-        )
-        attack_weight = ot3_constants.drone.ATTACK_WEIGHT_TENDENCY.value_at(
-            absolute_position
-        )
-        release_weight = ot3_constants.drone.RELEASE_WEIGHT_TENDENCY.value_at(
-            absolute_position
+        attack_duration, release_duration, attack_weight, release_weight = (
+            self._draw_from_tendency(tendency, absolute_position, random_generator)
+            for tendency in (
+                ot3_constants.drone.ATTACK_DURATION_TENDENCY,
+                ot3_constants.drone.RELEASE_DURATION_TENDENCY,
+                ot3_constants.drone.ATTACK_WEIGHT_TENDENCY,
+                ot3_constants.drone.RELEASE_WEIGHT_TENDENCY,
+            )
         )
         absolute_attack_duration = attack_duration / family_of_pitch_curves.duration
         absolute_release_duration = release_duration / family_of_pitch_curves.duration
@@ -269,8 +447,14 @@ class FamiliesPitchToDronesConverter(converters.abc.Converter):
         filtered_family_of_pitch_curves = family_of_pitch_curves.filter_curves_with_tag(
             "root", mutate=False
         )
-        average_duration_for_one_unit = ot3_constants.drone.AVERAGE_DURATION_FOR_ONE_UNIT_TENDENCY.value_at(
-            absolute_position
+        # all loudspeakers and voices share the integrals of the root curves
+        weight_integrals_of_curves = _WeightIntegralsOfCurves(
+            filtered_family_of_pitch_curves
+        )
+        average_duration_for_one_unit = self._draw_from_tendency(
+            ot3_constants.drone.AVERAGE_DURATION_FOR_ONE_UNIT_TENDENCY,
+            absolute_position,
+            self._random,
         )
         weight_curve_per_loudspeaker = self._make_weight_curve_for_each_loudspeaker(
             family_of_pitch_curves, average_duration_for_one_unit
@@ -279,28 +463,38 @@ class FamiliesPitchToDronesConverter(converters.abc.Converter):
             loudspeaker_id,
             simultaneous_event,
         ) in loudspeaker_to_simultaneous_event.items():
-            average_duration_for_one_unit_for_loudspeaker = ot3_constants.drone.AVERAGE_DURATION_FOR_ONE_UNIT_TENDENCY.value_at(
-                absolute_position
+            random_generator = self._loudspeaker_to_random[loudspeaker_id]
+            average_duration_for_one_unit_for_loudspeaker = self._draw_from_tendency(
+                ot3_constants.drone.AVERAGE_DURATION_FOR_ONE_UNIT_TENDENCY,
+                absolute_position,
+                random_generator,
             )
             attack_release_envelope = self._make_attack_release_envelope(
-                family_of_pitch_curves, absolute_position
+                family_of_pitch_curves, absolute_position, random_generator
             )
             weight_curve = weight_curve_per_loudspeaker[loudspeaker_id]
             random_seed_for_brownian_rhythm = self.loudspeaker_to_random_seed_for_brownian_rhythm[
                 loudspeaker_id
             ]
+            start_with_nth_voice = next(
+                self._loudspeaker_to_start_with_nth_voice_cycle[loudspeaker_id]
+            )
 
-            populate_weight = ot3_constants.drone.ABSOLUTE_WEIGHT_TENDENCY.value_at(
-                absolute_position
+            populate_weight = self._draw_from_tendency(
+                ot3_constants.drone.ABSOLUTE_WEIGHT_TENDENCY,
+                absolute_position,
+                random_generator,
             )
             self._convert_family(
                 loudspeaker_id,
                 average_duration_for_one_unit_for_loudspeaker,
                 filtered_family_of_pitch_curves,
+                weight_integrals_of_curves,
                 simultaneous_event,
                 weight_curve,
                 attack_release_envelope,
                 random_seed_for_brownian_rhythm,
+                start_with_nth_voice,
                 populate_weight,
                 absolute_position,
             )
@@ -338,7 +532,7 @@ class FamiliesPitchToDronesConverter(converters.abc.Converter):
             loudspeaker_id: events.basic.SimultaneousEvent(
                 [events.basic.SequentialEvent([]) for _ in range(2)]
             )
-            for loudspeaker_id in ot3_constants.loudspeakers.LOUDSPEAKERS
+            for loudspeaker_id in self._loudspeaker_ids
         }
 
         duration_of_families_pitch = families_pitch.duration
@@ -1,12 +1,15 @@
 import abc
+import collections
 import copy
 import functools
+import heapq
 import itertools
 import operator
 import typing
 
 import abjad
 import expenvelope
+import numpy as np
 
 from mutwo import converters
 from mutwo import events
@@ -18,6 +21,131 @@ from ot3 import constants as ot3_constants
 from ot3 import parameters as ot3_parameters
 
 
+class CachedAssignCurveAndWeightPairsOnEventsConverter(
+    converters.symmetrical.families.AssignCurveAndWeightPairsOnEventsConverter
+):
+    """Assign curve and weight pairs, but remember them per time window.
+
+    Most blueprints are quantised to the same time windows, so the
+    curve and weight pairs of an event which has the same position
+    as an event of an earlier converted blueprint are reused instead of
+    evaluating the weight curves of the complete family again. The cache
+    is shared by all instances (its keys contain the id of the family) and
+    forgets the least recently used windows after 'cache_size' entries.
+    """
+
+    cache_size = 4096
+    _key_to_family_and_curve_and_weight_pairs_per_event: typing.Dict[
+        typing.Hashable,
+        typing.Tuple[
+            events.families.FamilyOfPitchCurves,
+            typing.Tuple[
+                typing.Optional[
+                    typing.Tuple[typing.Tuple[events.families.PitchCurve, float], ...]
+                ],
+                ...,
+            ],
+        ],
+    ] = collections.OrderedDict()
+
+    def __init__(self, family_of_pitch_curves: events.families.FamilyOfPitchCurves):
+        super().__init__(family_of_pitch_curves)
+        self._cached_family_of_pitch_curves = family_of_pitch_curves
+
+    @staticmethod
+    def _get_simple_events(
+        event: events.abc.Event,
+    ) -> typing.Iterator[events.basic.SimpleEvent]:
+        if isinstance(event, events.basic.SimpleEvent):
+            yield event
+        else:
+            for sub_event in event:
+                yield from CachedAssignCurveAndWeightPairsOnEventsConverter._get_simple_events(
+                    sub_event
+                )
+
+    @staticmethod
+    def _get_subdivision(event: events.abc.Event) -> typing.Hashable:
+        if isinstance(event, events.basic.SimpleEvent):
+            return float(event.duration)
+        return (
+            type(event).__name__,
+            tuple(
+                CachedAssignCurveAndWeightPairsOnEventsConverter._get_subdivision(
+                    sub_event
+                )
+                for sub_event in event
+            ),
+        )
+
+    def _get_key(self, event_to_convert: events.abc.Event) -> typing.Hashable:
+        if isinstance(event_to_convert, events.time_brackets.TimeBracket):
+            start_and_end = (
+                event_to_convert.start_or_start_range,
+                event_to_convert.end_or_end_range,
+            )
+        else:
+            start_and_end = None
+        return (
+            id(self._cached_family_of_pitch_curves),
+            start_and_end,
+            self._get_subdivision(event_to_convert),
+        )
+
+    def _assign_curve_and_weight_pairs_per_event(
+        self,
+        event_to_convert: events.abc.Event,
+        curve_and_weight_pairs_per_event: typing.Tuple[
+            typing.Optional[
+                typing.Tuple[typing.Tuple[events.families.PitchCurve, float], ...]
+            ],
+            ...,
+        ],
+    ):
+        for simple_event, curve_and_weight_pairs in zip(
+            self._get_simple_events(event_to_convert), curve_and_weight_pairs_per_event,
+        ):
+            if curve_and_weight_pairs is not None:
+                simple_event.curve_and_weight_pairs = curve_and_weight_pairs
+
+    def convert(self, event_to_convert: events.abc.Event) -> events.abc.Event:
+        """Assign the curve and weight pairs in place and return the input event.
+
+        Blueprints are created for each conversion, so the pairs can be assigned
+        in place (time brackets can't be deep copied, because they hold a
+        reference to the random module). The tuples of curve and weight pairs
+        are shared by all events of the same time window and mustn't be mutated.
+        """
+
+        cache = self._key_to_family_and_curve_and_weight_pairs_per_event
+        key = self._get_key(event_to_convert)
+        try:
+            family_of_pitch_curves, curve_and_weight_pairs_per_event = cache[key]
+        except KeyError:
+            family_of_pitch_curves = None
+
+        # the id of a family could be reused after the family has been deleted
+        if family_of_pitch_curves is self._cached_family_of_pitch_curves:
+            cache.move_to_end(key)
+        else:
+            converted_event = super().convert(event_to_convert)
+            curve_and_weight_pairs_per_event = tuple(
+                getattr(simple_event, "curve_and_weight_pairs", None)
+                for simple_event in self._get_simple_events(converted_event)
+            )
+            cache[key] = (
+                self._cached_family_of_pitch_curves,
+                curve_and_weight_pairs_per_event,
+            )
+            if len(cache) > self.cache_size:
+                cache.popitem(last=False)
+
+        self._assign_curve_and_weight_pairs_per_event(
+            event_to_convert, curve_and_weight_pairs_per_event
+        )
+        return event_to_convert
+
+
 class PickPitchesFromCurveAndWeightPairsConverter(
     converters.symmetrical.families.PickElementFromCurveAndWeightPairsConverter
 ):
@@ -82,13 +210,11 @@ class PickPitchesFromCurveAndWeightPairsConverter(
         ],
     ) -> typing.Tuple[typing.Tuple[parameters.pitches.JustIntonationPitch, float], ...]:
         potential_pitches, _ = zip(*potential_pitch_and_weight_pairs)
-        filtered_potential_pitches = self.instrument_ambitus.filter_members(
-            potential_pitches
-        )
+        is_member_mask = self.instrument_ambitus.filter_members_bulk(potential_pitches)
         return tuple(
-            (pitch, weight)
-            for pitch, weight in potential_pitch_and_weight_pairs
-            if pitch in filtered_potential_pitches
+            itertools.compress(
+                potential_pitch_and_weight_pairs, is_member_mask.tolist()
+            )
         )
 
 
@@ -100,9 +226,54 @@ class PickChordFromCurveAndWeightPairsConverter(
         instrument_ambitus: ot3_parameters.ambitus.Ambitus,
         n_pitches_to_pick: int,
         seed: int = 10,
+        n_best_chords: typing.Optional[int] = None,
     ):
+        """
+        :param n_best_chords: If set, only the chords with the highest weights
+            are chosen from (and only those are kept while searching).
+        """
+
         super().__init__(instrument_ambitus, seed)
         self.n_pitches_to_pick = n_pitches_to_pick
+        self.n_best_chords = n_best_chords
+
+    def _find_chords(
+        self, cents: np.ndarray, weights: typing.Tuple[float, ...]
+    ) -> typing.Iterator[typing.Tuple[typing.Tuple[int, ...], float]]:
+        """Yield indices and weight of all chords without seconds.
+
+        The chords are yielded in the same order as 'itertools.combinations'
+        would return them. Only pitches which form no second with any pitch
+        of the chord are tried, so chords with seconds are never built.
+        """
+
+        # avoid seconds in chords
+        is_compatible = np.abs(cents[:, np.newaxis] - cents[np.newaxis, :]) > 200
+        n_pitches = len(weights)
+
+        def backtrack(
+            chord: typing.Tuple[int, ...],
+            weight: float,
+            candidates: np.ndarray,
+            first_candidate: int,
+        ):
+            if len(chord) == self.n_pitches_to_pick:
+                yield chord, weight
+                return
+            n_missing_pitches = self.n_pitches_to_pick - len(chord)
+            for index in np.flatnonzero(candidates[first_candidate:]).tolist():
+                index += first_candidate
+                if n_pitches - index < n_missing_pitches:
+                    break
+                yield from backtrack(
+                    chord + (index,),
+                    weights[index] if weight is None else weight * weights[index],
+                    candidates & is_compatible[index],
+                    index + 1,
+                )
+
+        if self.n_pitches_to_pick > 0:
+            yield from backtrack(tuple([]), None, np.ones(n_pitches, dtype=bool), 0)
 
     def _get_potential_chord_and_weight_pairs(
         self,
@@ -113,19 +284,29 @@ class PickChordFromCurveAndWeightPairsConverter(
         typing.Tuple[typing.Tuple[parameters.pitches.JustIntonationPitch, ...], float],
         ...,
     ]:
-        potential_chord_and_weight_pairs = []
-        for combination in itertools.combinations(
-            potential_pitch_and_weight_pairs, self.n_pitches_to_pick
-        ):
-            chord, weights = zip(*combination)
-            resulting_intervals = tuple(
-                pitch0 - pitch1 for pitch0, pitch1 in itertools.combinations(chord, 2)
+        if not potential_pitch_and_weight_pairs:
+            return tuple([])
+
+        pitches, weights = zip(*potential_pitch_and_weight_pairs)
+        cents = np.array([pitch.cents for pitch in pitches], dtype=float)
+        chord_indices_and_weight_pairs = self._find_chords(cents, weights)
+        if self.n_best_chords is not None:
+            # keep the heaviest chords (in the order in which they were found)
+            chord_indices_and_weight_pairs = sorted(
+                heapq.nlargest(
+                    self.n_best_chords,
+                    enumerate(chord_indices_and_weight_pairs),
+                    key=lambda nth_chord_and_pair: nth_chord_and_pair[1][1],
+                )
             )
-            # avoid seconds in chords
-            if all(abs(interval.cents) > 200 for interval in resulting_intervals):
-                weight = functools.reduce(operator.mul, weights)
-                potential_chord_and_weight_pairs.append((chord, weight))
-        return tuple(potential_chord_and_weight_pairs)
+            chord_indices_and_weight_pairs = map(
+                operator.itemgetter(1), chord_indices_and_weight_pairs
+            )
+
+        return tuple(
+            (tuple(pitches[index] for index in chord_indices), weight)
+            for chord_indices, weight in chord_indices_and_weight_pairs
+        )
 
     def _convert_simple_event(
         self,
@@ -173,6 +354,20 @@ class PickSaxMultiphonicsFromCurveAndWeightPairsConverter(
             tuple(map(parameters.pitches.JustIntonationPitch, pitches))
             for pitches in ot3_constants.instruments.SAXOPHONE_MULTIPHONIC_PITCHES_TO_FINGERING.keys()
         )
+        self._multiphonic_pitches_as_exponents = tuple(
+            tuple(pitch.exponents for pitch in multiphonic_pitches)
+            for multiphonic_pitches in self._multiphonic_pitches_as_pitches
+        )
+
+        # inverted index: which multiphonics contain a pitch
+        self._exponents_to_multiphonic_indices = {}
+        for multiphonic_index, multiphonic_pitches_as_exponents in enumerate(
+            self._multiphonic_pitches_as_exponents
+        ):
+            for exponents in set(multiphonic_pitches_as_exponents):
+                self._exponents_to_multiphonic_indices.setdefault(
+                    exponents, []
+                ).append(multiphonic_index)
 
         all_pitches = sorted(
             functools.reduce(operator.add, self._multiphonic_pitches_as_pitches)
@@ -189,37 +384,47 @@ class PickSaxMultiphonicsFromCurveAndWeightPairsConverter(
         typing.Tuple[typing.Tuple[parameters.pitches.JustIntonationPitch, ...], float],
         ...,
     ]:
-        available_pitches = tuple(
-            map(operator.itemgetter(0), potential_pitch_and_weight_pairs)
+        # if a pitch is available more than once, the first weight counts
+        available_exponents_to_weight = {}
+        for pitch, weight in potential_pitch_and_weight_pairs:
+            available_exponents_to_weight.setdefault(pitch.exponents, weight)
+
+        # only multiphonics which contain at least one available pitch can
+        # contain enough available pitches (keep the order of the fingerings)
+        candidate_multiphonic_indices = sorted(
+            set(
+                multiphonic_index
+                for exponents in available_exponents_to_weight
+                for multiphonic_index in self._exponents_to_multiphonic_indices.get(
+                    exponents, tuple([])
+                )
+            )
         )
-        potential_chord_and_weight_pairs = []
 
-        for (
-            multiphonic_pitches_as_exponents
-        ) in (
-            ot3_constants.instruments.SAXOPHONE_MULTIPHONIC_PITCHES_TO_FINGERING.keys()
-        ):
-            multiphonic_pitches = tuple(
-                map(
-                    parameters.pitches.JustIntonationPitch,
-                    multiphonic_pitches_as_exponents,
-                )
+        potential_chord_and_weight_pairs = []
+        for multiphonic_index in candidate_multiphonic_indices:
+            multiphonic_pitches_as_exponents = self._multiphonic_pitches_as_exponents[
+                multiphonic_index
+            ]
+            available_multiphonic_pitches_as_exponents = tuple(
+                exponents
+                for exponents in multiphonic_pitches_as_exponents
+                if exponents in available_exponents_to_weight
             )
-            n_multiphonic_pitches = len(multiphonic_pitches)
-            n_multiphonic_pitches_in_available_pitches = sum(
-                1 for pitch in multiphonic_pitches if pitch in available_pitches
+            n_multiphonic_pitches = len(multiphonic_pitches_as_exponents)
+            n_multiphonic_pitches_in_available_pitches = len(
+                available_multiphonic_pitches_as_exponents
             )
             if n_multiphonic_pitches_in_available_pitches / n_multiphonic_pitches > 0.5:
-                multiphonic_pitches_which_are_in_pitches = tuple(
-                    filter(
-                        lambda pitch: pitch in available_pitches, multiphonic_pitches
-                    )
-                )
                 weight = sum(
-                    potential_pitch_and_weight_pairs[available_pitches.index(pitch)][1]
-                    for pitch in multiphonic_pitches_which_are_in_pitches
+                    available_exponents_to_weight[exponents]
+                    for exponents in available_multiphonic_pitches_as_exponents
+                )
+                weight /= n_multiphonic_pitches_in_available_pitches
+                # the picked pitches may get changed later
+                multiphonic_pitches = copy.deepcopy(
+                    self._multiphonic_pitches_as_pitches[multiphonic_index]
                 )
-                weight /= len(multiphonic_pitches_which_are_in_pitches)
                 potential_chord_and_weight_pairs.append((multiphonic_pitches, weight))
 
         return tuple(potential_chord_and_weight_pairs)
@@ -231,15 +436,6 @@ class PickViolinFlageolettFromCurveAndWeightPairsConverter(
     def __init__(self, seed: int = 100):
         super().__init__(ot3_constants.instruments.AMBITUS_VIOLIN_HARMONICS, seed)
 
-    @staticmethod
-    def _get_potential_nodes(
-        string: ot3_parameters.spectrals.String,
-        harmonic_pitch: parameters.pitches.JustIntonationPitch,
-    ) -> typing.Tuple[ot3_parameters.spectrals.Node, ...]:
-        nth_harmonic = string.harmonic_pitches.index(harmonic_pitch) + 1
-        harmonic = string.harmonics[nth_harmonic]
-        return harmonic.nodes
-
     def _find_candidates_for_double_flageoletts(
         self,
         potential_pitch_and_weight_pairs: typing.Tuple[
@@ -263,49 +459,23 @@ class PickViolinFlageolettFromCurveAndWeightPairsConverter(
         ],
         ...,
     ]:
+        # all playable strings and nodes of a pair of harmonics are known
+        # in advance, so only the pairs of available pitches are looked up
+        violin_harmonic_pair_to_double_flageoletts = (
+            ot3_constants.instruments.VIOLIN_HARMONIC_PAIR_TO_DOUBLE_FLAGEOLETTS
+        )
         candidates_for_double_flageoletts = []
-        for pitch_and_weight0, pitch_and_weight1 in itertools.combinations(
+        for (pitch0, weight0), (pitch1, weight1) in itertools.combinations(
             potential_pitch_and_weight_pairs, 2
         ):
-            strings0 = ot3_constants.instruments.VIOLIN_HARMONIC_TO_VIOLIN_STRINGS[
-                pitch_and_weight0[0].exponents
-            ]
-            strings1 = ot3_constants.instruments.VIOLIN_HARMONIC_TO_VIOLIN_STRINGS[
-                pitch_and_weight1[0].exponents
-            ]
-
-            for potential_string0, potential_string1 in itertools.product(
-                strings0, strings1
+            for strings, nodes in violin_harmonic_pair_to_double_flageoletts.get(
+                (pitch0.exponents, pitch1.exponents), tuple([])
             ):
-                difference = abs(
-                    potential_string0.nth_string - potential_string1.nth_string
+                candidate = (
+                    ((pitch0, pitch1), strings, nodes),
+                    (weight0 + weight1) * 0.5,
                 )
-                if difference == 1:
-                    nodes0 = self._get_potential_nodes(
-                        potential_string0, pitch_and_weight0[0]
-                    )
-                    nodes1 = self._get_potential_nodes(
-                        potential_string1, pitch_and_weight1[0]
-                    )
-                    for node0, node1 in itertools.product(tuple(nodes0), tuple(nodes1)):
-                        distance_between_distances = abs(
-                            node0.distance_as_just_intonation_pitch
-                            - node1.distance_as_just_intonation_pitch
-                        )
-                        if (
-                            distance_between_distances
-                            < parameters.pitches.JustIntonationPitch("6/5")
-                        ):
-                            candidate = (
-                                (
-                                    (pitch_and_weight0[0], pitch_and_weight1[0]),
-                                    (potential_string0, potential_string1),
-                                    (node0, node1),
-                                ),
-                                (pitch_and_weight0[1] + pitch_and_weight1[1]) * 0.5,
-                            )
-                            candidates_for_double_flageoletts.append(candidate)
-                            break
+                candidates_for_double_flageoletts.append(candidate)
         return tuple(candidates_for_double_flageoletts)
 
     @staticmethod
@@ -314,8 +484,7 @@ class PickViolinFlageolettFromCurveAndWeightPairsConverter(
         string: ot3_parameters.spectrals.String,
         nth_node: int,
     ) -> typing.Tuple[abjad.NamedPitch, abjad.NamedPitch]:
-        nth_harmonic = string.harmonic_pitches.index(harmonic_pitch) + 1
-        harmonic = string.harmonics[nth_harmonic]
+        harmonic = string.get_harmonic(harmonic_pitch)
         return (string.written_pitch, harmonic.nodes[nth_node].written_pitch)
 
     def _convert_simple_event(
@@ -424,8 +593,7 @@ class PickSaxophoneFlageolettFromCurveAndWeightPairsConverter(
         harmonic_pitch: parameters.pitches.JustIntonationPitch,
         string: ot3_parameters.spectrals.String,
     ) -> typing.Tuple[abjad.NamedPitch, abjad.NamedPitch]:
-        nth_harmonic = string.harmonic_pitches.index(harmonic_pitch) + 1
-        harmonic = string.harmonics[nth_harmonic]
+        harmonic = string.get_harmonic(harmonic_pitch)
         written_root_pitch = harmonic._written_root_pitch
         interval_to_root = harmonic.interval_to_root
         interval_to_root_as_western_pitch_interval = round(interval_to_root.cents / 100)
@@ -629,16 +797,38 @@ class PitchLine(abc.ABC):
         instrument: ot3_parameters.spectrals.StringInstrument,
         border: float = 240,
     ):
-        self._pitches = [start_pitch]
+        # Pitch lines which have been created by 'jump' share all pitches
+        # (but the last one) with the pitch line they have been created
+        # from. Therefore the pitches are stored as a linked list of
+        # (pitch, previous_pitches) pairs.
+        self._pitch_and_previous_pitches = (start_pitch, None)
         self._weight = 0
         self._border = border
-        self._candidates = []
+        self._candidates = tuple([])
         self._instrument = instrument
 
     @property
     def weight(self) -> int:
         return self._weight
 
+    @property
+    def pitches(self) -> typing.Tuple[parameters.pitches.JustIntonationPitch, ...]:
+        pitches = []
+        pitch_and_previous_pitches = self._pitch_and_previous_pitches
+        while pitch_and_previous_pitches is not None:
+            pitch, pitch_and_previous_pitches = pitch_and_previous_pitches
+            pitches.append(pitch)
+        return tuple(reversed(pitches))
+
+    @property
+    def movement(self) -> float:
+        """Sum of the absolute intervals (in cents) between succeeding pitches."""
+
+        pitches = self.pitches
+        return sum(
+            abs((pitch1 - pitch0).cents) for pitch0, pitch1 in zip(pitches, pitches[1:])
+        )
+
     @property
     def candidates(self) -> typing.Sequence[parameters.pitches.JustIntonationPitch]:
         return self._candidates
@@ -651,7 +841,7 @@ class PitchLine(abc.ABC):
         good_candidates = []
         bad_candidates = []
         for pitch in pitches_to_choose_from:
-            difference = (pitch - self._pitches[-1]).cents
+            difference = (pitch - self._pitch_and_previous_pitches[0]).cents
             if direction is not None:
                 pitch_direction = difference > 0
                 if direction == pitch_direction:
@@ -681,9 +871,14 @@ class PitchLine(abc.ABC):
     def jump(self) -> typing.Tuple["PitchLine", ...]:
         versions = []
         for candidate in self.candidates:
-            version = copy.deepcopy(self)
-            version._pitches.append(candidate)
-            version._candidates = []
+            # a shallow copy is enough: the previous pitches are shared and
+            # the instrument is never changed
+            version = copy.copy(self)
+            version._pitch_and_previous_pitches = (
+                candidate,
+                self._pitch_and_previous_pitches,
+            )
+            version._candidates = tuple([])
             versions.append(version)
         return tuple(versions)
 
@@ -699,12 +894,9 @@ class PitchLine(abc.ABC):
         ...,
     ]:
         options = []
-        strings_to_investigate = self._instrument.get_strings_with_pitch_in_harmonics(
+        for string, harmonic in self._instrument.get_strings_and_harmonics_with_pitch(
             pitch
-        )
-        for string in strings_to_investigate:
-            nth_harmonic = string.harmonic_pitches.index(pitch) + 1
-            harmonic = string.harmonics[nth_harmonic]
+        ):
             for node in harmonic.nodes:
                 option = (
                     (string, node),
@@ -723,36 +915,62 @@ class PitchLine(abc.ABC):
         ],
         ...,
     ]:
+        """Find string and node for each pitch with the smallest movement.
+
+        The fitness of a path is the sum of the differences between the
+        positions of succeeding nodes. The best path is found with dynamic
+        programming (for n pitches with k playing options each in O(n * k²)).
+        """
+
+        pitches = self.pitches
         playing_options_per_pitch = tuple(
-            self._find_all_playing_options_for_pitch(pitch) for pitch in self._pitches
+            self._find_all_playing_options_for_pitch(pitch) for pitch in pitches
         )
 
-        candidates = []
-        for start_playing_option in playing_options_per_pitch[0]:
-            candidate = [start_playing_option]
-            fitness = 0  # smaller is better
-            for playing_options in playing_options_per_pitch[1:]:
-                position_of_last_option = candidate[-1][-1]
-                playing_option_candidates = []
-                for playing_option in playing_options:
-                    difference_to_previous_position = abs(
-                        playing_option[-1] - position_of_last_option
-                    )
-                    playing_option_candidates.append(
-                        (playing_option, difference_to_previous_position)
+        # smallest fitness of any path which ends with the respective option
+        fitness_per_option = [0] * len(playing_options_per_pitch[0])
+        previous_option_index_per_option_per_pitch = []
+        for previous_playing_options, playing_options in zip(
+            playing_options_per_pitch, playing_options_per_pitch[1:]
+        ):
+            new_fitness_per_option = []
+            previous_option_index_per_option = []
+            for _, position in playing_options:
+                # in case of equal fitness the first option wins
+                fitness, previous_option_index = min(
+                    (
+                        previous_fitness + abs(position - previous_position),
+                        previous_option_index,
                     )
-                best_playing_option_for_current_pitch, difference = min(
-                    playing_option_candidates, key=operator.itemgetter(1)
+                    for previous_option_index, (
+                        previous_fitness,
+                        (_, previous_position),
+                    ) in enumerate(zip(fitness_per_option, previous_playing_options))
                 )
-                fitness += difference
-                candidate.append(best_playing_option_for_current_pitch)
-            candidates.append((candidate, fitness))
+                new_fitness_per_option.append(fitness)
+                previous_option_index_per_option.append(previous_option_index)
+            fitness_per_option = new_fitness_per_option
+            previous_option_index_per_option_per_pitch.append(
+                previous_option_index_per_option
+            )
+
+        option_index = min(
+            range(len(fitness_per_option)), key=fitness_per_option.__getitem__
+        )
+        option_index_per_pitch = [option_index]
+        for previous_option_index_per_option in reversed(
+            previous_option_index_per_option_per_pitch
+        ):
+            option_index = previous_option_index_per_option[option_index]
+            option_index_per_pitch.append(option_index)
+        option_index_per_pitch.reverse()
 
-        best_candidate, _ = min(candidates, key=operator.itemgetter(1))
         resolution = []
-        for pitch, playing_option in zip(self._pitches, best_candidate):
-            item = (pitch, playing_option[0][0], playing_option[0][1])
-            resolution.append(item)
+        for pitch, playing_options, option_index in zip(
+            pitches, playing_options_per_pitch, option_index_per_pitch
+        ):
+            (string, node), _ = playing_options[option_index]
+            resolution.append((pitch, string, node))
         return tuple(resolution)
 
 
@@ -764,10 +982,19 @@ class PickHarmonicsPitchLineFromCurveAndWeightPairsConverter(
         instrument_ambitus: ot3_parameters.ambitus.Ambitus,
         instrument: ot3_parameters.spectrals.StringInstrument,
         seed: int = 10,
+        beam_width: typing.Optional[int] = None,
     ):
+        """
+        :param beam_width: How many pitch lines are kept after each step. If
+            set to None (default), all pitch lines are kept, which may grow
+            exponentially for long phrases. Otherwise the pitch lines with the
+            smallest movement are kept, which may change the result.
+        """
+
         super().__init__(None, seed)
         self._instrument = instrument
         self.instrument_ambitus = instrument_ambitus
+        self.beam_width = beam_width
 
     def _get_pitches_per_event(
         self, sequential_event_to_convert: events.basic.SequentialEvent
@@ -809,6 +1036,14 @@ class PickHarmonicsPitchLineFromCurveAndWeightPairsConverter(
                     if pitch_line.weight == max_weight:
                         new_pitch_lines.extend(pitch_line.jump())
 
+                if (
+                    self.beam_width is not None
+                    and len(new_pitch_lines) > self.beam_width
+                ):
+                    # sorted is stable: equally smooth pitch lines keep their order
+                    new_pitch_lines = sorted(
+                        new_pitch_lines, key=operator.attrgetter("movement")
+                    )[: self.beam_width]
                 pitch_lines = tuple(new_pitch_lines)
                 if not pitch_lines:
                     break
@@ -1019,11 +1254,7 @@ class PickBellArpeggiFromCurveAndWeightPairsConverter(
             direction_operator = max
 
         pitch_variants = functools.reduce(
-            operator.add,
-            (
-                ambitus.find_all_pitch_variants(pitch)
-                for pitch in pitches_to_choose_from
-            ),
+            operator.add, ambitus.find_all_pitch_variants_bulk(pitches_to_choose_from),
         )
 
         if previous_pitch and len(pitch_variants) > 1:
@@ -2,6 +2,7 @@ import typing
 
 import numpy as np
 
+from mutwo import converters
 from mutwo import events
 from mutwo import parameters
 from mutwo import utilities
@@ -24,21 +25,46 @@ class FamiliesPitchToSaturationTonesConverter(StartTimeToTimeBracketsConverter):
             ot3_converters.symmetrical.families.PickSaturationPitchFromCurveAndWeightPairsConverter()
         )
 
-    def _make_saturation_tone(
+    def _get_start_points_and_saturation_tone_spans(
         self,
-        absolute_position: float,
-        start_position: parameters.abc.DurationType,
-        saturation_tone_span: parameters.abc.DurationType,
-        end_point: parameters.abc.DurationType,
-    ) -> events.time_brackets.TimeBracket:
-        time_bracket_ratio = ot3_constants.saturations.TIME_BRACKET_RATIO.value_at(
-            absolute_position
+        absolute_entry_delay: parameters.abc.DurationType,
+        duration_of_families_pitch: parameters.abc.DurationType,
+        duration_of_family: parameters.abc.DurationType,
+    ) -> typing.Tuple[np.ndarray, np.ndarray]:
+        # each start point depends on the span and the density at the previous
+        # start point, therefore only the envelope lookups are done here
+        start_points, saturation_tone_spans = [], []
+        end_of_family = (
+            duration_of_family + absolute_entry_delay + ot3_constants.saturations.TAIL
         )
-        stable_area_duration = utilities.tools.scale(
-            time_bracket_ratio, 0, 1, saturation_tone_span * 0.01, saturation_tone_span
+        n_voices = len(ot3_constants.saturations.VOICE_CYCLE_BLUEPRINT)
+        start_point = absolute_entry_delay
+        absolute_end_point = 0
+        while absolute_end_point < end_of_family:
+            absolute_position = start_point / duration_of_families_pitch
+            saturation_tone_span = ot3_constants.saturations.DURATION.value_at(
+                absolute_position
+            )
+            absolute_end_point = start_point + saturation_tone_span
+            start_points.append(start_point)
+            saturation_tone_spans.append(saturation_tone_span)
+
+            density = ot3_constants.saturations.DENSITY.value_at(absolute_position)
+            delay_until_next_point = utilities.tools.scale(
+                density, 0, 1, saturation_tone_span, saturation_tone_span / n_voices
+            )
+            start_point += delay_until_next_point
+        return (
+            np.array(start_points, dtype=float),
+            np.array(saturation_tone_spans, dtype=float),
         )
-        uncertain_area_duration = saturation_tone_span - stable_area_duration
-        uncertain_area_duration_for_each_position = uncertain_area_duration / 2
+
+    def _make_saturation_tone_blueprint(
+        self,
+        start_position: float,
+        uncertain_area_duration_for_each_position: float,
+        end_point: float,
+    ) -> events.time_brackets.TimeBracket:
         current_voice = next(ot3_constants.saturations.VOICE_CYCLE)
         if current_voice.technique == "sine":
             voice_tag = ot3_constants.instruments.SINE_VOICE_AND_CHANNEL_TO_ID[
@@ -53,7 +79,7 @@ class FamiliesPitchToSaturationTonesConverter(StartTimeToTimeBracketsConverter):
             uncertain_area_duration_for_each_position + start_position,
         )
         end_range = (end_point - uncertain_area_duration_for_each_position, end_point)
-        time_bracket = events.time_brackets.TimeBracket(
+        return events.time_brackets.TimeBracket(
             [
                 events.basic.TaggedSimultaneousEvent(
                     [events.basic.SequentialEvent([events.music.NoteLike([], 1)])],
@@ -64,11 +90,6 @@ class FamiliesPitchToSaturationTonesConverter(StartTimeToTimeBracketsConverter):
             end_or_end_range=end_range,
             seed=int(start_position),
         )
-        time_bracket = self._assign_curve_and_weight_pairs_on_events.convert(
-            time_bracket
-        )
-        time_bracket = self._picker.convert(time_bracket)
-        return time_bracket
 
     def _populate_family(
         self,
@@ -76,37 +97,58 @@ class FamiliesPitchToSaturationTonesConverter(StartTimeToTimeBracketsConverter):
         duration_of_families_pitch: parameters.abc.DurationType,
         family_of_pitch_curves: events.families.FamilyOfPitchCurves,
     ) -> typing.Tuple[events.time_brackets.TimeBracket, ...]:
-        time_brackets = []
-        duration_of_family = family_of_pitch_curves.duration
-        start_point = absolute_entry_delay
-        absolute_end_point = 0
-        while (
-            absolute_end_point
-            < duration_of_family + absolute_entry_delay + ot3_constants.saturations.TAIL
-        ):
-            absolute_position = start_point / duration_of_families_pitch
-            saturation_tone_span = ot3_constants.saturations.DURATION.value_at(
-                absolute_position
-            )
-            absolute_end_point = start_point + saturation_tone_span
-            time_brackets.append(
-                self._make_saturation_tone(
-                    absolute_position,
-                    start_point,
-                    saturation_tone_span,
-                    absolute_end_point,
+        (
+            start_points,
+            saturation_tone_spans,
+        ) = self._get_start_points_and_saturation_tone_spans(
+            absolute_entry_delay,
+            duration_of_families_pitch,
+            family_of_pitch_curves.duration,
+        )
+        end_points = start_points + saturation_tone_spans
+        absolute_positions = start_points / float(duration_of_families_pitch)
+        time_bracket_ratios = np.array(
+            [
+                ot3_constants.saturations.TIME_BRACKET_RATIO.value_at(
+                    absolute_position
                 )
-            )
+                for absolute_position in absolute_positions.tolist()
+            ],
+            dtype=float,
+        )
+        minimal_stable_area_durations = saturation_tone_spans * 0.01
+        stable_area_durations = (
+            time_bracket_ratios
+            * (saturation_tone_spans - minimal_stable_area_durations)
+        ) + minimal_stable_area_durations
+        uncertain_area_durations_for_each_position = (
+            saturation_tone_spans - stable_area_durations
+        ) / 2
 
-            density = ot3_constants.saturations.DENSITY.value_at(absolute_position)
-            min_delay_until_next_point = saturation_tone_span / len(
-                ot3_constants.saturations.VOICE_CYCLE_BLUEPRINT
+        time_brackets = [
+            self._make_saturation_tone_blueprint(*start_uncertain_area_and_end)
+            for start_uncertain_area_and_end in zip(
+                start_points.tolist(),
+                uncertain_area_durations_for_each_position.tolist(),
+                end_points.tolist(),
             )
-            delay_until_next_point = utilities.tools.scale(
-                density, 0, 1, saturation_tone_span, min_delay_until_next_point
+        ]
+
+        # the windows of saturation tones are never repeated, so instead of
+        # the cached assigner of the whole family, an assigner which only
+        # knows the curves which are active while the family is populated
+        # is used
+        assigner = converters.symmetrical.families.AssignCurveAndWeightPairsOnEventsConverter(
+            self._filter_family_by_time_range(
+                (float(start_points[0]), float(end_points.max()))
             )
-            start_point += delay_until_next_point
-        return tuple(time_brackets)
+        )
+        time_brackets = [
+            assigner.convert(time_bracket) for time_bracket in time_brackets
+        ]
+        return tuple(
+            self._picker.convert(time_bracket) for time_bracket in time_brackets
+        )
 
     def convert(
         self,
@@ -1,15 +1,18 @@
 """Module for converting global `FamilyOfPitchCurves` varibale to TimeBracket"""
 
 import abc
+import bisect
+import collections
 import itertools
 import operator
+import random
 import typing
 
 import expenvelope
+import numpy as np
 
 from mutwo import converters
 from mutwo import events
-from mutwo import generators
 from mutwo import parameters
 
 from ot3 import constants as ot3_constants
@@ -41,7 +44,138 @@ def _add_copy_for_flageoletts_playing_suggestion(
     time_bracket[0].append(playing_suggestion)
 
 
+def _merge_time_ranges(
+    time_ranges: typing.Iterable[events.time_brackets.TimeRange],
+) -> typing.List[typing.List[float]]:
+    merged_time_ranges = []
+    for start, end in sorted((float(start), float(end)) for start, end in time_ranges):
+        if merged_time_ranges and start <= merged_time_ranges[-1][1]:
+            merged_time_ranges[-1][1] = max(merged_time_ranges[-1][1], end)
+        else:
+            merged_time_ranges.append([start, end])
+    return merged_time_ranges
+
+
+class _ActiveRangesIndex(object):
+    """Active ranges of all curves of a family flattened to numpy arrays.
+
+    The overlapping percentages of all curves with a time range get
+    calculated in one vectorised pass instead of calling
+    'get_overlapping_percentage_with_active_ranges' for each curve.
+    """
+
+    def __init__(self, family_of_pitch_curves: events.families.FamilyOfPitchCurves):
+        self._n_curves = 0
+        starts, ends, curve_indices, tags = [], [], [], []
+        for curve_index, pitch_curve in enumerate(family_of_pitch_curves):
+            # overlapping ranges of the same curve mustn't be counted twice
+            for start, end in _merge_time_ranges(pitch_curve.active_ranges):
+                starts.append(start)
+                ends.append(end)
+                curve_indices.append(curve_index)
+            tags.append(pitch_curve.tag)
+            self._n_curves += 1
+
+        self._starts = np.array(starts, dtype=float)
+        self._ends = np.array(ends, dtype=float)
+        self._curve_indices = np.array(curve_indices, dtype=int)
+        self._tags = np.array(tags, dtype=object)
+
+    def get_overlapping_percentages(
+        self, time_range: events.time_brackets.TimeRange
+    ) -> np.ndarray:
+        start, end = (float(time) for time in time_range)
+        overlapping_durations = np.clip(
+            np.minimum(self._ends, end) - np.maximum(self._starts, start), 0, None
+        )
+        return np.bincount(
+            self._curve_indices,
+            weights=overlapping_durations,
+            minlength=self._n_curves,
+        ) / (end - start)
+
+    def get_active_mask(
+        self, time_range: events.time_brackets.TimeRange
+    ) -> np.ndarray:
+        """Return which curves are active at any point within the time range."""
+
+        start, end = (float(time) for time in time_range)
+        is_active_range_within_time_range = (self._starts <= end) & (
+            self._ends >= start
+        )
+        return (
+            np.bincount(
+                self._curve_indices,
+                weights=is_active_range_within_time_range,
+                minlength=self._n_curves,
+            )
+            > 0
+        )
+
+    def get_tag_mask(self, tag: str) -> np.ndarray:
+        return self._tags == tag
+
+    def get_inactive_time_ranges(
+        self,
+    ) -> typing.Tuple[events.time_brackets.TimeRange, ...]:
+        """Return all time ranges in which not a single curve is active."""
+
+        inactive_time_ranges = []
+        end_of_active_time_ranges = float("-inf")
+        for start, end in sorted(zip(self._starts.tolist(), self._ends.tolist())):
+            if start > end_of_active_time_ranges:
+                inactive_time_ranges.append((end_of_active_time_ranges, start))
+            end_of_active_time_ranges = max(end_of_active_time_ranges, end)
+        inactive_time_ranges.append((end_of_active_time_ranges, float("inf")))
+        return tuple(inactive_time_ranges)
+
+
+# converters of the same family share one index (the least recently used
+# indices are forgotten after _ACTIVE_RANGES_INDEX_CACHE_SIZE families)
+_ACTIVE_RANGES_INDEX_CACHE_SIZE = 8
+_FAMILY_ID_TO_FAMILY_AND_ACTIVE_RANGES_INDEX: typing.Dict[
+    int, typing.Tuple[events.families.FamilyOfPitchCurves, _ActiveRangesIndex]
+] = collections.OrderedDict()
+
+
+def _get_active_ranges_index(
+    family_of_pitch_curves: events.families.FamilyOfPitchCurves,
+) -> _ActiveRangesIndex:
+    cache = _FAMILY_ID_TO_FAMILY_AND_ACTIVE_RANGES_INDEX
+    key = id(family_of_pitch_curves)
+    try:
+        family, active_ranges_index = cache[key]
+    except KeyError:
+        family = None
+
+    # the id of a family could be reused after the family has been forgotten
+    if family is family_of_pitch_curves:
+        cache.move_to_end(key)
+        return active_ranges_index
+
+    active_ranges_index = _ActiveRangesIndex(family_of_pitch_curves)
+    # keep a reference to the family, so that its id can't be reused
+    cache[key] = (family_of_pitch_curves, active_ranges_index)
+    if len(cache) > _ACTIVE_RANGES_INDEX_CACHE_SIZE:
+        cache.popitem(last=False)
+    return active_ranges_index
+
+
+def _filter_family_by_mask(
+    family_of_pitch_curves: events.families.FamilyOfPitchCurves, mask: np.ndarray,
+) -> events.families.FamilyOfPitchCurves:
+    # filter visits the curves in the same order as the index
+    is_kept_per_curve = iter(mask.tolist())
+    return family_of_pitch_curves.filter(
+        lambda _: next(is_kept_per_curve), mutate=False
+    )
+
+
 class StartTimeToTimeBracketsConverter(converters.abc.Converter):
+    # the last time range ends at most 'duration + _time_ranges_padding'
+    # after the start time (see '_get_time_ranges' of the subclasses)
+    _time_ranges_padding = 10
+
     def __init__(
         self,
         family_of_pitch_curves: events.families.FamilyOfPitchCurves,
@@ -50,10 +184,67 @@ class StartTimeToTimeBracketsConverter(converters.abc.Converter):
         self._family_of_pitch_curves = family_of_pitch_curves
         self._minimal_overlapping_percentage = minimal_overlapping_percentage
         if family_of_pitch_curves:
-            self._assign_curve_and_weight_pairs_on_events = converters.symmetrical.families.AssignCurveAndWeightPairsOnEventsConverter(
+            self._active_ranges_index = _get_active_ranges_index(
+                family_of_pitch_curves
+            )
+            self._assign_curve_and_weight_pairs_on_events = ot3_converters.symmetrical.families.CachedAssignCurveAndWeightPairsOnEventsConverter(
                 self._family_of_pitch_curves
             )
 
+    def _make_duration_cycle(
+        self, durations: typing.Sequence[parameters.abc.DurationType]
+    ) -> typing.Iterator[parameters.abc.DurationType]:
+        self._maximum_duration = max(durations)
+        return itertools.cycle(durations)
+
+    @property
+    def unavailable_time_ranges(
+        self,
+    ) -> typing.Tuple[events.time_brackets.TimeRange, ...]:
+        """Time ranges in which no curve of the family is active.
+
+        Time brackets whose time ranges are within one of these time ranges
+        never contain enough curves.
+        """
+
+        if (
+            not self._family_of_pitch_curves
+            or self._minimal_overlapping_percentage <= 0
+        ):
+            return tuple([])
+        try:
+            return self._unavailable_time_ranges
+        except AttributeError:
+            self._unavailable_time_ranges = (
+                self._active_ranges_index.get_inactive_time_ranges()
+            )
+            self._unavailable_time_range_starts = tuple(
+                start for start, _ in self._unavailable_time_ranges
+            )
+            return self._unavailable_time_ranges
+
+    def is_unavailable_at(self, start_time: parameters.abc.DurationType) -> bool:
+        """Test if 'convert' won't return any time bracket for the start time.
+
+        If it returns True, 'skip' can be called instead of 'convert'.
+        """
+
+        unavailable_time_ranges = self.unavailable_time_ranges
+        if not unavailable_time_ranges or not hasattr(self, "_maximum_duration"):
+            return False
+        start_time = float(start_time)
+        index = (
+            bisect.bisect_right(self._unavailable_time_range_starts, start_time) - 1
+        )
+        return index >= 0 and unavailable_time_ranges[index][1] >= start_time + (
+            self._maximum_duration + self._time_ranges_padding
+        )
+
+    def skip(self, start_time: parameters.abc.DurationType):
+        """Change the state of the converter as 'convert' does if it fails."""
+
+        self._get_time_ranges(start_time)
+
     @staticmethod
     def _quantize_time(
         time: parameters.abc.DurationType,
@@ -76,21 +267,36 @@ class StartTimeToTimeBracketsConverter(converters.abc.Converter):
 
         return True
 
-    def _filter_family_by_minimal_overlapping_percentage(
+    def _get_minimal_overlapping_percentage_mask(
         self,
         time_ranges: typing.Tuple[
             events.time_brackets.TimeRange, events.time_brackets.TimeRange
         ],
-    ) -> float:
+    ) -> np.ndarray:
         time_range = (time_ranges[0][0], time_ranges[1][1])
+        return (
+            self._active_ranges_index.get_overlapping_percentages(time_range)
+            >= self._minimal_overlapping_percentage
+        )
 
-        def condition(pitch_curve: events.families.PitchCurve) -> bool:
-            overlapping_percentage = pitch_curve.get_overlapping_percentage_with_active_ranges(
-                time_range
-            )
-            return overlapping_percentage >= self._minimal_overlapping_percentage
+    def _filter_family_by_minimal_overlapping_percentage(
+        self,
+        time_ranges: typing.Tuple[
+            events.time_brackets.TimeRange, events.time_brackets.TimeRange
+        ],
+    ) -> events.families.FamilyOfPitchCurves:
+        return _filter_family_by_mask(
+            self._family_of_pitch_curves,
+            self._get_minimal_overlapping_percentage_mask(time_ranges),
+        )
 
-        return self._family_of_pitch_curves.filter(condition, mutate=False)
+    def _filter_family_by_time_range(
+        self, time_range: events.time_brackets.TimeRange
+    ) -> events.families.FamilyOfPitchCurves:
+        return _filter_family_by_mask(
+            self._family_of_pitch_curves,
+            self._active_ranges_index.get_active_mask(time_range),
+        )
 
     def _are_curves_available_within_minimal_overlapping_percentage(
         self,
@@ -98,9 +304,7 @@ class StartTimeToTimeBracketsConverter(converters.abc.Converter):
             events.time_brackets.TimeRange, events.time_brackets.TimeRange
         ],
     ) -> bool:
-        return (
-            len(self._filter_family_by_minimal_overlapping_percentage(time_ranges)) > 0
-        )
+        return bool(self._get_minimal_overlapping_percentage_mask(time_ranges).any())
 
     @abc.abstractmethod
     def convert(
@@ -121,27 +325,19 @@ class StartTimeToInstrumentTimeBracketsConverter(StartTimeToTimeBracketsConverte
             minimal_overlapping_percentage=minimal_overlapping_percentage,
         )
 
-        import random as tbc_random
-
-        tbc_random.seed(seed)
-        self._random = tbc_random
+        # use an own generator, so that the results of a converter don't
+        # depend on any other converter (and the stochastic parts of all
+        # instruments can be computed independently)
+        self._random = random.Random(seed)
 
     def _add_drone_to_notation(
         self, time_bracket: events.time_brackets.TimeBracket,
     ):
         time_range = (time_bracket.minimal_start, time_bracket.maximum_end)
-
-        def cut_out_unused_events(pitch_curve: events.families.PitchCurve) -> bool:
-            return (
-                pitch_curve.tag == "root"
-                and pitch_curve.get_overlapping_percentage_with_active_ranges(
-                    time_range
-                )
-                > 0.1
-            )
-
-        filtered_family = self._family_of_pitch_curves.filter(
-            cut_out_unused_events, mutate=False
+        filtered_family = _filter_family_by_mask(
+            self._family_of_pitch_curves,
+            self._active_ranges_index.get_tag_mask("root")
+            & (self._active_ranges_index.get_overlapping_percentages(time_range) > 0.1),
         )
         filtered_family.cut_out(*time_range, mutate=False)
         filtered_family.filter_curves_with_tag("root")
@@ -239,7 +435,7 @@ class StartTimeToCalligraphicLineConverter(StartTimeToInstrumentTimeBracketsConv
             self._instrument_ambitus, 1
         )
         self._dynamic_cycle = itertools.cycle("p".split(" "))
-        self._duration_cycle = itertools.cycle((20, 15, 15))
+        self._duration_cycle = self._make_duration_cycle((20, 15, 15))
         self._squash_in_cycle = itertools.cycle(
             (
                 None,
@@ -375,7 +571,7 @@ class StartTimeToViolinCalligraphicLineConverter(StartTimeToCalligraphicLineConv
         self._picker = (
             ot3_converters.symmetrical.families.PickViolinFlageolettFromCurveAndWeightPairsConverter()
         )
-        self._duration_cycle = itertools.cycle((20, 15, 25))
+        self._duration_cycle = self._make_duration_cycle((20, 15, 25))
 
     def convert(
         self, *args, **kwargs
@@ -402,7 +598,7 @@ class StartTimeToSaxophoneCalligraphicLineConverter(
         # self._picker = (
         #     ot3_converters.symmetrical.families.PickSaxophoneFlageolettFromCurveAndWeightPairsConverter()
         # )
-        self._duration_cycle = itertools.cycle((20, 15, 25))
+        self._duration_cycle = self._make_duration_cycle((20, 15, 25))
 
 
 class StartTimeToSaxophoneHarmonicsCalligraphicLineConverter(
@@ -419,7 +615,7 @@ class StartTimeToSaxophoneHarmonicsCalligraphicLineConverter(
         self._picker = (
             ot3_converters.symmetrical.families.PickSaxophoneFlageolettFromCurveAndWeightPairsConverter()
         )
-        self._duration_cycle = itertools.cycle((20, 15, 25))
+        self._duration_cycle = self._make_duration_cycle((20, 15, 25))
 
 
 class StartTimeToSaxophoneMultiphonicsConverter(StartTimeToCalligraphicLineConverter):
@@ -435,7 +631,7 @@ class StartTimeToSaxophoneMultiphonicsConverter(StartTimeToCalligraphicLineConve
             shall_add_drone_to_notation=False,
         )
         self._picker = picker
-        self._duration_cycle = itertools.cycle((20, 15, 25))
+        self._duration_cycle = self._make_duration_cycle((20, 15, 25))
 
 
 class StartTimeToSaxophoneMelodicPhraseConverter(
@@ -456,9 +652,9 @@ class StartTimeToSaxophoneMelodicPhraseConverter(
             self._instrument_ambitus
         )
         self._dynamic_cycle = itertools.cycle("mp mf".split(" "))
-        self._duration_cycle = itertools.cycle((15, 10))
+        self._duration_cycle = self._make_duration_cycle((15, 10))
         self._n_pitches_cycle = itertools.cycle((3,))
-        self._rhythm_choice = generators.generic.DynamicChoice(
+        self._rhythm_choice = ot3_utilities.tools.DynamicChoice(
             (
                 ot3_utilities.tools.make_gray_code_rhythm_cycle(3),
                 ot3_utilities.tools.make_gray_code_rhythm_cycle(4),
@@ -566,9 +762,9 @@ class StartTimeToHarmonicMelodicPhraseConverter(
             self._instrument_ambitus, self._instrument
         )
         self._dynamic_cycle = itertools.cycle("mf mp".split(" "))
-        self._duration_cycle = itertools.cycle((15, 25, 20))
+        self._duration_cycle = self._make_duration_cycle((15, 25, 20))
         self._n_pitches_cycle = itertools.cycle((3,))
-        self._rhythm_choice = generators.generic.DynamicChoice(
+        self._rhythm_choice = ot3_utilities.tools.DynamicChoice(
             (
                 ot3_utilities.tools.make_gray_code_rhythm_cycle(3),
                 ot3_utilities.tools.make_gray_code_rhythm_cycle(4),
@@ -672,8 +868,8 @@ class StartTimeToViolinMelodicPhraseConverter(
             self._instrument_ambitus
         )
         self._dynamic_cycle = itertools.cycle("mp mf".split(" "))
-        self._duration_cycle = itertools.cycle((15, 10))
-        self._rhythm_choice = generators.generic.DynamicChoice(
+        self._duration_cycle = self._make_duration_cycle((15, 10))
+        self._rhythm_choice = ot3_utilities.tools.DynamicChoice(
             (
                 ot3_utilities.tools.make_gray_code_rhythm_cycle(4),
                 ot3_utilities.tools.make_gray_code_rhythm_cycle(5),
@@ -765,7 +961,7 @@ class StartTimeToInstrumentalNoiseConverter(StartTimeToInstrumentTimeBracketsCon
         super().__init__(None, None)
         self._instrument_id = instrument_id
         self._dynamic_cycle = itertools.cycle("mf".split(" "))
-        self._duration_cycle = itertools.cycle((10, 15, 10))
+        self._duration_cycle = self._make_duration_cycle((10, 15, 10))
         self._presence_cycle = itertools.cycle((2, 0, 1, 0, 1))
         self._density_cycle = itertools.cycle((2, 3, 0, 1, 2, 3, 1, 0))
 
@@ -821,7 +1017,7 @@ class StartTimeToSaxNoiseConverter(StartTimeToInstrumentTimeBracketsConverter):
         super().__init__(None, None)
         self._instrument_id = ot3_constants.instruments.ID_SAXOPHONE
         self._dynamic_cycle = itertools.cycle("f".split(" "))
-        self._duration_cycle = itertools.cycle((15, 20, 25))
+        self._duration_cycle = self._make_duration_cycle((15, 20, 25))
         self._density_cycle = itertools.cycle((0, 1))
 
     def _make_blueprint_bracket(
@@ -874,7 +1070,7 @@ class StartTimeToBowNoiseConverter(StartTimeToInstrumentalNoiseConverter):
     def __init__(self):
         super().__init__(ot3_constants.instruments.ID_VIOLIN)
         self._dynamic_cycle = itertools.cycle("mp".split(" "))
-        self._duration_cycle = itertools.cycle((10, 15, 10))
+        self._duration_cycle = self._make_duration_cycle((10, 15, 10))
 
     def _make_blueprint_bracket(
         self,
@@ -900,7 +1096,7 @@ class StartTimeToTeethOnReedConverter(StartTimeToInstrumentalNoiseConverter):
     def __init__(self):
         super().__init__(ot3_constants.instruments.ID_SAXOPHONE)
         self._dynamic_cycle = itertools.cycle("mp".split(" "))
-        self._duration_cycle = itertools.cycle((15, 20, 20))
+        self._duration_cycle = self._make_duration_cycle((15, 20, 20))
 
     def _make_blueprint_bracket(
         self,
@@ -926,7 +1122,7 @@ class StartTimeToHarmonicGlissandoConverter(StartTimeToInstrumentalNoiseConverte
     def __init__(self):
         super().__init__(ot3_constants.instruments.ID_VIOLIN)
         self._dynamic_cycle = itertools.cycle("pp".split(" "))
-        self._duration_cycle = itertools.cycle((10, 15, 10))
+        self._duration_cycle = self._make_duration_cycle((10, 15, 10))
 
     def _make_blueprint_bracket(
         self,
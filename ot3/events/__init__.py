@@ -1,4 +1,13 @@
-from . import noises_constants
+from ot3.utilities import lazy
 
-from . import basic
-from . import noises
+# order in which the submodules were imported before they were loaded lazily
+# (see ot3.import_all)
+_EAGER_IMPORT_ORDER = (
+    "noises_constants",
+    "basic",
+    "noises",
+    "time_brackets",
+)
+
+# submodules are only imported when they are accessed for the first time
+__getattr__ = lazy.lazy_submodules(__name__, _EAGER_IMPORT_ORDER)
@@ -0,0 +1,203 @@
+import bisect
+import random
+import typing
+
+from mutwo import events
+from mutwo import utilities
+
+T = typing.TypeVar("T", bound=events.time_brackets.TimeBracket)
+
+
+class _IntervalTreeNode(object):
+    __slots__ = ("start", "end", "max_end", "priority", "left", "right")
+
+    def __init__(self, start: float, end: float, priority: float):
+        self.start = start
+        self.end = end
+        self.max_end = end
+        self.priority = priority
+        self.left: typing.Optional[_IntervalTreeNode] = None
+        self.right: typing.Optional[_IntervalTreeNode] = None
+
+    def update_max_end(self):
+        max_end = self.end
+        if self.left is not None and self.left.max_end > max_end:
+            max_end = self.left.max_end
+        if self.right is not None and self.right.max_end > max_end:
+            max_end = self.right.max_end
+        self.max_end = max_end
+
+
+class _IntervalTree(object):
+    """Treap of intervals sorted by their start, augmented by the maximum end.
+
+    Insertion and the test if any interval overlaps with a given interval
+    both take O(log n) (expected) time.
+    """
+
+    def __init__(self, random_generator: random.Random):
+        self._random = random_generator
+        self._root: typing.Optional[_IntervalTreeNode] = None
+
+    @staticmethod
+    def _rotate_right(node: _IntervalTreeNode) -> _IntervalTreeNode:
+        new_root = node.left
+        node.left = new_root.right
+        new_root.right = node
+        node.update_max_end()
+        new_root.update_max_end()
+        return new_root
+
+    @staticmethod
+    def _rotate_left(node: _IntervalTreeNode) -> _IntervalTreeNode:
+        new_root = node.right
+        node.right = new_root.left
+        new_root.left = node
+        node.update_max_end()
+        new_root.update_max_end()
+        return new_root
+
+    def _insert(
+        self, node: typing.Optional[_IntervalTreeNode], new_node: _IntervalTreeNode
+    ) -> _IntervalTreeNode:
+        if node is None:
+            return new_node
+        if new_node.start < node.start:
+            node.left = self._insert(node.left, new_node)
+            if node.left.priority > node.priority:
+                node = self._rotate_right(node)
+        else:
+            node.right = self._insert(node.right, new_node)
+            if node.right.priority > node.priority:
+                node = self._rotate_left(node)
+        node.update_max_end()
+        return node
+
+    def insert(self, start: float, end: float):
+        # intervals without any duration can't overlap with other intervals
+        if start < end:
+            self._root = self._insert(
+                self._root, _IntervalTreeNode(start, end, self._random.random())
+            )
+
+    def is_overlapping(self, start: float, end: float) -> bool:
+        """Test if any interval shares a time range of positive length with start/end"""
+
+        if not start < end:
+            return False
+        node = self._root
+        while node is not None:
+            if node.start < end and node.end > start:
+                return True
+            # if the left subtree contains an interval which ends after start,
+            # but doesn't overlap, this interval starts after end and so do
+            # all intervals in the right subtree
+            if node.left is not None and node.left.max_end > start:
+                node = node.left
+            else:
+                node = node.right
+        return False
+
+
+class IndexedTimeBracketContainer(events.time_brackets.TimeBracketContainer):
+    """TimeBracketContainer with an interval tree and a bracket list per tag.
+
+    Behaves like :class:`mutwo.events.time_brackets.TimeBracketContainer`
+    (same order of brackets, same overlap test), but testing for overlaps
+    while registering a new bracket takes O(log n) time and filtering by a tag
+    is a lookup instead of a scan over all registered brackets.
+    """
+
+    def __init__(self, brackets: typing.Sequence[T]):
+        # treaps need random priorities; use an own generator to never
+        # change the state of the global random generator
+        self._random = random.Random(0)
+        self._brackets: typing.List[T] = []
+        self._mean_starts: typing.List[float] = []
+        self._tag_to_brackets: typing.Dict[str, typing.List[T]] = {}
+        self._tag_to_mean_starts: typing.Dict[str, typing.List[float]] = {}
+        self._tag_to_interval_tree: typing.Dict[str, _IntervalTree] = {}
+        self._tag_to_filtered_brackets: typing.Dict[str, typing.Tuple[T, ...]] = {}
+        for bracket in sorted(brackets, key=lambda bracket: bracket.mean_start):
+            self._add(bracket)
+
+    def __repr__(self) -> str:
+        return "IndexedTimeBracketContainer({})".format(tuple(self._brackets))
+
+    def __iter__(self):
+        return iter(self._brackets)
+
+    def __len__(self) -> int:
+        return len(self._brackets)
+
+    @staticmethod
+    def _get_tags_of_bracket(bracket: T) -> typing.Tuple[str, ...]:
+        return tuple(tagged_event.tag for tagged_event in bracket)
+
+    def _add(self, bracket: T):
+        mean_start = bracket.mean_start
+        # same position as in mutwos BracketContainer.register
+        index = bisect.bisect_left(self._mean_starts, mean_start)
+        self._brackets.insert(index, bracket)
+        self._mean_starts.insert(index, mean_start)
+
+        minimal_start, maximum_end = bracket.minimal_start, bracket.maximum_end
+        # a bracket may contain more than one event with the same tag
+        for tag in dict.fromkeys(self._get_tags_of_bracket(bracket)):
+            if tag not in self._tag_to_brackets:
+                self._tag_to_brackets[tag] = []
+                self._tag_to_mean_starts[tag] = []
+                self._tag_to_interval_tree[tag] = _IntervalTree(self._random)
+            tag_mean_starts = self._tag_to_mean_starts[tag]
+            index = bisect.bisect_left(tag_mean_starts, mean_start)
+            self._tag_to_brackets[tag].insert(index, bracket)
+            tag_mean_starts.insert(index, mean_start)
+            self._tag_to_interval_tree[tag].insert(minimal_start, maximum_end)
+            self._tag_to_filtered_brackets.pop(tag, None)
+
+    def register(
+        self,
+        bracket_to_register: T,
+        test_for_overlapping_brackets: bool = True,
+        tags_to_analyse: typing.Optional[typing.Tuple[str, ...]] = None,
+    ):
+        """Add new bracket to :class:`IndexedTimeBracketContainer`.
+
+        :param bracket_to_register: The bracket which shall be added.
+        :param test_for_overlapping_brackets: If set to ``True`` the bracket
+            won't be added if it overlaps with any other registered bracket
+            which shares a tag with tags_to_analyse.
+        :param tags_to_analyse: Which tags shall be tested for overlaps. By
+            default all tags of the new bracket are tested.
+        """
+
+        if test_for_overlapping_brackets:
+            if not tags_to_analyse:
+                tags_to_analyse = self._get_tags_of_bracket(bracket_to_register)
+            minimal_start, maximum_end = (
+                bracket_to_register.minimal_start,
+                bracket_to_register.maximum_end,
+            )
+            for tag in tags_to_analyse:
+                try:
+                    interval_tree = self._tag_to_interval_tree[tag]
+                except KeyError:
+                    continue
+                if interval_tree.is_overlapping(minimal_start, maximum_end):
+                    raise utilities.exceptions.OverlappingTimeBracketsError()
+
+        self._add(bracket_to_register)
+
+    def filter(self, tag: str) -> typing.Tuple[T, ...]:
+        """Return all brackets which contain events with the requested tag
+
+        :arg tag: The tag which shall be investigated.
+        """
+
+        try:
+            return self._tag_to_filtered_brackets[tag]
+        except KeyError:
+            filtered_brackets = self._tag_to_filtered_brackets[tag] = tuple(
+                self._tag_to_brackets.get(tag, [])
+            )
+            return filtered_brackets
@@ -1,4 +1,14 @@
-from . import ambitus
-from . import notation_indicators
-from . import playing_indicators
-from . import spectrals
+from ot3.utilities import lazy
+
+# order in which the submodules were imported before they were loaded lazily
+# (see ot3.import_all)
+_EAGER_IMPORT_ORDER = (
+    "ambitus",
+    "notation_indicators",
+    "playing_indicators",
+    "spectrals",
+)
+
+# spectrals imports abjad, therefore submodules are only imported when they
+# are accessed for the first time
+__getattr__ = lazy.lazy_submodules(__name__, _EAGER_IMPORT_ORDER)
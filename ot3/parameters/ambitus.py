@@ -1,6 +1,10 @@
 import copy
+import itertools
+import math
 import typing
 
+import numpy as np
+
 from mutwo import parameters
 from mutwo import utilities
 
@@ -22,11 +26,18 @@ class Ambitus(object):
             raise ValueError(msg)
 
         self._borders = (border_down, border_up)
+        self._border_frequencies = (border_down.frequency, border_up.frequency)
 
     # ######################################################## #
     #                       static methods                     #
     # ######################################################## #
 
+    @staticmethod
+    def _get_frequencies(pitches: typing.Sequence[parameters.abc.Pitch]) -> np.ndarray:
+        return np.fromiter(
+            (pitch.frequency for pitch in pitches), dtype=float, count=len(pitches)
+        )
+
     @staticmethod
     def _guess_period(pitch: parameters.abc.Pitch) -> typing.Any:
         if isinstance(pitch, parameters.pitches.JustIntonationPitch):
@@ -75,14 +86,9 @@ class Ambitus(object):
     #                       public methods                     #
     # ######################################################## #
 
-    def find_all_pitch_variants(
-        self, pitch: parameters.abc.Pitch, period: typing.Any = None
+    def _find_all_pitch_variants_by_stepping(
+        self, pitch: parameters.abc.Pitch, period: typing.Any
     ) -> typing.Tuple[parameters.abc.Pitch, ...]:
-        """Return pitches in all possible register between minima and maxima."""
-
-        if period is None:
-            period = Ambitus._guess_period(pitch)
-
         minima, maxima = self._borders
 
         variants = []
@@ -105,13 +111,98 @@ class Ambitus(object):
 
         return tuple(sorted(variants))
 
+    def _find_all_just_intonation_pitch_variants(
+        self,
+        pitches: typing.Sequence[parameters.pitches.JustIntonationPitch],
+        period: parameters.pitches.JustIntonationPitch,
+    ) -> typing.Tuple[typing.Tuple[parameters.pitches.JustIntonationPitch, ...], ...]:
+        # estimate for each pitch how often the period fits between the pitch
+        # and the borders (with one period tolerance for rounding errors);
+        # the exact test is done with the frequencies of the variants, so
+        # that the result is the same as with stepping through the registers
+        log_period = math.log2(float(period.ratio))
+        log_frequencies = np.log2(self._get_frequencies(pitches))
+        log_minima, log_maxima = np.log2(self._border_frequencies)
+        lowest_steps = np.ceil((log_minima - log_frequencies) / log_period) - 1
+        highest_steps = np.floor((log_maxima - log_frequencies) / log_period) + 1
+        minima_frequency, maxima_frequency = self._border_frequencies
+
+        variants_per_pitch = []
+        for pitch, lowest_step, highest_step in zip(
+            pitches, lowest_steps.tolist(), highest_steps.tolist()
+        ):
+            variants = []
+            for n_periods in range(int(lowest_step), int(highest_step) + 1):
+                variant = pitch + type(period)(
+                    tuple(exponent * n_periods for exponent in period.exponents)
+                )
+                if minima_frequency <= variant.frequency <= maxima_frequency:
+                    variants.append(variant)
+            variants_per_pitch.append(tuple(sorted(variants)))
+        return tuple(variants_per_pitch)
+
+    def find_all_pitch_variants_bulk(
+        self, pitches: typing.Sequence[parameters.abc.Pitch], period: typing.Any = None
+    ) -> typing.Tuple[typing.Tuple[parameters.abc.Pitch, ...], ...]:
+        """Return for each pitch its variants in all registers of the ambitus.
+
+        Just intonation pitches with a just intonation period (the default for
+        just intonation pitches) don't need to step through all registers.
+        """
+
+        pitches = tuple(pitches)
+        periods = tuple(
+            Ambitus._guess_period(pitch) if period is None else period
+            for pitch in pitches
+        )
+        is_just_intonation_pitch_list = [
+            isinstance(pitch, parameters.pitches.JustIntonationPitch)
+            and isinstance(pitch_period, parameters.pitches.JustIntonationPitch)
+            and pitch_period.ratio > 1
+            for pitch, pitch_period in zip(pitches, periods)
+        ]
+        # the guessed period of just intonation pitches is always the octave
+        if pitches and all(is_just_intonation_pitch_list):
+            return self._find_all_just_intonation_pitch_variants(pitches, periods[0])
+
+        variants_per_pitch = []
+        for pitch, pitch_period, is_just_intonation_pitch in zip(
+            pitches, periods, is_just_intonation_pitch_list
+        ):
+            if is_just_intonation_pitch:
+                variants = self._find_all_just_intonation_pitch_variants(
+                    (pitch,), pitch_period
+                )[0]
+            else:
+                variants = self._find_all_pitch_variants_by_stepping(
+                    pitch, pitch_period
+                )
+            variants_per_pitch.append(variants)
+        return tuple(variants_per_pitch)
+
+    def find_all_pitch_variants(
+        self, pitch: parameters.abc.Pitch, period: typing.Any = None
+    ) -> typing.Tuple[parameters.abc.Pitch, ...]:
+        """Return pitches in all possible register between minima and maxima."""
+
+        return self.find_all_pitch_variants_bulk((pitch,), period)[0]
+
+    def filter_members_bulk(
+        self, pitches_to_filter: typing.Sequence[parameters.abc.Pitch]
+    ) -> np.ndarray:
+        """Return boolean array which is True for each pitch within the ambitus."""
+
+        frequencies = self._get_frequencies(pitches_to_filter)
+        minima_frequency, maxima_frequency = self._border_frequencies
+        return (frequencies >= minima_frequency) & (frequencies <= maxima_frequency)
+
     def filter_members(
         self, pitches_to_filter: typing.Sequence[parameters.pitches.JustIntonationPitch]
     ) -> typing.Tuple[parameters.pitches.JustIntonationPitch, ...]:
+        pitches_to_filter = tuple(pitches_to_filter)
         return tuple(
-            filter(
-                lambda pitch: pitch >= self.borders[0] and pitch <= self.borders[1],
-                pitches_to_filter,
+            itertools.compress(
+                pitches_to_filter, self.filter_members_bulk(pitches_to_filter).tolist()
             )
         )
 
@@ -121,20 +212,34 @@ class SetBasedAmbitus(Ambitus):
         pitch_set = tuple(sorted(utilities.tools.uniqify_iterable(pitch_set)))
         super().__init__(min(pitch_set), max(pitch_set))
         self._pitch_set = pitch_set
+        # just intonation pitches aren't hashable, but equal just intonation
+        # pitches have equal exponents
+        self._pitch_set_as_exponents = frozenset(
+            pitch.exponents for pitch in pitch_set
+        )
 
     @property
     def pitches(self) -> typing.Sequence[parameters.abc.Pitch]:
         return self._pitch_set
 
-    def find_all_pitch_variants(
-        self, pitch: parameters.abc.Pitch, period: typing.Any = None
-    ) -> typing.Tuple[parameters.abc.Pitch, ...]:
-        """Return pitches in all possible register between minima and maxima."""
+    def find_all_pitch_variants_bulk(
+        self, pitches: typing.Sequence[parameters.abc.Pitch], period: typing.Any = None
+    ) -> typing.Tuple[typing.Tuple[parameters.abc.Pitch, ...], ...]:
+        """Return for each pitch its variants which are members of the set."""
 
-        pitch_variants = super().find_all_pitch_variants(pitch, period)
-        return self.filter_members(pitch_variants)
+        return tuple(
+            self.filter_members(pitch_variants)
+            for pitch_variants in super().find_all_pitch_variants_bulk(pitches, period)
+        )
 
-    def filter_members(
+    def filter_members_bulk(
         self, pitches_to_filter: typing.Sequence[parameters.pitches.JustIntonationPitch]
-    ) -> typing.Tuple[parameters.pitches.JustIntonationPitch, ...]:
-        return tuple(filter(lambda pitch: pitch in self.pitches, pitches_to_filter))
+    ) -> np.ndarray:
+        """Return boolean array which is True for each pitch within the set."""
+
+        pitch_set_as_exponents = self._pitch_set_as_exponents
+        return np.fromiter(
+            (pitch.exponents in pitch_set_as_exponents for pitch in pitches_to_filter),
+            dtype=bool,
+            count=len(pitches_to_filter),
+        )
@@ -8,6 +8,12 @@ from mutwo import parameters
 
 
 class Node(object):
+    __slots__ = (
+        "_written_root_pitch",
+        "_distance_as_just_intonation_pitch",
+        "_written_pitch",
+    )
+
     _mutwo_pitch_to_abjad_pitch_converter = (
         converters.frontends.abjad.MutwoPitchToHEJIAbjadPitchConverter(
             reference_pitch="e"
@@ -51,6 +57,15 @@ class Node(object):
 
 
 class Harmonic(object):
+    __slots__ = (
+        "_written_root_pitch",
+        "_sounding_root_pitch",
+        "_original_sounding_root_pitch",
+        "_nth_harmonic",
+        "_sounding_pitch",
+        "_nodes",
+    )
+
     def __init__(
         self,
         written_root_pitch: parameters.pitches.WesternPitch,
@@ -100,6 +115,18 @@ class Harmonic(object):
 
 
 class String(object):
+    __slots__ = (
+        "nth_string",
+        "tuning_original",
+        "tuning_original_as_just_intonation_pitch",
+        "tuning_retuned",
+        "_n_harmonics",
+        "_written_pitch",
+        "_harmonics",
+        "_harmonic_pitches",
+        "_exponents_to_nth_harmonic",
+    )
+
     _mutwo_pitch_to_abjad_pitch_converter = (
         converters.frontends.abjad.MutwoPitchToAbjadPitchConverter()
     )
@@ -126,7 +153,7 @@ class String(object):
         self._initialise_harmonics()
 
     def _initialise_harmonics(self):
-        self._harmonics = tuple(
+        self.harmonics = tuple(
             Harmonic(
                 self.tuning_original,
                 self.tuning_original_as_just_intonation_pitch,
@@ -145,11 +172,43 @@ class String(object):
     def harmonics(self) -> typing.Tuple[Harmonic, ...]:
         return self._harmonics
 
+    @harmonics.setter
+    def harmonics(self, harmonics: typing.Sequence[Harmonic]):
+        self._harmonics = tuple(harmonics)
+        # the first harmonic is the string itself and doesn't count as
+        # a playable harmonic pitch
+        self._harmonic_pitches = tuple(
+            harmonic.sounding_pitch for harmonic in self._harmonics[1:]
+        )
+        # same as "harmonic_pitches.index(pitch) + 1" (first occurrence wins)
+        exponents_to_nth_harmonic = {}
+        for nth_harmonic, pitch in enumerate(self._harmonic_pitches, 1):
+            exponents_to_nth_harmonic.setdefault(pitch.exponents, nth_harmonic)
+        self._exponents_to_nth_harmonic = exponents_to_nth_harmonic
+
     @property
     def harmonic_pitches(
         self,
     ) -> typing.Tuple[parameters.pitches.JustIntonationPitch, ...]:
-        return tuple(harmonic.sounding_pitch for harmonic in self.harmonics[1:])
+        return self._harmonic_pitches
+
+    def has_harmonic_pitch(self, pitch: parameters.pitches.JustIntonationPitch) -> bool:
+        return pitch.exponents in self._exponents_to_nth_harmonic
+
+    def get_nth_harmonic(self, pitch: parameters.pitches.JustIntonationPitch) -> int:
+        """Return index of the harmonic (in "harmonics") which sounds the pitch.
+
+        Raises a ValueError if the string doesn't have the pitch in its
+        harmonic pitches.
+        """
+
+        try:
+            return self._exponents_to_nth_harmonic[pitch.exponents]
+        except KeyError:
+            raise ValueError(f"{pitch} is not a harmonic pitch of {self}") from None
+
+    def get_harmonic(self, pitch: parameters.pitches.JustIntonationPitch) -> Harmonic:
+        return self._harmonics[self.get_nth_harmonic(pitch)]
 
     @property
     def written_pitch(self) -> abjad.NamedPitch:
@@ -157,18 +216,55 @@ class String(object):
 
 
 class StringInstrument(object):
+    """Strings of an instrument with an index from harmonic pitches to strings.
+
+    The index is build at initialisation, therefore the harmonics of the
+    strings mustn't be changed afterwards.
+    """
+
+    __slots__ = ("_strings", "_exponents_to_strings_and_harmonics")
+
     def __init__(self, strings: typing.Tuple[String, ...]):
         self._strings = strings
+        exponents_to_strings_and_harmonics = {}
+        for string in strings:
+            for pitch in string.harmonic_pitches:
+                exponents = pitch.exponents
+                if exponents not in exponents_to_strings_and_harmonics:
+                    exponents_to_strings_and_harmonics[exponents] = []
+                strings_and_harmonics = exponents_to_strings_and_harmonics[exponents]
+                if not any(
+                    string is other_string for other_string, _ in strings_and_harmonics
+                ):
+                    strings_and_harmonics.append((string, string.get_harmonic(pitch)))
+        self._exponents_to_strings_and_harmonics = {
+            exponents: tuple(strings_and_harmonics)
+            for exponents, strings_and_harmonics in (
+                exponents_to_strings_and_harmonics.items()
+            )
+        }
 
     @property
     def strings(self):
         return self._strings
 
+    def get_strings_and_harmonics_with_pitch(
+        self, pitch_to_examine: parameters.pitches.JustIntonationPitch
+    ) -> typing.Tuple[typing.Tuple[String, Harmonic], ...]:
+        """Return each string (in order) which can play the pitch as a harmonic.
+
+        The harmonic of the string which sounds the pitch (and therefore its
+        nodes) is returned together with the string.
+        """
+
+        return self._exponents_to_strings_and_harmonics.get(
+            pitch_to_examine.exponents, tuple([])
+        )
+
     def get_strings_with_pitch_in_harmonics(
         self, pitch_to_examine: parameters.pitches.JustIntonationPitch
     ) -> typing.Tuple[String, ...]:
-        strings = []
-        for string in self.strings:
-            if pitch_to_examine in string.harmonic_pitches:
-                strings.append(string)
-        return tuple(strings)
+        return tuple(
+            string
+            for string, _ in self.get_strings_and_harmonics_with_pitch(pitch_to_examine)
+        )
@@ -3,12 +3,13 @@
 Public interaction via "main" method.
 """
 
-from mutwo import events
 from mutwo import utilities
 
 from ot3 import constants as ot3_constants
 from ot3 import converters as ot3_converters
+from ot3 import events as ot3_events
 from ot3 import stochastic  # no module in mutwo with same name
+from ot3.utilities import cache
 
 
 def _register_serenades():
@@ -47,9 +48,15 @@ def _register_modes():
         )
 
 
-def _register_saturations():
-    @utilities.decorators.compute_lazy(
-        "ot3/constants/.saturation_tones.pickle",
+def _make_saturation_time_brackets():
+    @cache.compute_cached(
+        lambda: ot3_constants.families_pitch.FAMILIES_PITCH_KEY,
+        ot3_constants.families_pitch,
+        ot3_constants.instruments,
+        ot3_constants.saturations,
+        ot3_converters.symmetrical.families,
+        ot3_converters.symmetrical.saturations,
+        ot3_converters.symmetrical.time_brackets,
         force_to_compute=ot3_constants.compute.COMPUTE_SATURATION_TONES,
     )
     def compute_saturation_time_brackets():
@@ -58,7 +65,11 @@ def _register_saturations():
         )
         return converter.convert(ot3_constants.families_pitch.FAMILIES_PITCH)
 
-    saturation_time_brackets = compute_saturation_time_brackets()
+    return compute_saturation_time_brackets()
+
+
+def _register_saturations():
+    saturation_time_brackets = _make_saturation_time_brackets()
     for time_bracket in saturation_time_brackets:
         ot3_constants.time_brackets_container.TIME_BRACKETS.register(
             time_bracket, tags_to_analyse=(time_bracket[0].tag,)
@@ -83,7 +94,7 @@ def _remove_superfluous_time_brackets():
         if time_bracket.minimal_start < border:
             new_time_bracket_container.append(time_bracket)
 
-    ot3_constants.time_brackets_container.TIME_BRACKETS = events.time_brackets.TimeBracketContainer(
+    ot3_constants.time_brackets_container.TIME_BRACKETS = ot3_events.time_brackets.IndexedTimeBracketContainer(
         new_time_bracket_container
     )
 
@@ -3,6 +3,8 @@
 Public interaction via "main" method.
 """
 
+import itertools
+import typing
 
 import abjad
 
@@ -12,11 +14,11 @@ from mutwo.converters.symmetrical import time_brackets
 from mutwo.converters.symmetrical.playing_indicators import PlayingIndicatorsConverter
 from mutwo.events import basic
 from mutwo.events import time_brackets as events_time_brackets
-from mutwo import utilities
 
 from ot3.constants import compute
 from ot3.constants import clouds
 from ot3.constants import instruments
+from ot3.constants import loudspeakers
 from ot3.constants import families_pitch
 from ot3.constants import time_brackets_container
 from ot3.converters.frontends import abjad_attachments as ot3_abjad_attachments
@@ -28,6 +30,8 @@ from ot3.converters.symmetrical import drones
 from ot3.converters.symmetrical import playing_indicators
 from ot3.converters.symmetrical import shadows
 from ot3 import parameters as ot3_parameters
+from ot3.utilities import cache
+from ot3.utilities import tools
 
 
 def _change_horizontal_spacing(leaf, make_moment_duration):
@@ -67,6 +71,52 @@ def _add_left_hand_pizz(serenade2):
     serenade2[0][0][0][3] = short_polyphony
 
 
+def _make_simultaneous_event_for_instrument(
+    instrument_id, filtered_time_brackets, return_pitch: bool = False,
+) -> typing.Optional[basic.SimultaneousEvent]:
+    playing_indicators_converter = PlayingIndicatorsConverter(
+        [
+            playing_indicators.HarmonicGlissandoConverter(),
+            playing_indicators.BowNoiseConverter(),
+            playing_indicators.TeethOnReedConverter(),
+        ]
+    )
+    time_brackets_converter = time_brackets.TimeBracketsToEventConverter(instrument_id)
+    converted_time_brackets = time_brackets_converter.convert(filtered_time_brackets)
+    if not converted_time_brackets:
+        return None
+
+    if instrument_id == instruments.ID_VIOLIN:
+        converted_time_brackets = tuple(
+            simev if isinstance(simev, basic.TaggedSimpleEvent) else simev[:1]
+            for simev in converted_time_brackets
+        )
+
+    n_sequential_events = max(
+        len(simultaneous_event)
+        for simultaneous_event in converted_time_brackets
+        if isinstance(simultaneous_event, basic.SimultaneousEvent)
+    )
+    simultaneous_event = basic.SimultaneousEvent(
+        [basic.SequentialEvent([]) for _ in range(n_sequential_events)]
+    )
+    for event in converted_time_brackets:
+        if isinstance(event, basic.SimpleEvent):
+            rest = basic.SimpleEvent(event.duration)
+            for seq in simultaneous_event:
+                seq.append(rest)
+        else:
+            for ev, sequential_event in zip(event, simultaneous_event):
+                ev = playing_indicators_converter.convert(ev)
+                for subseqev in ev:
+                    sequential_event.extend(subseqev)
+
+    if return_pitch:
+        simultaneous_event.set_parameter("return_pitch", True)
+
+    return simultaneous_event
+
+
 def _render_soundfile_for_instrument(
     instrument_id,
     filtered_time_brackets,
@@ -74,49 +124,30 @@ def _render_soundfile_for_instrument(
     return_pitch: bool = False,
 ):
     if compute.RENDER_MIDIFILES:
-        playing_indicators_converter = PlayingIndicatorsConverter(
-            [
-                playing_indicators.HarmonicGlissandoConverter(),
-                playing_indicators.BowNoiseConverter(),
-                playing_indicators.TeethOnReedConverter(),
-            ]
-        )
-        time_brackets_converter = time_brackets.TimeBracketsToEventConverter(
-            instrument_id
-        )
-        converted_time_brackets = time_brackets_converter.convert(
-            filtered_time_brackets
+        simultaneous_event = _make_simultaneous_event_for_instrument(
+            instrument_id, filtered_time_brackets, return_pitch=return_pitch
         )
-        if converted_time_brackets:
-            if instrument_id == instruments.ID_VIOLIN:
-                converted_time_brackets = tuple(
-                    simev if isinstance(simev, basic.TaggedSimpleEvent) else simev[:1]
-                    for simev in converted_time_brackets
-                )
+        if simultaneous_event is not None:
+            midi_file_converter.convert(simultaneous_event)
 
-            n_sequential_events = max(
-                len(simultaneous_event)
-                for simultaneous_event in converted_time_brackets
-                if isinstance(simultaneous_event, basic.SimultaneousEvent)
-            )
-            simultaneous_event = basic.SimultaneousEvent(
-                [basic.SequentialEvent([]) for _ in range(n_sequential_events)]
-            )
-            for event in converted_time_brackets:
-                if isinstance(event, basic.SimpleEvent):
-                    rest = basic.SimpleEvent(event.duration)
-                    for seq in simultaneous_event:
-                        seq.append(rest)
-                else:
-                    for ev, sequential_event in zip(event, simultaneous_event):
-                        ev = playing_indicators_converter.convert(ev)
-                        for subseqev in ev:
-                            sequential_event.extend(subseqev)
-
-            if return_pitch:
-                simultaneous_event.set_parameter("return_pitch", True)
 
-            midi_file_converter.convert(simultaneous_event)
+def _make_midi_file_job_for_instrument(
+    instrument_id,
+    filtered_time_brackets,
+    name: str,
+    return_pitch: bool = False,
+    **kwargs,
+) -> typing.Tuple[ot3_midi.MidiFileJob, ...]:
+    simultaneous_event = _make_simultaneous_event_for_instrument(
+        instrument_id, filtered_time_brackets, return_pitch=return_pitch
+    )
+    if simultaneous_event is None:
+        return tuple([])
+    return (ot3_midi.MidiFileJob(name, simultaneous_event, **kwargs),)
+
+
+def _export_midi_files(jobs: typing.Iterable[ot3_midi.MidiFileJob]):
+    ot3_midi.export_midi_files(jobs, n_processes=compute.N_PROCESSES)
 
 
 def _render_notation_for_instrument(
@@ -178,12 +209,16 @@ def _render_saxophone():
     instrument_id = instruments.ID_SAXOPHONE
     filtered_time_brackets = time_brackets_container.TIME_BRACKETS.filter(instrument_id)
 
-    _render_soundfile_for_instrument(
-        instrument_id,
-        filtered_time_brackets,
-        ot3_midi.OT3InstrumentSimulationEventToMidiFileConverter("saxophone"),
-        return_pitch=True,
-    )
+    if compute.RENDER_MIDIFILES:
+        _export_midi_files(
+            _make_midi_file_job_for_instrument(
+                instrument_id,
+                filtered_time_brackets,
+                "saxophone",
+                return_pitch=True,
+                converter_class=ot3_midi.OT3InstrumentSimulationEventToMidiFileConverter,
+            )
+        )
 
     # adjust pitch notation (add transpostion)
 
@@ -296,12 +331,16 @@ def _render_violin():
     instrument_id = instruments.ID_VIOLIN
     filtered_time_brackets = time_brackets_container.TIME_BRACKETS.filter(instrument_id)
 
-    _render_soundfile_for_instrument(
-        instrument_id,
-        filtered_time_brackets,
-        ot3_midi.OT3InstrumentSimulationEventToMidiFileConverter("violin"),
-        return_pitch=True,
-    )
+    if compute.RENDER_MIDIFILES:
+        _export_midi_files(
+            _make_midi_file_job_for_instrument(
+                instrument_id,
+                filtered_time_brackets,
+                "violin",
+                return_pitch=True,
+                converter_class=ot3_midi.OT3InstrumentSimulationEventToMidiFileConverter,
+            )
+        )
 
     def post_process_abjad_scores(abjad_scores):
         serenade0_score_index = list(map(lambda score: score.name, abjad_scores)).index(
@@ -350,46 +389,79 @@ def _render_violin():
     )
 
 
+def _render_drone_for_loudspeaker(loudspeaker: str):
+    families_pitch_to_drones_converter = drones.FamiliesPitchToDronesConverter(
+        (loudspeaker,)
+    )
+    loudspeaker_to_simultaneous_event = families_pitch_to_drones_converter.convert(
+        families_pitch.FAMILIES_PITCH
+    )
+    # this already runs in a worker process
+    ot3_midi.export_midi_files(
+        ot3_midi.MidiFileJob(
+            f"drone_{loudspeaker}_{nth_sequential_event}", sequential_event
+        )
+        for nth_sequential_event, sequential_event in enumerate(
+            loudspeaker_to_simultaneous_event[loudspeaker]
+        )
+    )
+
+
 def _render_drone():
     if compute.RENDER_MIDIFILES:
-        families_pitch_to_drones_converter = drones.FamiliesPitchToDronesConverter()
-        loudspeaker_to_simultaneous_event = families_pitch_to_drones_converter.convert(
-            families_pitch.FAMILIES_PITCH
+        # load the families before forking, so that the workers don't have to
+        families_pitch.FAMILIES_PITCH
+        # each loudspeaker owns its own state, so they can be converted and
+        # exported independently from each other
+        tools.map_in_processes(
+            _render_drone_for_loudspeaker,
+            ((loudspeaker,) for loudspeaker in loudspeakers.LOUDSPEAKERS),
+            n_processes=compute.N_PROCESSES,
         )
-        for (
-            loudspeaker,
-            simultaneous_event,
-        ) in loudspeaker_to_simultaneous_event.items():
-            for nth_sequential_event, sequential_event in enumerate(simultaneous_event):
-                converter = ot3_midi.OT3InstrumentEventToMidiFileConverter(
-                    f"drone_{loudspeaker}_{nth_sequential_event}"
-                )
-                converter.convert(sequential_event)
 
 
-def _render_bells():
-    @utilities.decorators.compute_lazy(
-        "ot3/constants/.bells.pickle", force_to_compute=compute.COMPUTE_BELLS
+# each bell is cached on its own, so that adding bells (or changing the
+# seed of one bell) only computes the new bells
+@cache.compute_cached(
+    lambda: families_pitch.FAMILIES_PITCH_KEY,
+    families_pitch,
+    clouds,
+    bells,
+    force_to_compute=compute.COMPUTE_BELLS,
+)
+def _make_bell_sequential_event(nth_bell: int) -> basic.SequentialEvent:
+    # the bell converter reseeds the global random generator when it starts
+    # to convert, so the result of one bell doesn't depend on other bells
+    family_of_pitch_curves_to_bell_converter = bells.FamilyOfPitchCurvesToBellConverter(
+        seed=nth_bell
+    )
+    return family_of_pitch_curves_to_bell_converter.convert(families_pitch.FAMILY_PITCH)
+
+
+def _render_bell(nth_bell: int):
+    # this already runs in a worker process
+    ot3_midi.export_midi_files(
+        (
+            ot3_midi.MidiFileJob(
+                f"bell{nth_bell}",
+                _make_bell_sequential_event(nth_bell),
+                dict(min_velocity=1, max_velocity=100, apply_extrema=True),
+            ),
+        )
     )
-    def _make_bell_sequential_events(n_bells):
-        bell_events = []
-        for nth_bell in range(n_bells):
-            family_of_pitch_curves_to_bell_converter = (
-                bells.FamilyOfPitchCurvesToBellConverter(seed=nth_bell)
-            )
-            sequential_event = family_of_pitch_curves_to_bell_converter.convert(
-                families_pitch.FAMILY_PITCH
-            )
-            bell_events.append(sequential_event)
-        return tuple(bell_events)
 
+
+def _render_bells():
     if compute.RENDER_MIDIFILES:
-        bell_events = _make_bell_sequential_events(clouds.N_BELLS)
-        for nth_bell, sequential_event in enumerate(bell_events):
-            midi_file_converter = ot3_midi.OT3InstrumentEventToMidiFileConverter(
-                f"bell{nth_bell}", min_velocity=1, max_velocity=100, apply_extrema=True
-            )
-            midi_file_converter.convert(sequential_event)
+        # load the families before forking, so that the workers don't have to
+        families_pitch.FAMILY_PITCH
+        # each bell is exported by the process which computed it, as soon as
+        # it is ready
+        tools.map_in_processes(
+            _render_bell,
+            ((nth_bell,) for nth_bell in range(clouds.N_BELLS)),
+            n_processes=compute.N_PROCESSES,
+        )
 
 
 def _render_sine(instrument_id):
@@ -409,22 +481,21 @@ def _render_sines():
                 _render_sine(instrument_id)
 
 
-def _render_mode(instrument_id):
-    filtered_time_brackets = time_brackets_container.TIME_BRACKETS.filter(instrument_id)
-
-    _render_soundfile_for_instrument(
-        instrument_id,
-        filtered_time_brackets,
-        ot3_midi.OT3InstrumentEventToMidiFileConverter(
-            instrument_id, apply_extrema=True, min_velocity=30, max_velocity=100
-        ),
-    )
-
-
 def _render_modes():
     if compute.RENDER_MIDIFILES:
-        for instrument_id in instruments.MODE_IDS:
-            _render_mode(instrument_id)
+        _export_midi_files(
+            itertools.chain.from_iterable(
+                _make_midi_file_job_for_instrument(
+                    instrument_id,
+                    time_brackets_container.TIME_BRACKETS.filter(instrument_id),
+                    instrument_id,
+                    converter_settings=dict(
+                        apply_extrema=True, min_velocity=30, max_velocity=100
+                    ),
+                )
+                for instrument_id in instruments.MODE_IDS
+            )
+        )
 
 
 def _render_saturation_sine(instrument_id):
@@ -439,6 +510,7 @@ def _render_saturation_sine(instrument_id):
 
 def _render_shadows():
     if compute.RENDER_MIDIFILES:
+        jobs = []
         for instrument_tag in (instruments.ID_VIOLIN, instruments.ID_SAXOPHONE):
             converters = (
                 (
@@ -455,12 +527,14 @@ def _render_shadows():
                 ),
             )
             for suffix, converter in converters:
-                name = f"shadows_{instrument_tag}{suffix}.mid"
-                converted_event = converter.convert(instrument_tag)
-                midi_converter = ot3_midi.OT3InstrumentEventToMidiFileConverter(
-                    name, apply_extrema=True, min_velocity=30, max_velocity=100
+                jobs.append(
+                    ot3_midi.MidiFileJob(
+                        f"shadows_{instrument_tag}{suffix}",
+                        converter.convert(instrument_tag),
+                        dict(apply_extrema=True, min_velocity=30, max_velocity=100),
+                    )
                 )
-                midi_converter.convert(converted_event)
+        _export_midi_files(jobs)
 
 
 def _render_saturation_sines():
@@ -3,27 +3,83 @@
 Public interaction via "main" method.
 """
 
+import random
 import typing
 
+import numpy as np
+
 from mutwo import events
-from mutwo import generators
-from mutwo import utilities
 
 from ot3 import constants
+from ot3 import converters
 from ot3 import stochastic_constants
+from ot3 import utilities as ot3_utilities
+from ot3.utilities import cache
+
+# the stochastic parts depend on the harmonic skeleton and on the
+# definitions of all time bracket converters and their probabilities
+_DEPENDENCIES = (
+    lambda: constants.families_pitch.FAMILIES_PITCH_KEY,
+    constants.families_pitch,
+    constants.instruments,
+    constants.tendencies,
+    converters.symmetrical.families,
+    converters.symmetrical.time_brackets,
+    stochastic_constants,
+    ot3_utilities.tools,
+)
 
 
 def _calculate_time_brackets_for_instrument(
-    time_bracket_factory: generators.generic.DynamicChoice,
+    instrument_id: str,
+) -> typing.Tuple[events.time_brackets.TimeBracket, ...]:
+    # converters and factories have their own generators, but time brackets
+    # and some pickers still use the global ones: seed them per instrument
+    # (and restore them afterwards), so that the result of one instrument
+    # doesn't depend on whether the other instrument is computed before or
+    # in parallel
+    random_state, numpy_random_state = random.getstate(), np.random.get_state()
+    seed = int(cache.make_digest(instrument_id)[:8], 16)
+    random.seed(seed)
+    np.random.seed(seed)
+    try:
+        return _walk_through_time_bracket_factory(
+            stochastic_constants.INSTRUMENT_ID_TO_TIME_BRACKET_FACTORY[instrument_id]
+        )
+    finally:
+        random.setstate(random_state)
+        np.random.set_state(numpy_random_state)
+
+
+def _walk_through_time_bracket_factory(
+    time_bracket_factory: ot3_utilities.tools.DynamicChoice,
 ) -> typing.Tuple[events.time_brackets.TimeBracket, ...]:
+    duration = constants.families_pitch.FAMILIES_PITCH.duration
     resulting_time_brackets = []
     start_time = 0
-    while start_time < constants.families_pitch.FAMILIES_PITCH.duration:
-        absolute_position = start_time / constants.families_pitch.FAMILIES_PITCH.duration
+    while start_time < duration:
+        # jump over ranges in which only rests can be chosen (the random
+        # numbers of the skipped gambles still get consumed, so the result
+        # is the same as if all of them would have been gambled)
+        while start_time < duration and time_bracket_factory.can_only_choose(
+            None, start_time / duration
+        ):
+            time_bracket_factory.skip()
+            start_time += 5
+        if start_time >= duration:
+            break
+
+        absolute_position = start_time / duration
         start_time_to_time_bracket_converter = time_bracket_factory.gamble_at(
             absolute_position
         )
         if start_time_to_time_bracket_converter:
+            # don't build blueprints for converters without any curves at
+            # the start time
+            if start_time_to_time_bracket_converter.is_unavailable_at(start_time):
+                start_time_to_time_bracket_converter.skip(start_time)
+                continue
+
             generated_time_brackets = start_time_to_time_bracket_converter.convert(
                 start_time
             )
@@ -35,32 +91,24 @@ def _calculate_time_brackets_for_instrument(
     return tuple(resulting_time_brackets)
 
 
-@utilities.decorators.compute_lazy(
-    f"ot3/constants/.timeBrackets{constants.instruments.ID_SAXOPHONE}.pickle",
+@cache.compute_cached(
+    *_DEPENDENCIES,
     force_to_compute=constants.compute.COMPUTE_STOCHASTIC_PARTS,
 )
 def _calculate_time_brackets_for_saxophone() -> typing.Tuple[
     events.time_brackets.TimeBracket, ...
 ]:
-    return _calculate_time_brackets_for_instrument(
-        stochastic_constants.INSTRUMENT_ID_TO_TIME_BRACKET_FACTORY[
-            constants.instruments.ID_SAXOPHONE
-        ]
-    )
+    return _calculate_time_brackets_for_instrument(constants.instruments.ID_SAXOPHONE)
 
 
-@utilities.decorators.compute_lazy(
-    f"ot3/constants/.timeBrackets{constants.instruments.ID_VIOLIN}.pickle",
+@cache.compute_cached(
+    *_DEPENDENCIES,
     force_to_compute=constants.compute.COMPUTE_STOCHASTIC_PARTS,
 )
 def _calculate_time_brackets_for_violin() -> typing.Tuple[
     events.time_brackets.TimeBracket, ...
 ]:
-    return _calculate_time_brackets_for_instrument(
-        stochastic_constants.INSTRUMENT_ID_TO_TIME_BRACKET_FACTORY[
-            constants.instruments.ID_VIOLIN
-        ]
-    )
+    return _calculate_time_brackets_for_instrument(constants.instruments.ID_VIOLIN)
 
 
 INSTRUMENT_ID_TO_CALCULATE_TIME_BRACKETS_FUNCTION = {
@@ -69,15 +117,27 @@ INSTRUMENT_ID_TO_CALCULATE_TIME_BRACKETS_FUNCTION = {
 }
 
 
+def _calculate_time_brackets(
+    instrument_id: str,
+) -> typing.Tuple[events.time_brackets.TimeBracket, ...]:
+    return INSTRUMENT_ID_TO_CALCULATE_TIME_BRACKETS_FUNCTION[instrument_id]()
+
+
 def main() -> typing.Tuple[typing.Tuple[str, events.time_brackets.TimeBracket], ...]:
     collected_instrument_id_and_time_bracket_pairs = []
 
-    for (
-        instrument_id
-    ) in stochastic_constants.INSTRUMENT_ID_TO_TIME_BRACKET_FACTORY.keys():
-        instrument_specific_time_brackets = INSTRUMENT_ID_TO_CALCULATE_TIME_BRACKETS_FUNCTION[
-            instrument_id
-        ]()
+    instrument_ids = tuple(stochastic_constants.INSTRUMENT_ID_TO_TIME_BRACKET_FACTORY)
+    # the instruments don't share any state, so they can be computed in
+    # parallel (with the same results as if they were computed one after
+    # the other)
+    time_brackets_per_instrument = ot3_utilities.tools.map_in_processes(
+        _calculate_time_brackets,
+        ((instrument_id,) for instrument_id in instrument_ids),
+        n_processes=constants.compute.N_PROCESSES,
+    )
+    for instrument_id, instrument_specific_time_brackets in zip(
+        instrument_ids, time_brackets_per_instrument
+    ):
         collected_instrument_id_and_time_bracket_pairs.extend(
             map(
                 lambda bracket: (instrument_id, bracket),
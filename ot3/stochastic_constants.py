@@ -1,13 +1,12 @@
 import expenvelope
 
-from mutwo import generators
-
 from ot3 import constants
+from ot3 import utilities as ot3_utilities
 from ot3.converters import symmetrical as ot3_symmetrical
 
 
 INSTRUMENT_ID_TO_TIME_BRACKET_FACTORY = {
-    constants.instruments.ID_VIOLIN: generators.generic.DynamicChoice(
+    constants.instruments.ID_VIOLIN: ot3_utilities.tools.DynamicChoice(
         (
             None,
             ot3_symmetrical.time_brackets.StartTimeToViolinCalligraphicLineConverter(
@@ -92,7 +91,7 @@ INSTRUMENT_ID_TO_TIME_BRACKET_FACTORY = {
             expenvelope.Envelope.from_points((0, 0), (0.4, 0), (0.6, 0.82), (0.85, 1),),
         ),
     ),
-    constants.instruments.ID_SAXOPHONE: generators.generic.DynamicChoice(
+    constants.instruments.ID_SAXOPHONE: ot3_utilities.tools.DynamicChoice(
         (
             None,
             ot3_symmetrical.time_brackets.StartTimeToSaxophoneHarmonicsCalligraphicLineConverter(
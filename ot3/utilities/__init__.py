@@ -1,3 +1,5 @@
+from . import build_graph
+from . import lazy
 from . import equal_range_distributions
 from . import exceptions
 from . import tools
@@ -0,0 +1,230 @@
+"""Dependency aware incremental build of the different parts of the piece.
+
+Each stage declares the files it reads (inputs, glob patterns are allowed),
+the files it writes (outputs) and the stages on which it depends. A stage gets
+rebuild if one of its outputs is missing or if the fingerprint of its inputs
+and of its dependencies changed since the last successful build.
+
+Stages without outputs only produce state in memory (for instance registering
+time brackets in the global TimeBracketContainer). They are executed only if a
+stage which depends on them has to be rebuild.
+"""
+
+import dataclasses
+import glob
+import hashlib
+import json
+import os
+import time
+import typing
+
+DEFAULT_STATE_PATH = "builds/.build_graph.json"
+
+
+@dataclasses.dataclass(frozen=True)
+class Stage(object):
+    name: str
+    function: typing.Callable[[], typing.Any]
+    inputs: typing.Tuple[str, ...] = tuple([])
+    outputs: typing.Tuple[str, ...] = tuple([])
+    dependencies: typing.Tuple[str, ...] = tuple([])
+
+    @property
+    def is_in_memory(self) -> bool:
+        return len(self.outputs) == 0
+
+
+class BuildGraph(object):
+    def __init__(
+        self,
+        stages: typing.Sequence[Stage] = tuple([]),
+        state_path: str = DEFAULT_STATE_PATH,
+    ):
+        self._state_path = state_path
+        self._name_to_stage: typing.Dict[str, Stage] = {}
+        for stage in stages:
+            self.add(stage)
+
+    # ###################################################################### #
+    #                          private methods                               #
+    # ###################################################################### #
+
+    def _load_state(self) -> typing.Dict[str, str]:
+        try:
+            with open(self._state_path, "r") as state_file:
+                return json.load(state_file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _save_state(self, state: typing.Dict[str, str]):
+        state_directory = os.path.dirname(self._state_path)
+        if state_directory:
+            os.makedirs(state_directory, exist_ok=True)
+        with open(self._state_path, "w") as state_file:
+            json.dump(state, state_file, indent=2, sort_keys=True)
+
+    @staticmethod
+    def _hash_file(path: str, path_to_digest: typing.Dict[str, str]) -> str:
+        try:
+            return path_to_digest[path]
+        except KeyError:
+            file_hash = hashlib.sha256()
+            with open(path, "rb") as file_to_hash:
+                for chunk in iter(lambda: file_to_hash.read(1 << 16), b""):
+                    file_hash.update(chunk)
+            digest = path_to_digest[path] = file_hash.hexdigest()
+            return digest
+
+    def _fingerprint(
+        self,
+        name: str,
+        name_to_fingerprint: typing.Dict[str, str],
+        path_to_digest: typing.Dict[str, str],
+    ) -> str:
+        try:
+            return name_to_fingerprint[name]
+        except KeyError:
+            pass
+
+        stage = self._name_to_stage[name]
+        fingerprint = hashlib.sha256(name.encode())
+        for pattern in stage.inputs:
+            paths = sorted(
+                path
+                for path in glob.glob(pattern, recursive=True)
+                if os.path.isfile(path)
+            )
+            # a missing input changes the fingerprint as well
+            fingerprint.update(f"{pattern}:{len(paths)}".encode())
+            for path in paths:
+                fingerprint.update(path.encode())
+                fingerprint.update(self._hash_file(path, path_to_digest).encode())
+
+        for dependency in stage.dependencies:
+            fingerprint.update(
+                self._fingerprint(
+                    dependency, name_to_fingerprint, path_to_digest
+                ).encode()
+            )
+
+        digest = name_to_fingerprint[name] = fingerprint.hexdigest()
+        return digest
+
+    def _collect_stages(self, targets: typing.Iterable[str]) -> typing.Set[str]:
+        collected_stages = set([])
+        stages_to_visit = list(targets)
+        while stages_to_visit:
+            name = stages_to_visit.pop()
+            if name not in collected_stages:
+                if name not in self._name_to_stage:
+                    raise KeyError(f"Unknown build stage '{name}'.")
+                collected_stages.add(name)
+                stages_to_visit.extend(self._name_to_stage[name].dependencies)
+        return collected_stages
+
+    # ###################################################################### #
+    #                           public methods                               #
+    # ###################################################################### #
+
+    @property
+    def stages(self) -> typing.Tuple[Stage, ...]:
+        return tuple(self._name_to_stage.values())
+
+    def add(self, stage: Stage):
+        if stage.name in self._name_to_stage:
+            raise ValueError(f"Build stage '{stage.name}' has already been added.")
+        for dependency in stage.dependencies:
+            if dependency not in self._name_to_stage:
+                raise ValueError(
+                    f"Dependency '{dependency}' of build stage '{stage.name}' has to"
+                    " be added before the stage itself."
+                )
+        self._name_to_stage[stage.name] = stage
+
+    def find_dirty_stages(
+        self,
+        targets: typing.Optional[typing.Sequence[str]] = None,
+        force: bool = False,
+        adopt_existing_outputs: bool = False,
+    ) -> typing.Tuple[typing.Tuple[str, ...], typing.Dict[str, str]]:
+        """Return names of stages which have to run (in build order).
+
+        :param targets: Names of stages which shall be build. If None all
+            stages are build.
+        :param force: Rebuild all targets regardless of their state.
+        :param adopt_existing_outputs: Treat stages whose outputs exist, but
+            which haven't been build by the graph yet, as up to date (useful
+            to avoid recomputing expensive pickles when the graph is used
+            for the first time).
+        """
+
+        if targets is None:
+            targets = tuple(self._name_to_stage.keys())
+        collected_stages = self._collect_stages(targets)
+        state = self._load_state()
+        name_to_fingerprint: typing.Dict[str, str] = {}
+        path_to_digest: typing.Dict[str, str] = {}
+
+        stages_to_run = set([])
+        for name in collected_stages:
+            stage = self._name_to_stage[name]
+            if stage.is_in_memory:
+                continue
+            fingerprint = self._fingerprint(name, name_to_fingerprint, path_to_digest)
+            are_outputs_available = all(
+                os.path.exists(output) for output in stage.outputs
+            )
+            if name not in state and are_outputs_available and adopt_existing_outputs:
+                state[name] = fingerprint
+            if (
+                force
+                or not are_outputs_available
+                or state.get(name, None) != fingerprint
+            ):
+                stages_to_run.add(name)
+
+        # in memory stages only have to run if any stage which depends on them
+        # has to run
+        in_memory_stages_to_visit = list(stages_to_run)
+        while in_memory_stages_to_visit:
+            name = in_memory_stages_to_visit.pop()
+            for dependency in self._name_to_stage[name].dependencies:
+                if (
+                    self._name_to_stage[dependency].is_in_memory
+                    and dependency not in stages_to_run
+                ):
+                    stages_to_run.add(dependency)
+                    in_memory_stages_to_visit.append(dependency)
+
+        ordered_stages_to_run = tuple(
+            name for name in self._name_to_stage if name in stages_to_run
+        )
+        for name in tuple(state):
+            if name not in self._name_to_stage:
+                del state[name]
+        return ordered_stages_to_run, state
+
+    def build(
+        self,
+        targets: typing.Optional[typing.Sequence[str]] = None,
+        force: bool = False,
+        adopt_existing_outputs: bool = False,
+    ) -> typing.Tuple[str, ...]:
+        """Run all dirty stages and return the names of the executed stages."""
+
+        stages_to_run, state = self.find_dirty_stages(
+            targets, force, adopt_existing_outputs
+        )
+        self._save_state(state)
+        for name in stages_to_run:
+            stage = self._name_to_stage[name]
+            print(f"BUILD: run stage '{name}'.")
+            start_time = time.time()
+            stage.function()
+            print(f"BUILD: finished '{name}' in {round(time.time() - start_time, 2)}s.")
+            if not stage.is_in_memory:
+                # fingerprints have to be recalculated, because a stage may
+                # change files which are inputs of other stages
+                state[name] = self._fingerprint(name, {}, {})
+                self._save_state(state)
+        return stages_to_run
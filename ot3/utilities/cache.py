@@ -0,0 +1,270 @@
+"""Content addressed on-disk cache for expensive computations.
+
+Unlike :func:`mutwo.utilities.decorators.compute_lazy`, which stores results
+at a fixed path and has to be invalidated by hand, the results are stored
+under a key which is the hash of the source code of the decorated function,
+its arguments and all declared dependencies (modules, constants, seeds, ...).
+Whenever one of them changes the result is recomputed, old results stay in
+the cache until they get evicted (least recently used first) once the cache
+grows larger than its maximum size.
+"""
+
+import functools
+import glob
+import hashlib
+import inspect
+import os
+import re
+import tempfile
+import types
+import typing
+
+try:
+    import dill as pickle
+except ImportError:
+    import pickle
+
+DEFAULT_DIRECTORY = "ot3/constants/.cache"
+DEFAULT_MAX_SIZE = 2 ** 30  # in bytes
+
+F = typing.TypeVar("F", bound=typing.Callable[..., typing.Any])
+
+_PATH_TO_DIGEST: typing.Dict[typing.Tuple[str, float], str] = {}
+
+
+def _digest_file(path: str) -> str:
+    key = (path, os.path.getmtime(path))
+    try:
+        return _PATH_TO_DIGEST[key]
+    except KeyError:
+        with open(path, "rb") as file_to_hash:
+            digest = _PATH_TO_DIGEST[key] = hashlib.sha256(
+                file_to_hash.read()
+            ).hexdigest()
+        return digest
+
+
+def _digest_module(module: types.ModuleType) -> str:
+    module_path = getattr(module, "__file__", None)
+    if module_path is None:
+        return repr(module)
+    # for packages all submodules are relevant
+    if os.path.basename(module_path) == "__init__.py":
+        paths = sorted(
+            glob.glob(
+                os.path.join(os.path.dirname(module_path), "**", "*.py"),
+                recursive=True,
+            )
+        )
+    else:
+        paths = [module_path]
+    module_hash = hashlib.sha256(module.__name__.encode())
+    for path in paths:
+        module_hash.update(_digest_file(path).encode())
+    return module_hash.hexdigest()
+
+
+def _update_hash(value_hash, value: typing.Any):
+    """Feed a stable representation of value into value_hash.
+
+    Stable means independent of memory addresses and of the hash seed of
+    the current interpreter (which changes the iteration order of sets).
+    """
+
+    if isinstance(value, types.ModuleType):
+        value_hash.update(f"module:{_digest_module(value)}".encode())
+    elif isinstance(value, (str, bytes, int, float, complex, bool, type(None))):
+        value_hash.update(f"{type(value).__name__}:{value!r}".encode())
+    elif isinstance(value, (tuple, list)):
+        value_hash.update(f"{type(value).__name__}:{len(value)}".encode())
+        for item in value:
+            _update_hash(value_hash, item)
+    elif isinstance(value, dict):
+        value_hash.update(f"dict:{len(value)}".encode())
+        for key_digest, item in sorted(
+            (make_digest(key), item) for key, item in value.items()
+        ):
+            value_hash.update(key_digest.encode())
+            _update_hash(value_hash, item)
+    elif isinstance(value, (set, frozenset)):
+        value_hash.update(f"set:{len(value)}".encode())
+        for item_digest in sorted(make_digest(item) for item in value):
+            value_hash.update(item_digest.encode())
+    elif isinstance(value, (types.FunctionType, types.MethodType)):
+        try:
+            source = inspect.getsource(value)
+        except (OSError, TypeError):
+            source = value.__qualname__
+        value_hash.update(f"function:{source}".encode())
+    elif type(value).__repr__ is not object.__repr__:
+        value_hash.update(f"{type(value).__qualname__}:{value!r}".encode())
+    elif hasattr(value, "__dict__"):
+        value_hash.update(f"{type(value).__qualname__}".encode())
+        _update_hash(value_hash, vars(value))
+    else:
+        value_hash.update(pickle.dumps(value))
+
+
+def make_digest(value: typing.Any) -> str:
+    """Return stable sha256 hex digest of any (picklable or printable) object."""
+
+    value_hash = hashlib.sha256()
+    _update_hash(value_hash, value)
+    return value_hash.hexdigest()
+
+
+def _get_cache_size_and_entries(
+    directory: str,
+) -> typing.Tuple[int, typing.List[typing.Tuple[float, int, str]]]:
+    entries = []
+    for path in glob.glob(os.path.join(directory, "*.pickle")):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+    return sum(size for _, size, _ in entries), entries
+
+
+def _evict(directory: str, max_size: int, path_to_keep: str):
+    cache_size, entries = _get_cache_size_and_entries(directory)
+    for _, size, path in sorted(entries):
+        if cache_size <= max_size:
+            break
+        if path != path_to_keep:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            cache_size -= size
+
+
+def _dump(result: typing.Any, path: str):
+    # write to temporary file first, so that interrupted runs never
+    # leave a broken cache entry
+    file_descriptor, temporary_path = tempfile.mkstemp(
+        dir=os.path.dirname(path), suffix=".tmp"
+    )
+    try:
+        with os.fdopen(file_descriptor, "wb") as cache_file:
+            pickle.dump(result, cache_file)
+        os.replace(temporary_path, path)
+    except BaseException:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        raise
+
+
+def load_compute_lazy_result(path: str, *args, **kwargs) -> typing.Any:
+    """Load the result of a pickle written by compute_lazy of mutwo.
+
+    :param path: Path of the pickle.
+    :param args: Arguments with which the result is expected to be computed.
+    :param kwargs: Keyword arguments with which the result is expected to
+        be computed.
+    :raises ValueError: If the pickle has been computed with other arguments.
+    """
+
+    with open(path, "rb") as legacy_file:
+        function_result, previous_args_and_kwargs = pickle.load(legacy_file)
+    if previous_args_and_kwargs != (args, kwargs):
+        raise ValueError(
+            f"Pickle '{path}' has been computed with {previous_args_and_kwargs}"
+            f" and not with {(args, kwargs)}."
+        )
+    return function_result
+
+
+def compute_cached(
+    *dependencies: typing.Any,
+    directory: str = DEFAULT_DIRECTORY,
+    max_size: int = DEFAULT_MAX_SIZE,
+    force_to_compute: bool = False,
+):
+    """Only run function if its code, input or dependencies change.
+
+    :param dependencies: Anything else the result depends on. Modules are
+        digested by their source code (packages by the source code of all
+        submodules). Functions without arguments are called each time the
+        decorated function gets called and their return value is digested
+        (useful for constants which are defined after the decorated function
+        or which are the keys of other caches). All other values are
+        digested by their content.
+    :param directory: Where the results are stored.
+    :param max_size: Maximum size of the cache directory in bytes. If the
+        cache grows larger the least recently used results get removed.
+    :param force_to_compute: Set to ``True`` if function has to be re-computed.
+
+    The key of the last call is available via the ``last_key`` attribute of
+    the decorated function, so that other caches can depend on it. Results
+    which haven't been computed by the decorated function (for instance the
+    pickles of :func:`mutwo.utilities.decorators.compute_lazy`) are only
+    used if they are explicitly stored via its ``adopt`` attribute.
+    """
+
+    def decorator(function_to_decorate: F) -> F:
+        function_name = re.sub(
+            r"[^\w.]",
+            "",
+            f"{function_to_decorate.__module__}.{function_to_decorate.__qualname__}",
+        )
+        function_digest = make_digest(function_to_decorate)
+
+        def make_key(*args, **kwargs) -> str:
+            resolved_dependencies = tuple(
+                dependency()
+                if isinstance(dependency, types.FunctionType)
+                else dependency
+                for dependency in dependencies
+            )
+            return make_digest(
+                (function_digest, args, kwargs, resolved_dependencies)
+            )
+
+        def get_path(key: str) -> str:
+            return os.path.join(directory, f"{function_name}-{key}.pickle")
+
+        def store(function_result: typing.Any, path: str):
+            os.makedirs(directory, exist_ok=True)
+            _dump(function_result, path)
+            _evict(directory, max_size, path)
+
+        def adopt(function_result: typing.Any, *args, **kwargs) -> str:
+            """Store function_result as the result of calling function with args.
+
+            This is an explicit migration step for results which have been
+            computed elsewhere: the caller vouches that function_result is what
+            the current code would return. Returns the path of the entry.
+            """
+
+            path = get_path(make_key(*args, **kwargs))
+            store(function_result, path)
+            return path
+
+        @functools.wraps(function_to_decorate)
+        def wrapper(*args, **kwargs) -> typing.Any:
+            key = wrapper.last_key = make_key(*args, **kwargs)
+            path = get_path(key)
+
+            if not force_to_compute and os.path.isfile(path):
+                try:
+                    with open(path, "rb") as cache_file:
+                        function_result = pickle.load(cache_file)
+                except (EOFError, pickle.UnpicklingError):
+                    pass
+                else:
+                    # mark entry as recently used
+                    os.utime(path)
+                    return function_result
+
+            function_result = function_to_decorate(*args, **kwargs)
+            store(function_result, path)
+            return function_result
+
+        wrapper.last_key = None
+        wrapper.make_key = make_key
+        wrapper.adopt = adopt
+        wrapped_function = typing.cast(F, wrapper)
+        return wrapped_function
+
+    return decorator
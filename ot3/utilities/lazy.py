@@ -0,0 +1,43 @@
+"""Helper for loading submodules and computing module constants on demand.
+
+Both functions return a module level "__getattr__" function (PEP 562).
+Importing a package or module stays cheap: submodules are imported and
+constants are computed once they are accessed for the first time.
+"""
+
+import importlib
+import sys
+import typing
+
+
+def lazy_submodules(
+    package_name: str, submodule_names: typing.Sequence[str]
+) -> typing.Callable[[str], typing.Any]:
+    submodule_names = frozenset(submodule_names)
+
+    def __getattr__(name: str) -> typing.Any:
+        if name in submodule_names:
+            # import_module also sets the submodule as an attribute of the
+            # package, so __getattr__ won't be called again
+            return importlib.import_module(f"{package_name}.{name}")
+        raise AttributeError(f"module '{package_name}' has no attribute '{name}'")
+
+    return __getattr__
+
+
+def lazy_attributes(
+    module_name: str,
+    attribute_name_to_function: typing.Dict[str, typing.Callable[[], typing.Any]],
+) -> typing.Callable[[str], typing.Any]:
+    def __getattr__(name: str) -> typing.Any:
+        try:
+            make_attribute = attribute_name_to_function[name]
+        except KeyError:
+            raise AttributeError(
+                f"module '{module_name}' has no attribute '{name}'"
+            ) from None
+        attribute = make_attribute()
+        setattr(sys.modules[module_name], name, attribute)
+        return attribute
+
+    return __getattr__
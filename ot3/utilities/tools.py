@@ -1,12 +1,25 @@
+import bisect
 import functools
 import itertools
+import multiprocessing
+import numbers
 import operator
+import random
 import typing
 
+try:
+    import dill as pickle
+except ImportError:
+    import pickle
+
+import expenvelope
+import numpy as np
+
 from mutwo import generators
 from mutwo import parameters
 
 
+@functools.lru_cache(maxsize=256)
 def make_brownian_rhythm(
     duration: parameters.abc.DurationType,
     average_note_duration: parameters.abc.DurationType,
@@ -14,22 +27,39 @@ def make_brownian_rhythm(
     dt: float = 2,
     delta: float = 1,
 ) -> typing.Tuple[parameters.abc.DurationType, ...]:
+    # A random walk with n items is the beginning of a random walk with the
+    # same seed and more items. Therefore one long walk is enough to find the
+    # shortest walk (with at least 'duration // average_note_duration' items)
+    # which is longer than duration.
     n_items = int(duration // average_note_duration)
-    rhythm = (duration - 1,)
-    while sum(rhythm) < duration:
-        rhythm = list(
-            abs(
-                generators.brown.random_walk_noise(
-                    average_note_duration, n_items, dt, delta, random_state=random_state
-                )
+    n_items_to_draw = (max(n_items, 1) * 2) + 8
+    while True:
+        walk = np.abs(
+            generators.brown.random_walk_noise(
+                average_note_duration,
+                n_items_to_draw,
+                dt,
+                delta,
+                random_state=random_state,
             )
         )
-        n_items += 1
+        # cumsum adds in the same order as "sum" of a list of floats
+        accumulated_walk = np.cumsum(walk)
+        if accumulated_walk[-1] >= duration:
+            break
+        n_items_to_draw *= 2
 
-    while len(rhythm) > 1 and sum(rhythm) > duration:
-        rhythm = rhythm[:-1]
+    n_items = max(
+        n_items, int(np.searchsorted(accumulated_walk, duration, side="left")) + 1
+    )
+    # remove items at the end until the rhythm isn't longer than duration
+    n_items = max(
+        1,
+        int(np.searchsorted(accumulated_walk[:n_items], duration, side="right")),
+    )
+    rhythm = list(walk[:n_items])
 
-    difference = duration - sum(rhythm)
+    difference = duration - accumulated_walk[n_items - 1]
     rhythm[-1] += difference
     while rhythm[-1] < 0:
         rhythm[-2] += rhythm[-1]
@@ -108,3 +138,209 @@ def make_gray_code_rhythm_cycle(n=3):
         for gray_code in generators.gray.reflected_binary_code(n, 2)
     )
     return itertools.cycle(gray_codes)
+
+
+def imap_in_processes(
+    function: typing.Callable[..., typing.Any],
+    arguments_per_call: typing.Iterable[typing.Sequence[typing.Any]],
+    n_processes: int = 1,
+) -> typing.Iterator[typing.Any]:
+    """Call function with each argument sequence, in parallel if possible.
+
+    Results are yielded in the order of the arguments as soon as they are
+    ready, so that the caller can already process the first results while
+    the remaining calls are still running. Worker processes are forked, so
+    they inherit all global state (constants, seeded generators) of the
+    calling process and function has to be defined on module level.
+    """
+
+    arguments_per_call = tuple(arguments_per_call)
+    n_processes = min(n_processes, len(arguments_per_call))
+    if n_processes <= 1:
+        for arguments in arguments_per_call:
+            yield function(*arguments)
+        return
+
+    with multiprocessing.get_context("fork").Pool(n_processes) as pool:
+        for dumped_result in pool.imap(
+            _call_and_dump_arguments,
+            ((function, arguments) for arguments in arguments_per_call),
+        ):
+            yield pickle.loads(dumped_result)
+
+
+def map_in_processes(
+    function: typing.Callable[..., typing.Any],
+    arguments_per_call: typing.Iterable[typing.Sequence[typing.Any]],
+    n_processes: int = 1,
+) -> typing.Tuple[typing.Any, ...]:
+    """Call function with each argument sequence, in parallel if possible.
+
+    Results are returned in the order of the arguments. Worker processes are
+    forked, so they inherit all global state (constants, seeded generators)
+    of the calling process and function has to be defined on module level.
+    """
+
+    return tuple(imap_in_processes(function, arguments_per_call, n_processes))
+
+
+def _call_and_dump(
+    function: typing.Callable[..., typing.Any], arguments: typing.Sequence[typing.Any]
+) -> bytes:
+    # results are serialised with dill (if available), because some of them
+    # (e.g. time brackets, which refer to the random module) can't be pickled
+    return pickle.dumps(function(*arguments))
+
+
+def _call_and_dump_arguments(
+    function_and_arguments: typing.Tuple[
+        typing.Callable[..., typing.Any], typing.Sequence[typing.Any]
+    ]
+) -> bytes:
+    return _call_and_dump(*function_and_arguments)
+
+
+class DynamicChoice(generators.generic.DynamicChoice):
+    """DynamicChoice with its own random generator.
+
+    Unlike :class:`mutwo.generators.generic.DynamicChoice` it neither
+    reseeds nor uses the global random generator, so its results don't
+    depend on anything else which uses random numbers.
+    """
+
+    def __init__(
+        self,
+        values: typing.Iterable[typing.Any],
+        curves: typing.Iterable[expenvelope.Envelope],
+        random_seed: int = 100,
+    ):
+        assert len(values) == len(curves)
+
+        self._values = values
+        self._curves = curves
+        self._random = random.Random(random_seed)
+        self._make_grid()
+
+    def _make_grid(self):
+        # Piecewise linear curves are linear between the union of all their
+        # breakpoints. Store for each cell of this grid the segment of each
+        # curve, so that all weights can be calculated in one vectorised
+        # step (with the same arithmetic as 'expenvelope', so the results
+        # equal the results of DynamicChoice). Curves with jumps (segments
+        # without duration) are left to 'expenvelope'.
+        if not all(
+            abs(segment.curve_shape) < 0.000001
+            and segment.end_time > segment.start_time
+            for curve in self._curves
+            for segment in curve.segments
+        ):
+            self._grid = None
+            return
+
+        self._grid = sorted(
+            set(
+                float(segment.start_time)
+                for curve in self._curves
+                for segment in curve.segments
+            )
+        )
+        segments_per_cell = tuple(
+            tuple(
+                curve.segments[
+                    min(
+                        bisect.bisect_right(
+                            [float(segment.start_time) for segment in curve.segments],
+                            cell_start,
+                        )
+                        - 1,
+                        len(curve.segments) - 1,
+                    )
+                    if cell_start >= curve.start_time()
+                    else 0
+                ]
+                for curve in self._curves
+            )
+            for cell_start in self._grid
+        )
+        self._start_times, self._end_times, self._start_levels, self._end_levels = (
+            np.array(
+                [
+                    [get_value(segment) for segment in segments]
+                    for segments in segments_per_cell
+                ],
+                dtype=float,
+            )
+            for get_value in (
+                lambda segment: segment.start_time,
+                lambda segment: segment.end_time,
+                lambda segment: segment.start_level,
+                lambda segment: segment.end_level,
+            )
+        )
+        # before their start all curves keep their start level
+        self._curve_start_times = np.array(
+            [curve.start_time() for curve in self._curves], dtype=float
+        )
+        self._curve_start_levels = np.array(
+            [curve.start_level() for curve in self._curves], dtype=float
+        )
+        # linear segments which start and end with 0 stay 0
+        self._is_zero_per_cell = (self._start_levels == 0) & (self._end_levels == 0)
+
+    def _get_cell_index(self, position: float) -> int:
+        return max(bisect.bisect_right(self._grid, position) - 1, 0)
+
+    def get_weights_at(self, position: numbers.Real) -> typing.Tuple[float, ...]:
+        """Return the weight of each value at the requested position."""
+
+        if self._grid is None:
+            return tuple(curve.value_at(position) for curve in self._curves)
+
+        position = float(position)
+        cell_index = self._get_cell_index(position)
+        start_times, end_times, start_levels, end_levels = (
+            self._start_times[cell_index],
+            self._end_times[cell_index],
+            self._start_levels[cell_index],
+            self._end_levels[cell_index],
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            weights = start_levels + (
+                (position - start_times) / (end_times - start_times)
+            ) * (end_levels - start_levels)
+        weights = np.where(position >= end_times, end_levels, weights)
+        weights = np.where(position <= start_times, start_levels, weights)
+        weights = np.where(
+            position < self._curve_start_times, self._curve_start_levels, weights
+        )
+        return tuple(weights.tolist())
+
+    def gamble_at(self, time: numbers.Real) -> typing.Any:
+        """Return value at requested time.
+
+        :param time: At which position on the x-Axis shall be gambled.
+        :type time: numbers.Real
+        """
+
+        return self._random.choices(self._values, self.get_weights_at(time), k=1)[0]
+
+    def can_only_choose(self, value: typing.Any, position: numbers.Real) -> bool:
+        """Test if all other values have no weight at the requested position.
+
+        In this case the gamble can be replaced by :meth:`skip`.
+        """
+
+        if self._grid is None:
+            return False
+        is_zero = self._is_zero_per_cell[self._get_cell_index(float(position))]
+        return all(
+            other_is_zero
+            for other_value, other_is_zero in zip(self._values, is_zero)
+            if other_value is not value
+        )
+
+    def skip(self):
+        """Consume the random numbers of one gamble without gambling."""
+
+        # random.choices draws one random number for each choice
+        self._random.random()
@@ -17,6 +17,8 @@ setuptools.setup(
         package for package in setuptools.find_packages() if package[:5] != "tests"
     ],
     setup_requires=[],
-    install_requires=["mutwo>=0.12.0, <1.0.0"],
+    # the midi files are written with private methods of mutwo's MidiFileConverter
+    # and of mido (see tests/test_midi.py), which are stable in these ranges
+    install_requires=["mutwo>=0.12.0, <0.34.0", "mido>=1.2.9, <1.4.0"],
     python_requires=">=3.7, <4",
 )
@@ -0,0 +1,45 @@
+import pytest
+
+build_graph = pytest.importorskip("ot3.utilities.build_graph")
+
+
+def _make_stage(name, tmp_path, executed_stages, dependencies=tuple([])):
+    output = tmp_path / f"{name}.txt"
+
+    def function():
+        executed_stages.append(name)
+        output.write_text(name)
+
+    return build_graph.Stage(
+        name, function, outputs=(str(output),), dependencies=dependencies
+    )
+
+
+def test_dependencies_are_build_before_the_stage(tmp_path):
+    executed_stages = []
+    graph = build_graph.BuildGraph(
+        (
+            _make_stage("shadows", tmp_path, executed_stages),
+            _make_stage("violin", tmp_path, executed_stages),
+            _make_stage(
+                "saxophone",
+                tmp_path,
+                executed_stages,
+                dependencies=("shadows", "violin"),
+            ),
+        ),
+        state_path=str(tmp_path / "state.json"),
+    )
+    graph.build(("saxophone",))
+    assert executed_stages == ["shadows", "violin", "saxophone"]
+
+
+def test_stage_can_not_be_added_before_its_dependencies(tmp_path):
+    with pytest.raises(ValueError):
+        build_graph.BuildGraph(
+            (
+                _make_stage("saxophone", tmp_path, [], dependencies=("shadows",)),
+                _make_stage("shadows", tmp_path, []),
+            ),
+            state_path=str(tmp_path / "state.json"),
+        )
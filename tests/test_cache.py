@@ -0,0 +1,56 @@
+import pickle
+
+import pytest
+
+cache = pytest.importorskip("ot3.utilities.cache")
+
+
+def _make_counted_function(directory, *dependencies):
+    calls = []
+
+    @cache.compute_cached(*dependencies, directory=directory)
+    def add(a, b):
+        calls.append((a, b))
+        return a + b
+
+    return add, calls
+
+
+def test_result_is_only_computed_once(tmp_path):
+    add, calls = _make_counted_function(str(tmp_path))
+    assert add(1, 2) == 3
+    assert add(1, 2) == 3
+    assert add(2, 2) == 4
+    assert calls == [(1, 2), (2, 2)]
+
+
+def test_changed_dependency_is_a_cache_miss(tmp_path):
+    add, calls = _make_counted_function(str(tmp_path), 1)
+    add(1, 2)
+    add_with_other_dependency, other_calls = _make_counted_function(
+        str(tmp_path), 2
+    )
+    add_with_other_dependency(1, 2)
+    assert calls == other_calls == [(1, 2)]
+
+
+def test_legacy_pickle_is_only_used_after_adoption(tmp_path):
+    legacy_path = tmp_path / "LEGACY.pickle"
+    with open(legacy_path, "wb") as legacy_file:
+        pickle.dump((100, ((1, 2), {})), legacy_file)
+
+    add, calls = _make_counted_function(str(tmp_path / "cache"))
+    assert add(1, 2) == 3
+
+    add.adopt(cache.load_compute_lazy_result(str(legacy_path), 1, 2), 1, 2)
+    assert add(1, 2) == 100
+    assert calls == [(1, 2)]
+
+
+def test_legacy_pickle_with_other_arguments_is_rejected(tmp_path):
+    legacy_path = tmp_path / "LEGACY.pickle"
+    with open(legacy_path, "wb") as legacy_file:
+        pickle.dump((100, ((1, 2), {})), legacy_file)
+
+    with pytest.raises(ValueError):
+        cache.load_compute_lazy_result(str(legacy_path), 2, 2)
@@ -0,0 +1,75 @@
+import pickle
+
+import pytest
+
+# the families of pitch curves are only part of the fork of mutwo used by ot3
+pytest.importorskip("mutwo.events.families")
+families_pitch = pytest.importorskip("ot3.constants.families_pitch")
+
+from mutwo.events import basic  # noqa: E402
+
+from ot3 import constants as ot3_constants  # noqa: E402
+
+
+@pytest.fixture
+def evolved_durations(monkeypatch, tmp_path):
+    # the cache directory is relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(ot3_constants.compute, "N_PROCESSES", 1)
+
+    evolved_durations = []
+
+    def evolve_family(root_pitches, connection_pitches, duration):
+        evolved_durations.append(duration)
+        return basic.SimpleEvent(duration)
+
+    monkeypatch.setattr(families_pitch, "_evolve_family", evolve_family)
+    return evolved_durations
+
+
+def test_changing_one_family_only_evolves_this_family(
+    monkeypatch, evolved_durations
+):
+    family_data_per_family = list(ot3_constants.harmony.FAMILY_DATA_PER_FAMILY[:3])
+    monkeypatch.setattr(
+        ot3_constants.harmony, "FAMILY_DATA_PER_FAMILY", family_data_per_family
+    )
+    families_pitch._make_families()
+    assert evolved_durations == [duration for _, _, duration in family_data_per_family]
+
+    evolved_durations.clear()
+    families_pitch._make_families()
+    assert evolved_durations == []
+
+    root_pitches, connection_pitches, duration = family_data_per_family[1]
+    family_data_per_family[1] = (root_pitches, connection_pitches, duration + 1)
+    families_pitch._make_families()
+    assert evolved_durations == [duration + 1]
+
+
+def test_adopted_legacy_families_are_used(monkeypatch, tmp_path, evolved_durations):
+    family_data_per_family = list(ot3_constants.harmony.FAMILY_DATA_PER_FAMILY[:2])
+    monkeypatch.setattr(
+        ot3_constants.harmony, "FAMILY_DATA_PER_FAMILY", family_data_per_family
+    )
+    legacy_families_pitch = basic.SequentialEvent(
+        [
+            basic.SimpleEvent(families_pitch.REST_DURATION_BEFORE_FIRST_FAMILY_ARRIVES),
+            basic.SequentialEvent([basic.SimpleEvent(1)]),
+            basic.SimpleEvent(ot3_constants.harmony.DURATION_PER_REST[0]),
+            basic.SequentialEvent([basic.SimpleEvent(2)]),
+        ]
+    )
+    legacy_path = tmp_path / "FAMILIES_PITCH.pickle"
+    with open(legacy_path, "wb") as legacy_file:
+        pickle.dump((legacy_families_pitch, (tuple([]), {})), legacy_file)
+
+    families_pitch.adopt_legacy_families_pitch(str(legacy_path))
+    assert families_pitch._make_families() == legacy_families_pitch
+    assert evolved_durations == []
+
+    # only the changed family is evolved again
+    root_pitches, connection_pitches, duration = family_data_per_family[0]
+    family_data_per_family[0] = (root_pitches, connection_pitches, duration + 1)
+    families_pitch._make_families()
+    assert evolved_durations == [duration + 1]
@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+# the families of pitch curves are only part of the fork of mutwo used by ot3
+pytest.importorskip("mutwo.events.families")
+midi = pytest.importorskip("ot3.converters.frontends.midi")
+
+import expenvelope  # noqa: E402
+
+from mutwo.events import basic  # noqa: E402
+from mutwo.events import music  # noqa: E402
+from mutwo import parameters  # noqa: E402
+
+_RATIOS = ("1/1", "9/8", "5/4", "4/3", "3/2", "7/4", "2/1", "1/2", "11/8")
+
+
+def _make_note_like(random_generator: random.Random) -> music.NoteLike:
+    # chords, single pitches and rests; durations on a coarse grid, so that
+    # many messages share the same tick
+    pitches = [
+        parameters.pitches.JustIntonationPitch(ratio)
+        for ratio in random_generator.sample(_RATIOS, random_generator.randint(0, 3))
+    ]
+    return music.NoteLike(
+        pitches,
+        random_generator.choice((0.25, 0.5, 0.5, 1, 1.5)),
+        random_generator.choice((0.1, 0.3, 0.5, 0.8, 1)),
+    )
+
+
+def _make_event(seed: int):
+    random_generator = random.Random(seed)
+    if seed % 5 == 0:
+        return _make_note_like(random_generator)
+    sequential_events = [
+        basic.SequentialEvent(
+            [
+                _make_note_like(random_generator)
+                for _ in range(random_generator.randint(1, 12))
+            ]
+        )
+        for _ in range(random_generator.randint(1, 4))
+    ]
+    if seed % 5 == 1:
+        return sequential_events[0]
+    return basic.SimultaneousEvent(sequential_events)
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("apply_extrema", (False, True))
+@pytest.mark.parametrize("midi_file_type", (0, 1))
+def test_streamed_midi_file_equals_midi_file_of_mutwo(
+    tmp_path, seed, apply_extrema, midi_file_type
+):
+    event = _make_event(seed)
+    converter = midi.OT3InstrumentEventToMidiFileConverter(
+        "test", midi_file_type=midi_file_type, apply_extrema=apply_extrema
+    )
+    if seed % 2:
+        # several tempo messages
+        converter._tempo_envelope = expenvelope.Envelope.from_levels_and_durations(
+            levels=[60, 120, 90, 90], durations=[2, 3, 1]
+        )
+    converter._n_notes = 0
+    converter._set_velocity_extrema_of_event(event)
+
+    mutwo_path = tmp_path / "mutwo.mid"
+    converter.path = str(tmp_path / "ot3.mid")
+    try:
+        converter._event_to_midi_file(event).save(filename=str(mutwo_path))
+    except ValueError:
+        # tempo messages after the end of the event: mutwo can't write the
+        # file either
+        with pytest.raises(ValueError):
+            converter._write_midi_file(event)
+        return
+
+    converter._write_midi_file(event)
+    with open(mutwo_path, "rb") as mutwo_midi_file, open(
+        converter.path, "rb"
+    ) as ot3_midi_file:
+        assert ot3_midi_file.read() == mutwo_midi_file.read()
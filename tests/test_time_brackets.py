@@ -0,0 +1,82 @@
+import itertools
+
+import pytest
+
+# the families of pitch curves are only part of the fork of mutwo used by ot3
+pytest.importorskip("mutwo.events.families")
+time_brackets = pytest.importorskip("ot3.converters.symmetrical.time_brackets")
+
+import expenvelope  # noqa: E402
+import numpy as np  # noqa: E402
+
+from mutwo import events  # noqa: E402
+from mutwo import parameters  # noqa: E402
+
+
+class _PitchCurveWithOverlappingActiveRanges(object):
+    tag = "overlapping"
+    active_ranges = ((0, 5), (3, 8))
+
+
+def _make_pitch_curve(tag: str, *points: float) -> events.families.PitchCurve:
+    return events.families.PitchCurve(
+        parameters.pitches.JustIntonationPitch("1/1"),
+        10,
+        expenvelope.Envelope.from_points(*points),
+        tag,
+    )
+
+
+def _make_pitch_curves():
+    return (
+        _make_pitch_curve("a", (0, 1), (10, 1)),
+        _make_pitch_curve("b", (0, 0), (2, 0), (2, 1), (6, 1), (6, 0), (10, 0)),
+        _make_pitch_curve("a", (0, 0), (5, 1), (10, 0)),
+        _make_pitch_curve("c", (0, 0), (10, 0)),
+    )
+
+
+@pytest.mark.parametrize(
+    "time_range", ((0, 10), (1, 3), (2, 6), (5.5, 9), (-2, 1), (9, 12))
+)
+def test_overlapping_percentages_equal_the_method_of_mutwo(time_range):
+    pitch_curves = _make_pitch_curves()
+    active_ranges_index = time_brackets._ActiveRangesIndex(pitch_curves)
+    np.testing.assert_allclose(
+        active_ranges_index.get_overlapping_percentages(time_range),
+        [
+            pitch_curve.get_overlapping_percentage_with_active_ranges(time_range)
+            for pitch_curve in pitch_curves
+        ],
+    )
+
+
+def test_overlapping_active_ranges_are_only_counted_once():
+    active_ranges_index = time_brackets._ActiveRangesIndex(
+        (_PitchCurveWithOverlappingActiveRanges(),)
+    )
+    np.testing.assert_allclose(
+        active_ranges_index.get_overlapping_percentages((0, 10)), [0.8]
+    )
+    np.testing.assert_allclose(
+        active_ranges_index.get_overlapping_percentages((4, 6)), [1]
+    )
+
+
+def test_active_ranges_index_cache_is_bounded():
+    families = tuple(
+        _make_pitch_curves()
+        for _ in range(time_brackets._ACTIVE_RANGES_INDEX_CACHE_SIZE + 1)
+    )
+    indices = tuple(
+        time_brackets._get_active_ranges_index(family) for family in families
+    )
+    assert (
+        len(time_brackets._FAMILY_ID_TO_FAMILY_AND_ACTIVE_RANGES_INDEX)
+        <= time_brackets._ACTIVE_RANGES_INDEX_CACHE_SIZE
+    )
+    # recently used families share their index
+    assert time_brackets._get_active_ranges_index(families[-1]) is indices[-1]
+    assert all(
+        index0 is not index1 for index0, index1 in itertools.combinations(indices, 2)
+    )